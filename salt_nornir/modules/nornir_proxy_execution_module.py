@@ -192,6 +192,12 @@ All supported processors executed in this order::
      - Add task execution details to results
    * - `Fx`_
      - Filters to target subset of devices using FFun Nornir-Salt function
+   * - `async`_
+     - Submit job and return its handle straight away, results retrieved later using ``nr.nornir job_result``
+   * - `cache`_
+     - Serve commands results from Proxy Minion cache, only retrieving missing results from devices
+   * - `coalesce`_
+     - Receive results of identical read-only job already queued or running instead of running it again
    * - `context`
      - Overrides context variables passed by `render`_ to ``file.apply_template_on_contents`` exec mod function
    * - `dcache`_
@@ -212,6 +218,8 @@ All supported processors executed in this order::
      - If True, emit events on Salt Events Bus for tasks execution progress
    * - `hcache`_
      - Saves host's task execution results to host's in-memory (RAM) Inventory data
+   * - `host_batch_size`_
+     - Run task for hosts in batches of given size to limit memory usage
    * - `iplkp`_
      - Performs in CSV file or DNS lookup of IPv4 and IPv6 addresses to replace them in output
    * - `jmespath`_
@@ -224,18 +232,24 @@ All supported processors executed in this order::
      - Parse nr.cli output using TextFSM ntc-templates
    * - `RetryRunner parameters`_
      - Task parameters to influence RetryRunner execution logic
+   * - `priority`_
+     - Job priority, jobs with lower priority value run first
    * - `render`_
      - Renders arguments content using Salt renderer system
    * - `run_ttp`_
      - Calls Nornir-Salt DataProcessor run_ttp function to parse results using TTP
    * - `saltenv`
      - `Salt Environment <https://docs.saltproject.io/en/latest/ref/states/top.html#environments>`_ name to use with `render`_ and `download`_ to source files, default is ``base``
+   * - `stream`_
+     - Send hosts results to job submitter as soon as each host completes its task
    * - `table`_
      - Formats results to text table using Nornir-Salt TabulateFormatter
    * - `template_engine`
      - Template Engine name to use with `render`_ to render files, default is ``jinja``
    * - `tests`_
      - Run tests for task results using Nornir-Salt TestsProcessor
+   * - `timing`_
+     - Add wall-clock time each job processing phase took to results
    * - `tf`_
      - Saves results to local file system using Nornir-Salt ToFileProcessor
    * - `to_dict`_
@@ -298,11 +312,18 @@ CLI Arguments:
 
 * ``dcache`` - nornir inventory ``defaults`` data dictionary key name to save results under
   or if set to boolean True, uses ``dcache`` as a key name
+* ``cache_ttl`` - integer, seconds to keep cached results for, default is ``results_cache_ttl``
+  Proxy Minion parameter value
+
+Cached results stored once and shared by all Nornir workers. Overall size of ``dcache`` and ``hcache``
+results limited by ``results_cache_max_mbyte`` Proxy Minion parameter, least recently cached results
+removed first once limit exceeded.
 
 Sample usage::
 
     salt nrp1 nr.cli "show clock" dcache="show_clock_output"
     salt nrp1 nr.cli "show clock" dcache=True
+    salt nrp1 nr.cli "show clock" dcache=True cache_ttl=300
 
 To view in-memory ``defaults`` inventory can use utility function::
 
@@ -522,11 +543,18 @@ CLI Arguments:
 
 * ``hcache`` - host's data dictionary key name to save results under or if set to boolean True, uses
   ``hcache`` as a key name
+* ``cache_ttl`` - integer, seconds to keep cached results for, default is ``results_cache_ttl``
+  Proxy Minion parameter value
+
+Each host's cached results stored once and shared by all Nornir workers. Overall size of ``hcache``
+and ``dcache`` results limited by ``results_cache_max_mbyte`` Proxy Minion parameter, least recently
+cached results removed first once limit exceeded.
 
 Sample usage::
 
     salt nrp1 nr.cli "show clock" hcache="show_clock_output"
     salt nrp1 nr.cli "show clock" hcache=True
+    salt nrp1 nr.cli "show clock" hcache=True cache_ttl=300
 
 To view in-memory inventory can use utility function::
 
@@ -777,6 +805,22 @@ Primary use cases for this keyword is revolving around enabling or disabling ren
 certain arguments. Execution Module Functions adjust ``render`` keyword list content by
 themselves and usually do not require any modifications.
 
+By default hosts content rendered one host after another by Nornir worker thread. If
+``render_workers`` set to value above 1, Jinja2 templates rendered in parallel by a pool
+of rendering processes, making use of all CPU cores to render templates for big number
+of hosts. Rendering processes started once and reused by subsequent jobs. Per-host files,
+e.g. ``filename="salt://templates/{{ host.name }}.j2"``, downloaded by Nornir worker thread,
+templates that use ``salt`` or ``opts`` variables or that include, import or extend other
+templates rendered by Nornir worker thread as well. Hosts that failed rendering excluded
+from running the task and reported in results same way as without rendering processes.
+``render_workers`` Proxy Minion parameter sets default value for all jobs.
+
+* ``render_workers`` - integer, default is 0, number of processes to render hosts content in
+
+For example, to render configuration for all hosts using 8 processes::
+
+    salt nrp1 nr.cfg_gen filename="salt://templates/config.j2" FB="*" render_workers=8
+
 run_ttp
 +++++++
 
@@ -988,6 +1032,199 @@ Sample usage::
     salt nrp1 nr.nornir connections worker=2
     salt nrp1 nr.nornir disconnect worker=all
 
+priority
+++++++++
+
+Jobs waiting in Proxy Minion jobs queue started in the order of their priority, jobs
+with lower priority value run first, jobs with the same priority run in the order they
+were submitted. Default priority for each execution module function can be set using
+``jobs_priority`` Proxy Minion parameter, default priority is 5.
+
+Supported functions: ``nr.task, nr.cli, nr.cfg, nr.cfg_gen, nr.test, nr.tping, nr.nc, nr.do, nr.http, nr.gnmi, nr.file, nr.diff, nr.find, nr.learn, nr.nornir``
+
+CLI Arguments:
+
+* ``priority`` - integer, job priority
+
+Sample usage::
+
+    salt nrp1 nr.cfg "logging host 1.1.1.1" FB="core-*" priority=1
+    salt nrp1 nr.cli "show run" FB="*" priority=9
+    salt nrp1 nr.tping FB="*" priority=1
+
+async
++++++
+
+By default, execution module function waits for job to complete, as a result, long
+running jobs such as ``nr.cfg`` for many devices occupy Proxy Minion process slots
+limited by ``process_count_max`` for the duration of the job. If ``async`` is True,
+job submitted to Proxy Minion jobs queue and job handle returned straight away.
+
+Async job results kept in Proxy Minion results store and can be retrieved using
+``nr.nornir job_result handle=...`` call, if job still running, ``job_result``
+returns ``pending`` status. Results removed from results store once retrieved or
+after ``async_results_ttl`` seconds, results store keeps up to ``async_results_max_count``
+completed jobs results of up to ``async_results_max_mbyte`` overall size evicting oldest
+ones first. Results bigger than ``results_spill_threshold_mbyte`` kept in spill files
+until retrieved or evicted.
+
+Once async job completes, Proxy Minion emits event on Salt Events Bus with
+``nornir-proxy/{proxy_id}/job/{handle}/completed`` tag.
+
+Async mode not supported together with ``worker="all"`` argument.
+
+Supported functions: ``nr.task, nr.cli, nr.cfg, nr.cfg_gen, nr.nc, nr.do, nr.http, nr.gnmi, nr.snmp``
+
+CLI Arguments:
+
+* ``async`` - boolean, default is False, if True, return job handle straight away
+
+Sample usage::
+
+    salt nrp1 nr.cfg "logging host 1.1.1.1" FB="*" async=True
+    salt nrp1 nr.nornir job_result handle=0f6b0b3c-4c4e-4bb5-9c2c-9ad3a1a0b9f4
+
+cache
++++++
+
+Monitoring systems often run the same show commands or NETCONF RPC calls against
+the same devices every few minutes. If ``cache`` is True, hosts' commands and RPC
+call results saved in Proxy Minion shared results cache and subsequent jobs get
+results for commands from cache without connecting to devices, only commands
+missing from cache or expired retrieved from devices and saved in cache.
+
+Cache entries keyed by host name, task plugin, command or RPC call name and the rest
+of task plugin arguments. Commands rendered for each host, for example using Jinja2
+templates, cached same way as commands supplied as arguments, results returned in the
+same order as commands. If ``cache`` is True, how long to keep results for defined on a
+per-command basis using ``commands_cache_ttl`` Proxy Minion parameter, results for
+commands that do not match any of ``commands_cache_ttl`` patterns not cached. If ``cache``
+is an integer, results for all commands kept for that many seconds. Results for commands
+repeated using ``repeat`` argument and failed tasks results never cached. Results processed by processors such as
+``run_ttp`` or ``tests`` after retrieving them from cache, as a result ``cache`` can be
+used together with any of processors arguments.
+
+Cache hits and misses counted by ``commands_cache_hits``, ``commands_cache_misses``
+and ``commands_cache_hit_rate`` ``nr.nornir stats``.
+
+Supported functions: ``nr.cli, nr.test, nr.nc, nr.gnmi, nr.snmp``
+
+CLI Arguments:
+
+* ``cache`` - boolean or integer, default is False, if True, serve commands results from cache
+  using ``commands_cache_ttl`` TTLs, if integer, serve commands results from cache keeping results
+  for all commands for this number of seconds
+
+Sample usage::
+
+    salt nrp1 nr.cli "show version" "show ip route" FB="core-*" cache=True
+    salt nrp1 nr.nc get_config source=running cache=300
+
+host_batch_size
++++++++++++++++
+
+By default, task data rendered, task executed and results serialized for all job's
+target hosts at once, as a result, peak memory usage grows with the number of hosts.
+If ``host_batch_size`` provided, hosts processed in batches of given size one batch
+after another - rendered, executed and results serialized, freeing batch's Nornir
+results before moving to the next batch, batches results merged together. Final job
+results structure is the same as without batching.
+
+Supported functions: ``nr.task, nr.cli, nr.cfg, nr.cfg_gen, nr.test, nr.nc, nr.do, nr.http, nr.gnmi, nr.snmp``
+
+CLI Arguments:
+
+* ``host_batch_size`` - integer, default is 0, number of hosts in each batch, 0 disables batching
+
+Sample usage::
+
+    salt nrp1 nr.cli "show version" FB="*" host_batch_size=500
+
+coalesce
+++++++++
+
+Several read-only jobs identical to each other - same task plugin, arguments and
+filtered hosts - often submitted at the same time, for example by dashboards polling
+devices. If ``coalesce`` is True and identical job already waiting in Proxy Minion
+jobs queue or running, new job not queued but attached to that job and receives
+the same results once it completes, as a result devices only accessed once. Filters
+compared using resulting set of hosts, e.g. ``FB="ceos*"`` and ``FL="ceos1,ceos2"``
+jobs considered identical if both match the same hosts.
+
+Only jobs that do not change devices' state coalesced - ``nr.cli``, ``nr.test``,
+``nr.tping``, ``nr.nc`` get calls, ``nr.gnmi`` get and capabilities calls, ``nr.snmp``
+get and walk calls and ``nr.http`` GET requests. Jobs with ``stream`` argument never
+coalesced. Events for coalesced jobs emitted once, using identity of the first job.
+
+``jobs_coalescing`` Proxy Minion parameter sets default value for all jobs.
+
+Supported functions: ``nr.cli, nr.test, nr.tping, nr.nc, nr.http, nr.gnmi, nr.snmp``
+
+CLI Arguments:
+
+* ``coalesce`` - boolean, default is ``jobs_coalescing`` Proxy Minion parameter value
+
+Sample usage::
+
+    salt nrp1 nr.cli "show version" FB="core-*" coalesce=True
+
+stream
+++++++
+
+By default, worker accumulates results for all hosts and only returns them once
+task completed for all hosts, as a result, memory usage grows with the number of
+hosts task runs for. If ``stream`` set to True, worker serializes and sends each host
+results to job submitting process as soon as host completes its task, discarding
+them afterwards, so that worker only holds in-flight hosts results in memory.
+Streamed results combined back together by job submitting process, final job
+results structure is the same as without streaming.
+
+Streaming not supported together with ``table``, ``dump``, ``hcache`` or
+``dcache`` arguments, as these require results for all hosts.
+
+Supported functions: ``nr.task, nr.cli, nr.cfg, nr.cfg_gen, nr.test, nr.nc, nr.do, nr.http, nr.gnmi``
+
+CLI Arguments:
+
+* ``stream`` - boolean, default is False, if True stream hosts results
+
+Sample usage::
+
+    salt nrp1 nr.cli "show run" FB="*" stream=True
+
+timing
+++++++
+
+If ``timing`` set to True, time in seconds each job processing phase took recorded and job
+results returned in a dictionary with ``results`` and ``_timing`` keys, regardless of results
+format - dictionary, list or text table, e.g.::
+
+    {"results": {"ceos1": {"show clock": "..."}}, "_timing": {"run_tasks": 0.512, ...}}
+
+Recorded phases:
+
+* ``download_files`` - downloading files from master using ``_download_files`` function
+* ``add_processors`` - adding Nornir processors using ``_add_processors`` function
+* ``filter_hosts`` - filtering hosts using ``FFun`` function
+* ``download_and_render_files`` - downloading and rendering files using ``_download_and_render_files`` function
+* ``run_tasks`` - running tasks against devices using ``hosts.run``
+* ``form_results`` - forming results using ``ResultSerializer`` or ``TabulateFormatter`` functions
+* ``cache_results`` - saving results in ``hcache`` or ``dcache``
+* ``dump_results`` - saving results to file using ``DumpResults`` function
+* ``total`` - overall time job took to run
+
+Phases that did not run, for example ``dump_results`` if ``dump`` argument not provided, not included.
+
+Supported functions: ``nr.task, nr.cli, nr.cfg, nr.cfg_gen, nr.nc, nr.http, nr.gnmi``
+
+CLI Arguments:
+
+* ``timing`` - boolean, default is False, if True adds phases timing to results
+
+Sample usage::
+
+    salt nrp1 nr.cli "show clock" FB="*" timing=True
+
 Execution Module Functions
 --------------------------
 
@@ -1198,9 +1435,14 @@ def task(plugin, **kwargs):
     :param plugin: (str) ``path.to.plugin.task_fun`` to run ``from path.to.plugin import task_fun``
     :param kwargs: (dict) arguments to use with specified task plugin or common arguments
 
+    .. note:: if ``timing`` argument is True, results returned in a dictionary with ``results``
+        and ``_timing`` keys for any results format, refer to ``timing`` common argument for details.
+
     ``plugin`` attribute can refer to a file on one of remote locations, supported URL schemes
     are: salt://, http://, https://, ftp://, s3://, swift:// and file:// (local filesystem).
-    File downloaded, compiled and executed.
+    File downloaded, compiled and executed. Compiled task function cached and reused by
+    subsequent jobs for as long as file content stays the same, use ``nr.nornir clear_task_cache``
+    to force task function reload.
 
     File must contain function named ``task`` accepting Nornir task object as a first positional
     argument, for example::
@@ -1257,6 +1499,9 @@ def cli(*args, **kwargs):
     :param use_ps: (bool) if True, uses Netmiko with promptless mode to send commands
     :param kwargs: (dict) any additional arguments to use with specified ``plugin`` send command method
 
+    .. note:: if ``timing`` argument is True, results returned in a dictionary with ``results``
+        and ``_timing`` keys for any results format, refer to ``timing`` common argument for details.
+
     Sample Usage::
 
          salt nrp1 nr.cli "show clock" "show run" FB="IOL[12]" use_timing=True delay_factor=4
@@ -1357,6 +1602,9 @@ def cfg(*args, **kwargs):
     :param commit: (bool or dict) by default commit is ``True``. With ``netmiko`` plugin
         if ``commit`` argument is a dictionary it is supplied to commit call as arguments
 
+    .. note:: if ``timing`` argument is True, results returned in a dictionary with ``results``
+        and ``_timing`` keys for any results format, refer to ``timing`` common argument for details.
+
     .. warning:: ``dry_run`` not supported by ``netmiko`` and ``pyats`` plugins
 
     .. warning:: ``commit`` not supported by ``scrapli`` and ``pyats`` plugins. To commit need to send commit
@@ -2119,6 +2367,9 @@ def nc(*args, **kwargs):
     :param data: (str) path to file for ``rpc`` method call or rpc content
     :param method_name: (str) name of method to provide docstring for, used only by ``help`` call
 
+    .. note:: if ``timing`` argument is True, results returned in a dictionary with ``results``
+        and ``_timing`` keys for any results format, refer to ``timing`` common argument for details.
+
     Plugins details:
 
     * ``ncclient`` - uses `ncclient_call <https://nornir-salt.readthedocs.io/en/latest/Tasks/ncclient_call.html>`_
@@ -2792,14 +3043,16 @@ def nornir_fun(fun, *args, **kwargs):
     * ``refresh`` - re-instantiates Nornir workers after retrieving latest pillar data from Salt Master,
       if ``workers_only=True`` only refreshes Nornir workers using latest pillar data, without closing
       queues and killing child processes, resulting in inventory refresh but with no interruption to jobs
-      execution process.
+      execution process, if ``incremental=True`` only adds, removes or updates hosts that changed in pillar
+      keeping Nornir workers running and hosts' connections open unless their connection parameters changed,
+      falls back to ``workers_only`` refresh if proxy settings, groups or defaults changed.
     * ``kill`` - executes immediate shutdown of Nornir Proxy Minion process and child processes
     * ``shutdown`` - gracefully shutdowns Nornir Proxy Minion process and child processes
     * ``inventory`` - interact with Nornir Process inventory data, using ``InventoryFun`` function,
       by default, for ``read_host, read, read_inventory, list_hosts, list_hosts_platforms`` operations any
       Nornir worker can respond, for other, non-read operations targets all Nornir workers
     * ``stats`` - returns statistics about Nornir proxy process, accepts ``stat`` argument of stat
-      name to return
+      name to return, ``stats histograms`` returns jobs phases latency histograms in Prometheus text format
     * ``version`` - returns a report of Nornir related packages installed versions
     * ``initialized`` - returns Nornir Proxy Minion initialized status - True or False
     * ``hosts`` - returns a list of hosts managed by this Nornir Proxy Minion, accepts ``Fx``
@@ -2817,6 +3070,15 @@ def nornir_fun(fun, *args, **kwargs):
       of key names to remove, if no ``cache_keys`` argument provided removes all cached data, by default targets all Nornir workers
     * ``clear_dcache`` - clear task results cache from defaults data, accepts ``cache_keys`` list argument
       of key names to remove, if no ``cache_keys`` argument provided removes all cached data, by default targets all Nornir workers
+    * ``clear_task_cache`` - clear cache of custom task plugins downloaded from Master e.g. ``plugin="salt://path/to/task.py"``,
+      forcing them to be downloaded and loaded again on next use, returns a list of cleared plugins URLs
+    * ``jobs`` - list queued and running jobs with their Salt job ID, function name, state,
+      worker, target hosts count and elapsed time
+    * ``cancel`` - cancel jobs of Salt job with given ``jid`` argument, queued jobs removed from
+      the queue straight away, running jobs skip hosts that did not start running the task yet,
+      jobs with identical jobs coalesced with them keep running until all of those cancelled as well
+    * ``job_result`` - retrieve results of job submitted with ``async=True`` argument using job
+      ``handle`` argument, returns ``pending`` status if job not completed yet
     * ``workers/worker`` - call nornir worker utilities e.g. ``stats``
     * ``results_queue_dump`` - return content of results queue
 
@@ -2831,10 +3093,15 @@ def nornir_fun(fun, *args, **kwargs):
         salt nrp1 nr.nornir inventory update_defaults username=foo password=bar data='{"f": "b"}'
         salt nrp1 nr.nornir inventory read_host_data keys="['hostname', 'platform', 'circuits']"
         salt nrp1 nr.nornir stats stat="proxy_minion_id"
+        salt nrp1 nr.nornir stats histograms
         salt nrp1 nr.nornir version
         salt nrp1 nr.nornir shutdown
         salt nrp1 nr.nornir clear_hcache cache_keys='["key1", "key2]'
         salt nrp1 nr.nornir clear_dcache cache_keys='["key1", "key2]'
+        salt nrp1 nr.nornir clear_task_cache
+        salt nrp1 nr.nornir jobs
+        salt nrp1 nr.nornir cancel jid=20261016101010123456
+        salt nrp1 nr.nornir job_result handle=0f6b0b3c-4c4e-4bb5-9c2c-9ad3a1a0b9f4
         salt nrp1 nr.nornir workers stats
         salt nrp1 nr.nornir connect conn_name=netmiko username=cisco password=cisco platform=cisco_ios
         salt nrp1 nr.nornir connect scrapli port=2022 close_open=True
@@ -2842,6 +3109,7 @@ def nornir_fun(fun, *args, **kwargs):
         salt nrp1 nr.nornir connections conn_name=netmiko
         salt nrp1 nr.nornir disconnect conn_name=ncclient
         salt nrp1 nr.nornir refresh workers_only=True
+        salt nrp1 nr.nornir refresh incremental=True
 
     Sample Python API usage from Salt-Master::
 
@@ -2928,6 +3196,31 @@ def nornir_fun(fun, *args, **kwargs):
             identity=_form_identity(kwargs, "nornir.clear_dcache"),
             **kwargs,
         )
+    elif fun == "clear_task_cache":
+        return task(
+            plugin="clear_task_cache",
+            identity=_form_identity(kwargs, "nornir.clear_task_cache"),
+        )
+    elif fun == "jobs":
+        return task(plugin="jobs", identity=_form_identity(kwargs, "nornir.jobs"))
+    elif fun == "cancel":
+        jid = args[0] if args else kwargs.get("jid")
+        if not jid:
+            raise CommandExecutionError("No 'jid' argument provided")
+        return task(
+            plugin="cancel",
+            jid=str(jid),
+            identity=_form_identity(kwargs, "nornir.cancel"),
+        )
+    elif fun == "job_result":
+        handle = args[0] if args else kwargs.get("handle")
+        if not handle:
+            raise CommandExecutionError("No 'handle' argument provided")
+        return task(
+            plugin="job_result",
+            handle=handle,
+            identity=_form_identity(kwargs, "nornir.job_result"),
+        )
     elif fun in ["workers", "worker"]:
         kwargs["call"] = args[0] if len(args) == 1 else kwargs["call"]
         return __proxy__["nornir.workers_utils"](**kwargs)
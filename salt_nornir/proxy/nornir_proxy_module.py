@@ -56,6 +56,10 @@ Below parameters can be specified in Proxy Minion Pillar.
   populated with data from proxy-minion pillar, pillar data ignored by any other inventory plugins
 - ``child_process_max_age`` - int, default is 660s, seconds to wait before forcefully kill child process
 - ``watchdog_interval`` - int, default is 30s, interval in seconds between watchdog runs
+- ``watchdog_keepalive_workers`` - int, default is 10, number of threads watchdog uses to run hosts' connections
+  keepalive checks in parallel
+- ``watchdog_keepalive_jitter`` - float, default is 0.5, fraction of ``watchdog_interval`` over which hosts'
+  connections keepalive checks randomly spread, set to 0 to start all checks straight away
 - ``proxy_always_alive`` - boolean, default is True, keep connections with devices alive or tear them down
   immediately after each job
 - ``connections_idle_timeout`` - int, seconds, default is 1 equivalent to ``proxy_always_alive`` set to True, if
@@ -68,8 +72,76 @@ Below parameters can be specified in Proxy Minion Pillar.
   possible actions: ``log`` - send syslog message, ``restart`` - shuts down proxy minion process.
 - ``nornir_workers`` - number of Nornir instances to create, each instance has worker thread associated with it
   allowing to run multiple tasks against hosts, as each worker dequeue tasks from jobs queue, default is 3
+- ``nornir_workers_min`` - int, default is ``nornir_workers`` value, minimum number of Nornir workers to keep
+  running, workers autoscaling enabled if ``nornir_workers_min`` is less than ``nornir_workers_max``
+- ``nornir_workers_max`` - int, default is ``nornir_workers`` value, maximum number of Nornir workers to run
+- ``nornir_workers_scale_queue_depth`` - int, default is 5, watchdog adds Nornir worker if number of jobs
+  waiting in queue reached this value
+- ``nornir_workers_scale_queue_wait`` - int, default is 10, watchdog adds Nornir worker if oldest job waiting
+  in queue waited longer than this number of seconds
+- ``nornir_workers_scale_cooldown`` - int, default is 300, watchdog removes Nornir worker with the highest ID,
+  closing its connections, if that worker was idle for longer than this number of seconds
+- ``nornir_workers_share_inventory`` - boolean, default is False, if True Nornir workers share hosts, groups and
+  defaults data of the first worker's inventory instead of each worker loading its own copy of the inventory,
+  each worker still has its own connections and top level data dictionaries to store rendered data and cache,
+  but nested data values and connection options are the same objects for all workers - modifying them in place,
+  for example by a task or by ``nr.nornir inventory`` call, changes them for all workers, use
+  ``nornir_workers_init_ram_usage_mbyte`` stat to compare memory usage with this parameter set to True and False
+- ``jobs_priority`` - dictionary keyed by execution module function name e.g. ``nr.cfg`` with default
+  priority values for jobs submitted by these functions, ``default`` key sets priority for other functions,
+  jobs with lower priority value run first, default priority is 5, per-job ``priority`` argument overrides it
+- ``worker_jobs_concurrency`` - int, default is 1, maximum number of jobs each Nornir worker can run at the same
+  time, jobs targeting overlapping sets of hosts always run one after another
+- ``worker_mode`` - str, default is ``thread``, ``thread`` - Nornir workers run jobs within proxy minion
+  main process, ``process`` - each Nornir worker runs jobs within its own long lived process forked from
+  main process with its own copy of inventory and own connections to devices, allowing CPU heavy jobs
+  processing, e.g. ``run_ttp``, ``xpath`` or ``nr.test`` results evaluation, to use several CPU cores,
+  in this mode incremental inventory refresh replaced with ``workers_only`` refresh; ``hcache`` and ``dcache``
+  results and ``nr.nornir clear_task_cache`` calls relayed by main process to all worker processes, while
+  ``nr.nornir inventory``, ``clear_hcache`` and ``clear_dcache`` changes mirrored to main process copy of
+  worker's inventory; worker processes forked by single threaded launcher process, that proxy minion
+  forks on startup before starting its threads, inheriting SaltStack loader context, each worker process
+  creates its own inventory from configuration, same applies to worker process restarted after it exited
+- ``jobs_queue_max_depth`` - int, default is 0, if number of jobs waiting in queue reached this value, new jobs
+  rejected straight away with ``busy, retry after N s`` error instead of waiting in queue, set to 0 to disable
+- ``jobs_queue_max_wait`` - int, default is 0, if estimated queue wait time based on number of free job slots,
+  waiting jobs, running jobs elapsed time and average duration of recent jobs is above this number of seconds,
+  new jobs rejected straight away with ``busy, retry after N s`` error, set to 0 to disable
+- ``async_results_max_count`` - int, default is 1000, maximum number of ``async`` jobs results to keep
+  in results store until retrieved by ``nr.nornir job_result`` call, oldest results evicted first
+- ``async_results_max_mbyte`` - int, default is 100, maximum overall size in MBytes of pickled ``async`` jobs
+  results kept in memory, oldest results evicted first, results bigger than ``results_spill_threshold_mbyte``
+  kept in spill files and not counted towards this limit, set to 0 to disable size limit
+- ``async_results_ttl`` - int, default is 3600, seconds to keep not retrieved ``async`` jobs results for
+- ``jobs_coalescing`` - boolean, default is False, if True, read-only jobs such as ``nr.cli`` or ``nr.nc get_config``
+  identical to a job already queued or running - same task plugin, arguments and filtered hosts - not run
+  again but receive results of that job, per-job ``coalesce`` argument overrides this setting
 - ``files_base_path`` - str, default is ``/var/salt-nornir/{proxy_id}/files/``, OS path to folder where to save files
   on a per-host basis using `ToFileProcessor <https://nornir-salt.readthedocs.io/en/latest/Processors/ToFileProcessor.html>_`,
+- ``results_spill_threshold_mbyte`` - int, default is 10, job results bigger than this value in MBytes
+  saved in spill file under ``files_base_path`` folder and read by job submitting process from there instead
+  of being sent over job's reply connection, set to 0 to disable, watchdog removes spill files older than
+  ``child_process_max_age`` left by results that were never collected
+- ``render_templates_cache_size`` - int, default is 1000, maximum number of compiled Jinja2 templates to
+  keep in least recently used cache keyed by template content hash, compiled templates reused to render
+  ``render`` arguments content for each host and across jobs, set to 0 to disable
+- ``render_workers`` - int, default is 0, number of processes to render ``render`` arguments Jinja2 templates
+  for hosts in parallel, rendering processes started on first use and reused across jobs, if less than 2 hosts
+  content rendered one by one in Nornir worker thread, per-job ``render_workers`` argument overrides this setting
+- ``file_download_cache_ttl`` - int, default is 60, seconds to use files content downloaded from master or
+  other URLs without checking it, after that ``salt://`` files revalidated using master file hash and only
+  downloaded again if file changed, set to 0 to disable files download cache
+- ``file_download_cache_size_mbyte`` - int, default is 100, maximum size in MBytes of files content
+  download cache, least recently used files evicted first
+- ``results_cache_ttl`` - int, default is 0, seconds to keep ``hcache`` and ``dcache`` task results for,
+  0 means keep results until cleared, per-job ``cache_ttl`` argument overrides this setting
+- ``results_cache_max_mbyte`` - int, default is 100, maximum size in MBytes of ``hcache`` and ``dcache``
+  task results shared by all Nornir workers, least recently cached results evicted first, set to 0 to
+  disable size limit
+- ``commands_cache_ttl`` - dictionary keyed by command or RPC call name glob pattern with values set to
+  number of seconds to keep ``cache`` argument results for, e.g. ``show version: 3600``, first matching
+  pattern used, results for commands that do not match any pattern not cached, default is empty dictionary,
+  per-job integer ``cache`` argument overrides this setting
 - ``files_max_count`` - int, default is 5, maximum number of file version for ``tf`` argument used by
   `ToFileProcessor <https://nornir-salt.readthedocs.io/en/latest/Processors/ToFileProcessor.html#tofileprocessor-plugin>`_
 - ``nr_cli`` - dictionary of default arguments to use with ``nr.cli`` execution module function, default is none
@@ -78,6 +150,11 @@ Below parameters can be specified in Proxy Minion Pillar.
 - ``event_progress_all`` - boolean, default is False, if True emits progress events for all tasks using
   `SaltEventProcessor <https://nornir-salt.readthedocs.io/en/latest/Processors/SaltEventProcessor.html>_`,
   per-task ``event_progress`` argument overrides ``event_progress_all`` parameter.
+- ``jobs_scheduling`` - str, default is ``first_idle``, defines how jobs distributed across Nornir workers,
+  ``first_idle`` - job picked up by first idle worker, ``affinity`` - job sent to the worker that already
+  has connections to most of the job's target hosts, falling back to the least loaded worker
+- ``jobs_affinity_max_wait`` - int, default is 3, seconds ``affinity`` job waits for the busy worker it was
+  sent to before idle worker takes it over, set to 0 to take over straight away
 
 Nornir uses `inventory <https://nornir.readthedocs.io/en/latest/tutorials/intro/inventory.html>`_
 to store information about devices to interact with. Inventory can contain
@@ -96,13 +173,47 @@ Nornir proxy-minion pillar example:
       proxy_always_alive: True
       connections_idle_timeout: 1
       watchdog_interval: 30
+      watchdog_keepalive_workers: 10
+      watchdog_keepalive_jitter: 0.5
       child_process_max_age: 660
       job_wait_timeout: 600
       memory_threshold_mbyte: 300
       memory_threshold_action: log
       files_base_path: "/var/salt-nornir/{proxy_id}/files/"
       files_max_count: 5
+      results_spill_threshold_mbyte: 10
+      render_templates_cache_size: 1000
+      render_workers: 0
+      file_download_cache_ttl: 60
+      file_download_cache_size_mbyte: 100
+      results_cache_ttl: 0
+      results_cache_max_mbyte: 100
+      commands_cache_ttl:
+        "show version": 3600
+        "show ip route*": 30
+        get_config: 300
       event_progress_all: True
+      jobs_scheduling: first_idle
+      jobs_affinity_max_wait: 3
+      worker_jobs_concurrency: 1
+      worker_mode: thread
+      jobs_queue_max_depth: 0
+      jobs_queue_max_wait: 0
+      jobs_coalescing: False
+      async_results_max_count: 1000
+      async_results_max_mbyte: 100
+      async_results_ttl: 3600
+      jobs_priority:
+        nr.cfg: 1
+        nr.tping: 1
+        nr.learn: 9
+        default: 5
+      nornir_workers_share_inventory: False
+      nornir_workers_min: 3
+      nornir_workers_max: 3
+      nornir_workers_scale_queue_depth: 5
+      nornir_workers_scale_queue_wait: 10
+      nornir_workers_scale_cooldown: 300
       nr_cli: {}
       nr_cfg: {}
       nr_nc: {}
@@ -344,9 +455,12 @@ workers_utils
 
 # Import python std lib
 import asyncio
+import atexit
 import logging
 import threading
 import multiprocessing
+import multiprocessing.connection
+import multiprocessing.reduction
 import queue
 import os
 import time
@@ -355,6 +469,20 @@ import signal
 import psutil
 import copy
 import sys
+import heapq
+import itertools
+import bisect
+import random
+import concurrent.futures
+import pickle
+import mmap
+import uuid
+import zlib
+import hashlib
+import importlib
+import io
+import collections
+import fnmatch
 
 from salt_nornir.utils import _is_url
 from salt_nornir.pydantic_models import model_nornir_config
@@ -374,6 +502,20 @@ try:
 except:
     log.error("Nornir Proxy Module - failed importing SALT libraries")
 
+try:
+    import jinja2
+    import jinja2.sandbox
+    import jinja2.meta
+    import salt.utils.jinja
+    import salt.utils.data
+    import salt.utils.dictupdate
+    import salt.utils.templates
+    from salt.utils.decorators.jinja import JinjaFilter, JinjaGlobal, JinjaTest
+
+    HAS_SALT_JINJA = True
+except ImportError:
+    HAS_SALT_JINJA = False
+
 try:
     # starting with salt 3003 need to use loader_context to reconstruct
     # __salt__ dunder within treads:
@@ -394,7 +536,17 @@ minion_process = psutil.Process(os.getpid())
 # Import third party libs
 try:
     from nornir import InitNornir
-    from nornir.core.task import MultiResult, Result
+    from nornir.core.task import MultiResult, Result, AggregatedResult
+    from nornir.core.state import GlobalState
+    from nornir.core.inventory import (
+        Inventory,
+        Hosts,
+        Host,
+        Groups,
+        Group,
+        Defaults,
+        ParentGroups,
+    )
     from nornir_salt.plugins.functions import (
         FFun,
         ResultSerializer,
@@ -410,6 +562,8 @@ try:
         DataProcessor,
         SaltEventProcessor,
     )
+    from nornir_salt.plugins.inventory import DictInventory
+    from nornir_salt.utils import cli_form_commands
 
     HAS_NORNIR = True
 except ImportError:
@@ -427,6 +581,27 @@ __proxyenabled__ = ["nornir"]
 # -----------------------------------------------------------------------------
 
 __virtualname__ = "nornir"
+# upper bounds in seconds of jobs phases latency histograms buckets
+HISTOGRAM_BUCKETS = [
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    120,
+    300,
+    600,
+]
+# Fx hosts filters arguments names, excluded from jobs coalesce key
+FX_FILTERS = ["FO", "FB", "FH", "FG", "FP", "FL", "FM", "FX", "FN", "FC", "FR", "FT"]
 stats_dict = {
     "proxy_minion_id": None,
     "main_process_is_running": 0,
@@ -452,7 +627,44 @@ stats_dict = {
     "watchdog_runs": 0,
     "watchdog_child_processes_killed": 0,
     "watchdog_dead_connections_cleaned": 0,
+    "watchdog_pass_duration": 0,
+    "watchdog_keepalive_pass_duration": 0,
     "child_processes_count": 0,
+    "nornir_workers_init_ram_usage_mbyte": 0,
+    "jobs_queue_wait": {},
+    "jobs_affinity_scheduled": 0,
+    "jobs_affinity_hits": 0,
+    "jobs_affinity_hit_rate": 0,
+    "hosts_affinity_targeted": 0,
+    "hosts_affinity_warm": 0,
+    "hosts_affinity_hit_rate": 0,
+    "jobs_affinity_taken_over": 0,
+    "jobs_results_spilled": 0,
+    "jobs_results_spill_files_purged": 0,
+    "render_templates_cache_hits": 0,
+    "render_templates_cache_misses": 0,
+    "file_download_cache_hits": 0,
+    "file_download_cache_misses": 0,
+    "file_download_cache_revalidated": 0,
+    "results_cache_entries": 0,
+    "results_cache_size_mbyte": 0,
+    "results_cache_evicted": 0,
+    "results_cache_expired": 0,
+    "commands_cache_hits": 0,
+    "commands_cache_misses": 0,
+    "commands_cache_hit_rate": 0,
+    "nornir_workers_scale_ups": 0,
+    "nornir_workers_scale_downs": 0,
+    "nornir_workers_last_scaling": {},
+    "nornir_workers_processes_started": 0,
+    "jobs_rejected": 0,
+    "jobs_queue_estimated_wait": 0,
+    "jobs_coalesced": 0,
+    "jobs_cancelled": 0,
+    "async_jobs_submitted": 0,
+    "async_results_stored": 0,
+    "async_results_size_mbyte": 0,
+    "async_results_evicted": 0,
     # "child_processes_ram_usage": 0
 }
 nornir_data = {
@@ -462,9 +674,77 @@ nornir_data = {
     "res_queue": None,
     "worker_thread": None,
     "watchdog_thread": None,
+    "dispatcher_thread": None,
+    "jobs_condition": threading.Condition(),
+    "jobs_pending": [],
+    "jobs_sequence": itertools.count(),
+    "jobs_duration_average": 0.0,
+    "jobs_inflight": {},
+    "running_jobs": {},
+    "async_results": collections.OrderedDict(),
+    "async_results_lock": threading.Lock(),
+    "histograms": {},
+    "histograms_lock": threading.Lock(),
+    "render_templates_cache": collections.OrderedDict(),
+    "render_templates_cache_lock": threading.Lock(),
+    "render_pool": None,
+    "render_pool_size": 0,
+    "render_pool_lock": threading.Lock(),
+    "file_download_cache": collections.OrderedDict(),
+    "file_download_cache_lock": threading.Lock(),
+    "file_download_cache_size": 0,
+    "task_functions_cache": {},
+    "task_functions_cache_lock": threading.Lock(),
+    "results_cache": collections.OrderedDict(),
+    "results_cache_lock": threading.Lock(),
+    "results_cache_size": 0,
+    "results_cache_next_expiry": float("inf"),
     "nornir_workers": None,
     "nrs": [],
+    "worker_process_launcher": None,
 }
+# stats counters incremented within Nornir worker processes and relayed to main process
+worker_process_counters = [
+    "watchdog_dead_connections_cleaned",
+    "jobs_results_spilled",
+    "render_templates_cache_hits",
+    "render_templates_cache_misses",
+    "file_download_cache_hits",
+    "file_download_cache_misses",
+    "file_download_cache_revalidated",
+    "results_cache_evicted",
+    "results_cache_expired",
+    "commands_cache_hits",
+    "commands_cache_misses",
+]
+# settings sent to Nornir worker processes launcher for each new worker process
+worker_process_settings = [
+    "nornir_workers_config",
+    "inventory_pillar",
+    "nornir_filter_required",
+    "watchdog_interval",
+    "watchdog_keepalive_workers",
+    "watchdog_keepalive_jitter",
+    "job_wait_timeout",
+    "proxy_always_alive",
+    "connections_idle_timeout",
+    "event_progress_all",
+    "worker_jobs_concurrency",
+    "worker_mode",
+    "files_base_path",
+    "files_max_count",
+    "results_spill_threshold_mbyte",
+    "render_templates_cache_size",
+    "render_workers",
+    "file_download_cache_ttl",
+    "file_download_cache_size_mbyte",
+    "results_cache_ttl",
+    "results_cache_max_mbyte",
+    "commands_cache_ttl",
+    "nr_cli",
+    "nr_cfg",
+    "nr_nc",
+]
 
 # -----------------------------------------------------------------------------
 # propery functions
@@ -538,34 +818,51 @@ def init(opts, loader=None, init_queues=True, wkr_stats=None):
         },
     )
     user_defined_config = opts["pillar"].get("configuration", {})
-    nornir_data["salt_download_lock"] = multiprocessing.Lock()
-    nornir_data["tf_index_lock"] = multiprocessing.Lock()
+    # locks created once to stay shared with worker processes launcher across refresh
+    if "tf_index_lock" not in nornir_data:
+        nornir_data["salt_download_locks"] = [multiprocessing.Lock() for i in range(64)]
+        nornir_data["tf_index_lock"] = multiprocessing.Lock()
     nornir_data["nornir_workers"] = opts["proxy"].get("nornir_workers", 3)
+    nornir_data["nornir_workers_min"] = int(
+        opts["proxy"].get("nornir_workers_min", nornir_data["nornir_workers"])
+    )
+    nornir_data["nornir_workers_max"] = max(
+        int(opts["proxy"].get("nornir_workers_max", nornir_data["nornir_workers"])),
+        nornir_data["nornir_workers_min"],
+    )
+    nornir_data["nornir_workers"] = min(
+        max(nornir_data["nornir_workers"], nornir_data["nornir_workers_min"]),
+        nornir_data["nornir_workers_max"],
+    )
+    nornir_data["nornir_workers_scale_queue_depth"] = int(
+        opts["proxy"].get("nornir_workers_scale_queue_depth", 5)
+    )
+    nornir_data["nornir_workers_scale_queue_wait"] = int(
+        opts["proxy"].get("nornir_workers_scale_queue_wait", 10)
+    )
+    nornir_data["nornir_workers_scale_cooldown"] = int(
+        opts["proxy"].get("nornir_workers_scale_cooldown", 300)
+    )
+    nornir_data["nornir_workers_config"] = {
+        "runner": runner_config,
+        "inventory": inventory_config,
+        "user_defined": user_defined_config,
+        "share_inventory": opts["proxy"].get("nornir_workers_share_inventory", False),
+    }
+    # save pillar inventory to compare with on incremental refresh
+    if "inventory" in opts["proxy"]:
+        nornir_data["inventory_pillar"] = None
+    else:
+        nornir_data["inventory_pillar"] = copy.deepcopy(inventory_config["options"])
+    ram_usage_before = minion_process.memory_info().rss / 1024000
     for i in range(nornir_data["nornir_workers"]):
-        nornir_data["nrs"].append(
-            {
-                "nr": InitNornir(
-                    logging={"enabled": False},
-                    runner=copy.deepcopy(runner_config),
-                    inventory=copy.deepcopy(inventory_config),
-                    user_defined=copy.deepcopy(user_defined_config),
-                ),
-                "connections_lock": multiprocessing.Lock(),
-                "is_busy": multiprocessing.Event(),
-                "worker_jobs_started": 0,
-                "worker_jobs_completed": 0,
-                "worker_jobs_failed": 0,
-                "worker_tasks_completed": 0,
-                "worker_tasks_failed": 0,
-                "worker_hosts_tasks_failed": 0,
-                "worker_connections": {},
-                "worker_id": i + 1,
-                "worker_jobs_queue": multiprocessing.Queue(),
-            }
-        )
+        nornir_data["nrs"].append(_create_nornir_worker(worker_id=i + 1))
         # add previous stats
-        if wkr_stats:
+        if wkr_stats and i < len(wkr_stats):
             nornir_data["nrs"][-1].update(wkr_stats[i])
+    nornir_data["stats"]["nornir_workers_init_ram_usage_mbyte"] = round(
+        minion_process.memory_info().rss / 1024000 - ram_usage_before, 3
+    )
     # add parameters from proxy configuration
     nornir_data["nornir_filter_required"] = opts["proxy"].get(
         "nornir_filter_required", False
@@ -574,6 +871,12 @@ def init(opts, loader=None, init_queues=True, wkr_stats=None):
         "child_process_max_age", 660
     )
     nornir_data["watchdog_interval"] = int(opts["proxy"].get("watchdog_interval", 30))
+    nornir_data["watchdog_keepalive_workers"] = int(
+        opts["proxy"].get("watchdog_keepalive_workers", 10)
+    )
+    nornir_data["watchdog_keepalive_jitter"] = float(
+        opts["proxy"].get("watchdog_keepalive_jitter", 0.5)
+    )
     nornir_data["job_wait_timeout"] = int(opts["proxy"].get("job_wait_timeout", 600))
     nornir_data["proxy_always_alive"] = opts["proxy"].get("proxy_always_alive", True)
     nornir_data["connections_idle_timeout"] = opts["proxy"].get(
@@ -581,6 +884,29 @@ def init(opts, loader=None, init_queues=True, wkr_stats=None):
         1 if nornir_data["proxy_always_alive"] is True else 0,
     )
     nornir_data["event_progress_all"] = opts["proxy"].get("event_progress_all", False)
+    nornir_data["jobs_scheduling"] = opts["proxy"].get("jobs_scheduling", "first_idle")
+    nornir_data["jobs_affinity_max_wait"] = int(
+        opts["proxy"].get("jobs_affinity_max_wait", 3)
+    )
+    nornir_data["jobs_priority"] = opts["proxy"].get("jobs_priority", {})
+    nornir_data["worker_jobs_concurrency"] = int(
+        opts["proxy"].get("worker_jobs_concurrency", 1)
+    )
+    nornir_data["worker_mode"] = opts["proxy"].get("worker_mode", "thread")
+    nornir_data["jobs_queue_max_depth"] = int(
+        opts["proxy"].get("jobs_queue_max_depth", 0)
+    )
+    nornir_data["jobs_queue_max_wait"] = int(
+        opts["proxy"].get("jobs_queue_max_wait", 0)
+    )
+    nornir_data["jobs_coalescing"] = opts["proxy"].get("jobs_coalescing", False)
+    nornir_data["async_results_max_count"] = int(
+        opts["proxy"].get("async_results_max_count", 1000)
+    )
+    nornir_data["async_results_max_mbyte"] = int(
+        opts["proxy"].get("async_results_max_mbyte", 100)
+    )
+    nornir_data["async_results_ttl"] = int(opts["proxy"].get("async_results_ttl", 3600))
     nornir_data["memory_threshold_mbyte"] = int(
         opts["proxy"].get("memory_threshold_mbyte", 300)
     )
@@ -591,6 +917,24 @@ def init(opts, loader=None, init_queues=True, wkr_stats=None):
         "files_base_path", "/var/salt-nornir/{}/files/".format(opts["id"])
     )
     nornir_data["files_max_count"] = int(opts["proxy"].get("files_max_count", 5))
+    nornir_data["results_spill_threshold_mbyte"] = int(
+        opts["proxy"].get("results_spill_threshold_mbyte", 10)
+    )
+    nornir_data["render_templates_cache_size"] = int(
+        opts["proxy"].get("render_templates_cache_size", 1000)
+    )
+    nornir_data["render_workers"] = int(opts["proxy"].get("render_workers", 0))
+    nornir_data["file_download_cache_ttl"] = int(
+        opts["proxy"].get("file_download_cache_ttl", 60)
+    )
+    nornir_data["file_download_cache_size_mbyte"] = int(
+        opts["proxy"].get("file_download_cache_size_mbyte", 100)
+    )
+    nornir_data["results_cache_ttl"] = int(opts["proxy"].get("results_cache_ttl", 0))
+    nornir_data["results_cache_max_mbyte"] = int(
+        opts["proxy"].get("results_cache_max_mbyte", 100)
+    )
+    nornir_data["commands_cache_ttl"] = opts["proxy"].get("commands_cache_ttl", {})
     nornir_data["nr_cli"] = opts["proxy"].get("nr_cli", {})
     nornir_data["nr_cfg"] = opts["proxy"].get("nr_cfg", {})
     nornir_data["nr_nc"] = opts["proxy"].get("nr_nc", {})
@@ -601,11 +945,6 @@ def init(opts, loader=None, init_queues=True, wkr_stats=None):
     nornir_data["stats"]["hosts_count"] = len(
         nornir_data["nrs"][0]["nr"].inventory.hosts.keys()
     )
-    # Initiate multiprocessing related queus if they are not initialised
-    # already, which is the case if we doing workers_only refresh
-    if not nornir_data.get("jobs_queue") or init_queues:
-        nornir_data["jobs_queue"] = multiprocessing.Queue()
-        nornir_data["res_queue"] = multiprocessing.Queue()
     # if loader not None, meaning init() called by _refresh_nornir function
     if loader:
         loader = loader
@@ -615,6 +954,27 @@ def init(opts, loader=None, init_queues=True, wkr_stats=None):
     # salt <3003 does not use loader context
     else:
         loader = None
+    # fork worker processes launcher before any of proxy module threads started,
+    # launcher kept running for refresh to be able to enable worker processes
+    if nornir_data["dispatcher_thread"] is None:
+        _start_worker_process_launcher(loader)
+    # Initiate multiprocessing related queus if they are not initialised
+    # already, which is the case if we doing workers_only refresh
+    if not nornir_data.get("jobs_queue") or init_queues:
+        nornir_data["jobs_queue"] = multiprocessing.Queue()
+        nornir_data["res_queue"] = multiprocessing.Queue()
+        nornir_data["jobs_pending"].clear()
+        nornir_data["jobs_inflight"].clear()
+        nornir_data["running_jobs"].clear()
+        # pending async jobs lost together with jobs queue
+        with nornir_data["async_results_lock"]:
+            for handle, entry in list(nornir_data["async_results"].items()):
+                if entry["status"] == "pending":
+                    nornir_data["async_results"].pop(handle)
+        _start_dispatcher()
+    # make sure jobs dispatcher thread is running
+    elif not nornir_data["dispatcher_thread"].is_alive():
+        _start_dispatcher()
     # start worker threads
     for i in range(nornir_data["nornir_workers"]):
         nornir_data["nrs"][i]["worker_thread"] = threading.Thread(
@@ -648,7 +1008,7 @@ def shutdown():
     """
     This function implements this protocol to perform Nornir graceful shutdown:
 
-    1. Signal worker and watchdog threads to stop
+    1. Signal worker, dispatcher and watchdog threads to stop
     2. Close all connections to devices
     3. Close jobs and results queues
     4. Kill all child processes
@@ -660,19 +1020,19 @@ def shutdown():
     try:
         # trigger worker and watchdogs threads to stop
         nornir_data["initialized"] = False
-        # close connections to devices and delete old Nornir Objects
-        while nornir_data["nrs"]:
-            nr = nornir_data["nrs"].pop()
-            nr["nr"].close_connections(on_good=True, on_failed=True)
-            del nr
-        # close queues
+        _stop_workers()
+        # stop jobs dispatcher thread and close queues
+        nornir_data["jobs_queue"].put(None)
         nornir_data["jobs_queue"].close()
         nornir_data["jobs_queue"].join_thread()
         nornir_data["res_queue"].close()
         nornir_data["res_queue"].join_thread()
-        # kill child processes left
+        # stop rendering pool and kill child processes left, keeping worker
+        # processes launcher running for init to use it after refresh
+        _render_pool_terminate()
         for p in multiprocessing.active_children():
-            os.kill(p.pid, signal.SIGKILL)
+            if p.pid != _worker_process_launcher_pid():
+                os.kill(p.pid, signal.SIGKILL)
         log.info("Nornir-proxy MAIN PID {}, Nornir shutted down".format(os.getpid()))
         return True
     except:
@@ -734,6 +1094,124 @@ def _use_loader_context(func):
     return wrapper
 
 
+def _create_nornir_worker(worker_id):
+    """
+    Helper function to create Nornir worker dictionary using Nornir
+    configuration saved by ``init`` function.
+
+    :param worker_id: (int) Nornir worker ID
+    :return: Nornir worker dictionary
+    """
+    config = nornir_data["nornir_workers_config"]
+    # clone first worker's inventory sharing its data
+    if config["share_inventory"] and nornir_data["nrs"]:
+        nr = InitNornir(
+            logging={"enabled": False},
+            runner=copy.deepcopy(config["runner"]),
+            inventory={
+                "plugin": "DictInventory",
+                "options": {"hosts": {}, "groups": {}, "defaults": {}},
+            },
+            user_defined=copy.deepcopy(config["user_defined"]),
+        )
+        nr.inventory = _clone_inventory(nornir_data["nrs"][0]["nr"].inventory)
+    else:
+        inventory = copy.deepcopy(config["inventory"])
+        # use latest pillar inventory as it might be refreshed incrementally
+        if nornir_data.get("inventory_pillar") is not None:
+            inventory["options"] = copy.deepcopy(nornir_data["inventory_pillar"])
+        nr = InitNornir(
+            logging={"enabled": False},
+            runner=copy.deepcopy(config["runner"]),
+            inventory=inventory,
+            user_defined=copy.deepcopy(config["user_defined"]),
+        )
+    return {
+        "nr": nr,
+        "hosts_condition": threading.Condition(),
+        "hosts_in_use": set(),
+        "jobs_running": 0,
+        "is_busy": multiprocessing.Event(),
+        "worker_jobs_started": 0,
+        "worker_jobs_completed": 0,
+        "worker_jobs_failed": 0,
+        "worker_tasks_completed": 0,
+        "worker_tasks_failed": 0,
+        "worker_hosts_tasks_failed": 0,
+        "worker_affinity_hits": 0,
+        "worker_connections": {},
+        "worker_id": worker_id,
+        "worker_jobs_pending": [],
+        "worker_stop": threading.Event(),
+        "worker_last_active": time.time(),
+    }
+
+
+def _clone_inventory(inventory):
+    """
+    Helper function to create a copy of Nornir inventory that shares hosts,
+    groups and defaults data with original inventory.
+
+    Copy has its own hosts, groups and defaults objects with their own
+    connections and top level ``data`` dictionaries, so that rendered job data
+    and cached results saved in copy's hosts do not affect original inventory,
+    while ``data`` values and connection options are shared.
+
+    :param inventory: (obj) Nornir Inventory object to clone
+    :return: Nornir Inventory object
+    """
+    defaults = Defaults(
+        hostname=inventory.defaults.hostname,
+        port=inventory.defaults.port,
+        username=inventory.defaults.username,
+        password=inventory.defaults.password,
+        platform=inventory.defaults.platform,
+        data=dict(inventory.defaults.data),
+        connection_options=inventory.defaults.connection_options,
+    )
+
+    groups = Groups()
+    for group_name, group in inventory.groups.items():
+        groups[group_name] = _clone_inventory_element(group, Group, {}, defaults)
+    # link cloned groups to their cloned parent groups
+    for group_name, group in inventory.groups.items():
+        groups[group_name].groups = ParentGroups(
+            [groups.get(g.name, g) for g in group.groups]
+        )
+    hosts = Hosts(
+        {
+            host_name: _clone_inventory_element(host, Host, groups, defaults)
+            for host_name, host in inventory.hosts.items()
+        }
+    )
+
+    return Inventory(hosts=hosts, groups=groups, defaults=defaults)
+
+
+def _clone_inventory_element(element, element_class, groups, defaults):
+    """
+    Helper function to create a copy of Nornir host or group object.
+
+    :param element: (obj) Nornir Host or Group object to clone
+    :param element_class: (obj) Nornir Host or Group class
+    :param groups: (dict) groups to link copy to, keyed by group name
+    :param defaults: (obj) Nornir Defaults object to link copy to
+    :return: Nornir Host or Group object
+    """
+    return element_class(
+        name=element.name,
+        hostname=element.hostname,
+        port=element.port,
+        username=element.username,
+        password=element.password,
+        platform=element.platform,
+        groups=ParentGroups([groups.get(g.name, g) for g in element.groups]),
+        data=dict(element.data),
+        connection_options=element.connection_options,
+        defaults=defaults,
+    )
+
+
 def _load_custom_task_fun_from_text(function_text, function_name):
     """
     Helper function to load custom function code from text using
@@ -767,10 +1245,52 @@ def _file_download(url, saltenv="base"):
     """
     Helper function to download files from salt master or other locations.
 
+    Downloaded content cached in memory for ``file_download_cache_ttl`` seconds,
+    after that ``salt://`` files revalidated by comparing cached content hash
+    with file hash reported by master, downloading file only if hashes differ,
+    other URLs downloaded again. Cache size limited by ``file_download_cache_size_mbyte``,
+    least recently used files evicted first.
+
+    Downloads of the same URL serialized across proxy processes, while different URLs
+    downloaded in parallel.
+
     :param url: string url to file location
     :param saltenv: saltenv name to download files from
     """
-    with nornir_data["salt_download_lock"]:
+    ttl = nornir_data.get("file_download_cache_ttl", 0)
+    size_limit = nornir_data.get("file_download_cache_size_mbyte", 0) * 1024000
+    cache = nornir_data["file_download_cache"]
+    cache_key = (url, saltenv)
+    locks = nornir_data["salt_download_locks"]
+
+    # use stable hash to pick same lock for given URL in all processes
+    with locks[zlib.crc32(url.encode("utf-8")) % len(locks)]:
+        with nornir_data["file_download_cache_lock"]:
+            entry = cache.get(cache_key)
+        if entry is not None:
+            if time.time() - entry["timestamp"] < ttl:
+                _update_file_download_cache_stats("file_download_cache_hits")
+                return _decode_file_content(entry["data"])
+            # check if master file content changed
+            if url.startswith("salt://"):
+                master_hash = __salt__["cp.hash_file"](url, saltenv=saltenv)
+                hash_type = (master_hash or {}).get("hash_type")
+                if hash_type in hashlib.algorithms_available:
+                    # hash cached content using master hash type on first use
+                    if hash_type not in entry["hashes"]:
+                        entry["hashes"][hash_type] = hashlib.new(
+                            hash_type, entry["data"]
+                        ).hexdigest()
+                    if master_hash.get("hsum") == entry["hashes"][hash_type]:
+                        with nornir_data["file_download_cache_lock"]:
+                            entry["timestamp"] = time.time()
+                            if cache_key in cache:
+                                cache.move_to_end(cache_key)
+                        _update_file_download_cache_stats(
+                            "file_download_cache_revalidated"
+                        )
+                        return _decode_file_content(entry["data"])
+        _update_file_download_cache_stats("file_download_cache_misses")
         file_path = __salt__["cp.get_url"](url, dest="", saltenv=saltenv)
         if file_path is False:
             raise CommandExecutionError(
@@ -778,8 +1298,48 @@ def _file_download(url, saltenv="base"):
                     nornir_data["stats"]["main_process_pid"], url, saltenv
                 )
             )
-    with open(file_path, mode="r", encoding="utf-8") as f:
-        return f.read()
+        with open(file_path, mode="rb") as f:
+            data = f.read()
+        content = _decode_file_content(data)
+        # cache downloaded content, hashes calculated on revalidation
+        if ttl > 0 and len(data) <= size_limit:
+            entry = {
+                "data": data,
+                "size": len(data),
+                "timestamp": time.time(),
+                "hashes": {},
+            }
+            with nornir_data["file_download_cache_lock"]:
+                if cache_key in cache:
+                    nornir_data["file_download_cache_size"] -= cache[cache_key]["size"]
+                cache[cache_key] = entry
+                cache.move_to_end(cache_key)
+                nornir_data["file_download_cache_size"] += entry["size"]
+                while nornir_data["file_download_cache_size"] > size_limit:
+                    _, evicted = cache.popitem(last=False)
+                    nornir_data["file_download_cache_size"] -= evicted["size"]
+        return content
+
+
+def _decode_file_content(data):
+    """
+    Helper function to decode downloaded file bytes to text same way as
+    text mode ``open`` does, translating newlines.
+
+    :param data: (bytes) file content
+    :return: file content string
+    """
+    return io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").read()
+
+
+def _update_file_download_cache_stats(stat):
+    """
+    Helper function to increment file download cache stats counter.
+
+    :param stat: (str) name of stat to increment
+    """
+    with nornir_data["file_download_cache_lock"]:
+        nornir_data["stats"][stat] += 1
 
 
 @_use_loader_context
@@ -788,15 +1348,30 @@ def _get_or_import_task_fun(plugin):
     Tries to get task function from globals() dictionary,
     if its not there tries to import task and inject it
     in globals() dictionary for future reference.
+
+    Task functions loaded from URLs compiled once and cached keyed by
+    URL together with content hash, content itself sourced using files
+    download cache.
     """
     task_fun = plugin.split(".")[-1]
     if task_fun in globals() and plugin == globals()[task_fun].__module__:
         task_function = globals()[task_fun]
     # check if plugin referring to file on master, download and compile it if so
     elif _is_url(plugin):
-        function_text = None
         function_text = _file_download(plugin)
-        task_function = _load_custom_task_fun_from_text(function_text, "task")
+        text_hash = hashlib.sha256(function_text.encode("utf-8")).hexdigest()
+        with nornir_data["task_functions_cache_lock"]:
+            cached = nornir_data["task_functions_cache"].get(plugin)
+        # reuse compiled task function if its content did not change
+        if cached and cached["hash"] == text_hash:
+            task_function = cached["function"]
+        else:
+            task_function = _load_custom_task_fun_from_text(function_text, "task")
+            with nornir_data["task_functions_cache_lock"]:
+                nornir_data["task_functions_cache"][plugin] = {
+                    "hash": text_hash,
+                    "function": task_function,
+                }
     else:
         log.debug(
             "Nornir-proxy PID {}, _get_or_import_task_fun, importing {} from {}".format(
@@ -812,12 +1387,33 @@ def _get_or_import_task_fun(plugin):
     return task_function
 
 
+def _clear_task_cache():
+    """
+    Helper function to clear compiled task functions cache together with
+    download cache entries for these task functions' URLs, forcing task
+    functions reload on next use.
+
+    :return: sorted list of cleared task plugins URLs
+    """
+    with nornir_data["task_functions_cache_lock"]:
+        plugins = sorted(nornir_data["task_functions_cache"].keys())
+        nornir_data["task_functions_cache"].clear()
+    with nornir_data["file_download_cache_lock"]:
+        for cache_key in list(nornir_data["file_download_cache"].keys()):
+            if cache_key[0] in plugins:
+                entry = nornir_data["file_download_cache"].pop(cache_key)
+                nornir_data["file_download_cache_size"] -= entry["size"]
+    return plugins
+
+
 def _watchdog(loader):
     """
     Thread worker to maintain nornir proxy process and it's children livability.
     """
     child_processes = {}
+    keepalive_thread = None
     while nornir_data["initialized"]:
+        pass_start = time.time()
         nornir_data["stats"]["watchdog_runs"] += 1
         # run FD limit checks
         try:
@@ -869,17 +1465,24 @@ def _watchdog(loader):
                         target=_worker, args=(nr, loader)
                     )
                     nr["worker_thread"].start()
+            if not nornir_data["dispatcher_thread"].is_alive():
+                _start_dispatcher()
         except:
             log.error(
                 "Nornir-proxy MAIN PID {} watchdog, worker thread is_alive check error: {}".format(
                     os.getpid(), traceback.format_exc()
                 )
             )
-        # Handle child processes lifespan
+        # Handle child processes lifespan, skipping Nornir worker processes launcher
+        # and rendering pool processes
         try:
+            workers_pids = [_worker_process_launcher_pid()]
+            workers_pids.extend(_render_pool_pids())
             for p in multiprocessing.active_children():
                 cpid = p.pid
-                if not p.is_alive():
+                if cpid in workers_pids:
+                    continue
+                elif not p.is_alive():
                     _ = child_processes.pop(cpid, None)
                 elif cpid not in child_processes:
                     child_processes[cpid] = {
@@ -909,69 +1512,63 @@ def _watchdog(loader):
                     os.getpid(), traceback.format_exc()
                 )
             )
-        # check if need to tear down connections that are idle
+        # check if need to tear down connections that are idle, worker
+        # processes tear down their connections themselves
         try:
-            # iterate over Nornir worker instances
-            timeout = nornir_data["connections_idle_timeout"]
             for nr in nornir_data["nrs"]:
-                # get a list of hosts that aged beyond idle timeout
-                hosts_to_disconnect = []
-                if timeout > 1:
-                    for host_name in list(nr["worker_connections"].keys()):
-                        conn_data = nr["worker_connections"][host_name]
-                        age = time.time() - conn_data["last_use_timestamp"]
-                        if age > timeout:
-                            hosts_to_disconnect.append(host_name)
-                # run task to disconnect connections for aged hosts
-                if hosts_to_disconnect and nr["connections_lock"].acquire(block=False):
-                    try:
-                        aged_hosts = FFun(nr["nr"], FL=hosts_to_disconnect)
-                        aged_hosts.run(
-                            task=_get_or_import_task_fun(
-                                "nornir_salt.plugins.tasks.connections"
-                            ),
-                            call="close",
-                        )
-                        log.debug(
-                            "Nornir-proxy MAIN PID {} watchdog, nornir-worker-{}, disconnected: {}".format(
-                                os.getpid(), nr["worker_id"], hosts_to_disconnect
-                            )
-                        )
-                        # remove disconnected hosts from stats
-                        for h_name in hosts_to_disconnect:
-                            nr["worker_connections"].pop(h_name)
-                    except Exception as e:
-                        raise e
-                    finally:
-                        nr["connections_lock"].release()
+                if not nr.get("worker_process"):
+                    _close_idle_connections(nr)
         except:
             log.error(
                 "Nornir-proxy MAIN PID {} watchdog, connections idle check error: {}".format(
                     os.getpid(), traceback.format_exc()
                 )
             )
-        # keepalive connections and clean up dead connections if any
+        # add or remove Nornir workers depending on jobs queue
         try:
-            for nr in nornir_data["nrs"]:
-                if nornir_data["proxy_always_alive"] and nr["connections_lock"].acquire(
-                    block=False
-                ):
-                    log.debug(
-                        "Nornir-proxy {} MAIN PID {} watchdog, nornir-worker-{} connections keepalive".format(
-                            nornir_data["stats"]["proxy_minion_id"],
-                            nornir_data["stats"]["main_process_pid"],
-                            nr["worker_id"],
-                        )
-                    )
-                    try:
-                        stats = HostsKeepalive(nr["nr"])
-                        nornir_data["stats"][
-                            "watchdog_dead_connections_cleaned"
-                        ] += stats["dead_connections_cleaned"]
-                    except Exception as e:
-                        raise e
-                    finally:
-                        nr["connections_lock"].release()
+            _autoscale_workers(loader)
+        except:
+            log.error(
+                "Nornir-proxy MAIN PID {} watchdog, nornir workers autoscaling error: {}".format(
+                    os.getpid(), traceback.format_exc()
+                )
+            )
+        # remove expired or no longer used hcache and dcache results
+        try:
+            _results_cache_purge(remove_unused=True)
+        except:
+            log.error(
+                "Nornir-proxy MAIN PID {} watchdog, results cache purge error: {}".format(
+                    os.getpid(), traceback.format_exc()
+                )
+            )
+        # remove spill files of job results that were never collected
+        try:
+            _spill_files_purge()
+        except:
+            log.error(
+                "Nornir-proxy MAIN PID {} watchdog, results spill files purge error: {}".format(
+                    os.getpid(), traceback.format_exc()
+                )
+            )
+        # remove expired async jobs results
+        try:
+            _async_results_purge()
+        except:
+            log.error(
+                "Nornir-proxy MAIN PID {} watchdog, async results purge error: {}".format(
+                    os.getpid(), traceback.format_exc()
+                )
+            )
+        # keepalive connections and clean up dead connections if any in background
+        try:
+            if nornir_data["proxy_always_alive"] and not (
+                keepalive_thread and keepalive_thread.is_alive()
+            ):
+                keepalive_thread = threading.Thread(
+                    target=_keepalive_connections, daemon=True
+                )
+                keepalive_thread.start()
         except:
             log.error(
                 "Nornir-proxy MAIN PID {} watchdog, HostsKeepalive check error: {}".format(
@@ -979,198 +1576,2505 @@ def _watchdog(loader):
                 )
             )
 
+        nornir_data["stats"]["watchdog_pass_duration"] = round(
+            time.time() - pass_start, 3
+        )
         time.sleep(nornir_data["watchdog_interval"])
 
 
-def _worker(wkr_data, loader):
+def _close_idle_connections(wkr_data):
     """
-    Target function for worker thread to run jobs from
-    jobs_queue submitted by execution module processes
+    Helper function to tear down worker's hosts connections that were not
+    in use for longer than ``connections_idle_timeout``.
 
-    :param wkr_data: (dict) dictionary that contain nornir instance and other parameters
-    :param loader: (obj or None) SaltStack loader context object
+    Hosts in use by jobs skipped.
+
+    :param wkr_data: (dict) Nornir worker dictionary
     """
-    worker_id = wkr_data["worker_id"]  # get worker ID integer
-    ppid = nornir_data["stats"]["main_process_pid"]
-    while nornir_data["initialized"]:
-        wkr_data["is_busy"].clear()  # no longer busy
-        time.sleep(0.01)
-        job, output = None, None
+    timeout = nornir_data["connections_idle_timeout"]
+    # get a list of hosts that aged beyond idle timeout
+    hosts_to_disconnect = []
+    if timeout > 1:
+        for host_name in list(wkr_data["worker_connections"].keys()):
+            conn_data = wkr_data["worker_connections"][host_name]
+            age = time.time() - conn_data["last_use_timestamp"]
+            if age > timeout:
+                hosts_to_disconnect.append(host_name)
+    # lock aged hosts that are not in use by jobs
+    hosts_to_disconnect = _lock_free_hosts(wkr_data, hosts_to_disconnect)
+    # run task to disconnect connections for aged hosts
+    if hosts_to_disconnect:
         try:
-            # try to get job from worker specific queue
-            try:
-                job = wkr_data["worker_jobs_queue"].get(block=True, timeout=0.1)
-            except queue.Empty:
-                # check if all higher order workers are busy
-                if all(
-                    [
-                        wkr["is_busy"].is_set()
-                        for wkr in nornir_data["nrs"][: worker_id - 1]
-                    ]
-                ):
-                    # try to get job from shared queue
-                    job = nornir_data["jobs_queue"].get(block=True, timeout=0.1)
-                else:
-                    continue
-            # got the job, I am busy now
-            wkr_data["is_busy"].set()
-            wkr_data["worker_jobs_started"] += 1
-            # check if its a call for a special task
-            if job["task_fun"] == "test":
-                wkr_data["worker_jobs_completed"] += 1
-                nornir_data["res_queue"].put(
-                    {"output": True, "identity": job["identity"]}
-                )
-                continue
-            if job["task_fun"] == "clear_dcache":
-                output = _clear_dcache(
-                    nr=wkr_data["nr"], cache_keys=job["kwargs"].get("cache_keys")
-                )
-                wkr_data["worker_jobs_completed"] += 1
-                nornir_data["res_queue"].put(
-                    {"output": output, "identity": job["identity"]}
-                )
-                continue
-            if job["task_fun"] == "refresh":
-                wkr_data["worker_jobs_completed"] += 1
-                nornir_data["res_queue"].put(
-                    {"output": True, "identity": job["identity"]}
-                )
-                # loader used by decorator, loader_ used by _refresh_nornir itself
-                _refresh_nornir(loader=loader, loader_=loader, **job["kwargs"])
-                # stop this worker thread as another one will be started
-                break
-            if job["task_fun"] == "shutdown":
-                wkr_data["worker_jobs_completed"] += 1
-                nornir_data["res_queue"].put(
-                    {"output": True, "identity": job["identity"]}
+            aged_hosts = FFun(wkr_data["nr"], FL=hosts_to_disconnect)
+            aged_hosts.run(
+                task=_get_or_import_task_fun("nornir_salt.plugins.tasks.connections"),
+                call="close",
+            )
+            log.debug(
+                "Nornir-proxy PID {} watchdog, nornir-worker-{}, disconnected: {}".format(
+                    os.getpid(), wkr_data["worker_id"], hosts_to_disconnect
                 )
-                # stop this worker thread as another one will be started
-                shutdown()
+            )
+            # remove disconnected hosts from stats
+            for h_name in hosts_to_disconnect:
+                wkr_data["worker_connections"].pop(h_name)
+        finally:
+            _unlock_hosts(wkr_data, hosts_to_disconnect)
+
+
+def _keepalive_host(wkr_data, host_name):
+    """
+    Helper function to run connections keepalive check for single host.
+
+    Host skipped if it is in use by jobs.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param host_name: (str) name of host to check connections for
+    :return: number of dead connections cleaned
+    """
+    if not _lock_free_hosts(wkr_data, [host_name]):
+        return 0
+    try:
+        nr = wkr_data["nr"]
+        host_nr = nr.__class__(
+            **{
+                **nr.__dict__,
+                "inventory": Inventory(
+                    hosts=Hosts({host_name: nr.inventory.hosts[host_name]}),
+                    groups=nr.inventory.groups,
+                    defaults=nr.inventory.defaults,
+                ),
+            }
+        )
+        return HostsKeepalive(host_nr)["dead_connections_cleaned"]
+    finally:
+        _unlock_hosts(wkr_data, [host_name])
+
+
+def _keepalive_connections():
+    """
+    Function to run hosts' connections keepalive checks across all Nornir
+    workers using bounded pool of threads.
+
+    Checks start times randomly spread over ``watchdog_keepalive_jitter``
+    fraction of ``watchdog_interval`` to not hit all hosts at once, each
+    check only locks the host it runs for.
+    """
+    pass_start = time.time()
+    window = nornir_data["watchdog_interval"] * nornir_data["watchdog_keepalive_jitter"]
+    # form a list of hosts with connections and their checks start delays
+    checks = sorted(
+        (random.uniform(0, window), wkr_data["worker_id"], host_name, wkr_data)
+        for wkr_data in nornir_data["nrs"]
+        for host_name, host in list(wkr_data["nr"].inventory.hosts.items())
+        if host.connections
+    )
+    log.debug(
+        "Nornir-proxy {} MAIN PID {} watchdog, running connections keepalive for {} hosts".format(
+            nornir_data["stats"]["proxy_minion_id"],
+            nornir_data["stats"]["main_process_pid"],
+            len(checks),
+        )
+    )
+    futures = {}
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(nornir_data["watchdog_keepalive_workers"], 1)
+    ) as executor:
+        for delay, worker_id, host_name, wkr_data in checks:
+            time_left = pass_start + delay - time.time()
+            if time_left > 0:
+                time.sleep(time_left)
+            if not nornir_data["initialized"]:
                 break
-            if job["task_fun"] == "inventory":
-                output = InventoryFun(wkr_data["nr"], **job["kwargs"])
-                wkr_data["worker_jobs_completed"] += 1
-                nornir_data["res_queue"].put(
-                    {"output": output, "identity": job["identity"]}
-                )
-                continue
-            # execute nornir task
-            task_fun = _get_or_import_task_fun(job["task_fun"], loader=loader)
-            log.info(
-                "Nornir-proxy MAIN PID {} starting task '{}'".format(ppid, job["name"])
-            )
-            # lock connections and run the task
-            with wkr_data["connections_lock"]:
-                output = run(
-                    task=task_fun,
-                    loader=loader,
-                    identity=job["identity"],
-                    name=job["name"],
-                    nr=wkr_data["nr"],
-                    wkr_data=wkr_data,
-                    **job["kwargs"],
-                )
-            wkr_data["worker_jobs_completed"] += 1
-        except queue.Empty:
-            continue
-        except:
-            tb = traceback.format_exc()
-            output = "Nornir-proxy MAIN PID {} job failed: {}, error:\n'{}'".format(
-                ppid, job, tb
-            )
-            log.error(output)
-            wkr_data["worker_jobs_failed"] += 1
-        # submit job results in results queue
-        nornir_data["res_queue"].put({"output": output, "identity": job["identity"]})
-        del job, output
-        # close connections to devices if proxy_always_alive is False
-        if (
-            nornir_data["proxy_always_alive"] is False
-            or nornir_data["connections_idle_timeout"] == 0
-        ):
+            futures[executor.submit(_keepalive_host, wkr_data, host_name)] = (
+                worker_id,
+                host_name,
+            )
+        for future in concurrent.futures.as_completed(futures):
             try:
-                wkr_data["nr"].close_connections(on_good=True, on_failed=True)
+                nornir_data["stats"][
+                    "watchdog_dead_connections_cleaned"
+                ] += future.result()
             except:
                 log.error(
-                    "Nornir-proxy MAIN PID {} worker thread, Nornir close_connections error: {}".format(
-                        ppid, traceback.format_exc()
+                    "Nornir-proxy MAIN PID {} watchdog, nornir-worker-{} host '{}' HostsKeepalive check error: {}".format(
+                        os.getpid(), *futures[future], traceback.format_exc()
                     )
                 )
+    nornir_data["stats"]["watchdog_keepalive_pass_duration"] = round(
+        time.time() - pass_start, 3
+    )
 
 
-@_use_loader_context
-def _fire_events(result):
+def _send_result(job, output, partial=False, busy=False):
     """
-    Helper function to iterate over results and fire event for
-    tasks that either has failed=True or success=False.
-
-    :param result: (obj) Nornir AggregatedResult object
+    Helper function to deliver job results straight to the process that
+    submitted the job using job's reply connection. Jobs without reply
+    connection get their results put in results queue.
+
+    :param job: (dict) job dictionary
+    :param output: (any) job results
+    :param partial: (bool) if True, output is a chunk of streamed job results
+        and more results to follow
+    :param busy: (bool) if True, job was rejected by admission control and
+        output is an error message
+    :return: list of jobs results delivered to, including coalesced jobs
     """
-    results_list = ResultSerializer(result, to_dict=False, add_details=True)
-    for res in results_list:
-        if res.get("failed") is True or res.get("success") is False:
-            __salt__["event.send"](
-                tag="nornir-proxy/{proxy_id}/{host}/task/failed/{name}".format(
-                    proxy_id=nornir_data["stats"]["proxy_minion_id"],
-                    host=res["host"],
-                    name=res["name"],
-                ),
-                data=res,
+    delivered = [job]
+    # deliver final results to identical jobs coalesced with this job as well
+    if not partial and job.get("coalesce_key"):
+        with nornir_data["jobs_condition"]:
+            if nornir_data["jobs_inflight"].get(job["coalesce_key"]) is job:
+                nornir_data["jobs_inflight"].pop(job["coalesce_key"])
+            coalesced_jobs = job.pop("coalesced_jobs", [])
+        for coalesced_job in coalesced_jobs:
+            delivered.extend(_send_result(coalesced_job, output))
+    # job cancelled while running for coalesced jobs already received its results
+    if job.get("cancel_detached"):
+        return delivered[1:]
+    res = {"output": output, "identity": job["identity"]}
+    if partial:
+        res["partial"] = True
+    if busy:
+        res["busy"] = True
+    # keep async job results in results store until retrieved
+    if job.get("async_handle"):
+        _async_results_store(job["async_handle"], res)
+        return delivered
+    reply_conn = job.get("reply_conn")
+    if reply_conn is None:
+        nornir_data["res_queue"].put(_dump_job_result(res))
+        return delivered
+    payload = _dump_job_result(res)
+    try:
+        reply_conn.send_bytes(payload)
+    except (BrokenPipeError, EOFError, ConnectionResetError):
+        _discard_job_result(payload)
+        log.error(
+            "Nornir-proxy MAIN PID {} failed to deliver job results, identity '{}', "
+            "job submitter is gone".format(os.getpid(), job["identity"])
+        )
+    except:
+        _discard_job_result(payload)
+        tb = traceback.format_exc()
+        log.error(
+            "Nornir-proxy MAIN PID {} failed to send job results, identity '{}', error: {}".format(
+                os.getpid(), job["identity"], tb
+            )
+        )
+        try:
+            reply_conn.send(
+                {
+                    "output": "Nornir-proxy MAIN PID {} failed to send job results, error:\n'{}'".format(
+                        os.getpid(), tb
+                    ),
+                    "identity": job["identity"],
+                }
             )
+        except:
+            pass
+    finally:
+        # keep connection open for the rest of streamed results
+        if not partial:
+            reply_conn.close()
+    return delivered
 
 
-def _load_job_data(job_data, saltenv="base"):
+def _async_results_register(job):
     """
-    Helper function to process and load job data.
+    Helper function to add pending entry for async job to results store.
 
-    :param job_data: (str, list or dict) data to process
-    :param saltenv: (str) salt environment
-    :param return: string, dict or list containing loaded job data
+    :param job: (dict) job dictionary with ``async_handle`` key
     """
-    ret = job_data
-    # handle job_data="salt://path/to/file.xyz"
-    if isinstance(job_data, str):
-        if _is_url(job_data):
-            return __salt__["slsutil.renderer"](path=job_data, saltenv=saltenv)
-        else:
-            # return __salt__["slsutil.renderer"](string=job_data, saltenv=saltenv)
-            return job_data
-    # handle job_data='["salt://path/to/file.xyz"]'
-    elif isinstance(job_data, list):
-        ret = [
-            _load_job_data(i, saltenv) if isinstance(i, str) else i for i in job_data
-        ]
-    # handle job_data='{"foo": "salt://path/to/file.xyz"}'
-    elif isinstance(job_data, dict):
-        ret = {
-            k: _load_job_data(v, saltenv) if isinstance(v, str) else v
-            for k, v in job_data.items()
+    with nornir_data["async_results_lock"]:
+        nornir_data["async_results"][job["async_handle"]] = {
+            "status": "pending",
+            "identity": job["identity"],
+            "submitted": job.get("queued_timestamp", time.time()),
+            "completed": None,
+            "payload": None,
+            "size": 0,
+            "spill_file": None,
         }
-    log.debug(
-        "Nornir-proxy MAIN PID {} worker thread, loaded job data '{}'".format(
-            os.getpid(), type(job_data)
-        )
-    )
-    return ret
+    _async_results_purge()
 
 
-@_use_loader_context
-def _download_and_render_files(hosts, render, kwargs, ignore_keys):
+def _async_results_store(handle, res):
     """
-    Helper function to iterate over hosts and render content for each of them.
-
-    Rendering results saved in host's ``__task__`` attribute as a dictionary
-    keyed by the items from ``render`` list.
+    Helper function to save async job results in results store. Results kept
+    pickled, results bigger than ``results_spill_threshold_mbyte`` kept in
+    spill file instead of memory.
 
-    :param hosts: (obj) Nornir object with hosts inventory
-    :param render: (list or str) list of keys or comma separated string
-        of key names from kwargs to run rendering for
-    :param kwargs: (dict) dictionary with data to render
-    :param ignore_keys: (list or str) key names to ignore rendering for
-    :return: dictionary of failed hosts
+    :param handle: (str) async job handle
+    :param res: (dict) job results dictionary
     """
-    # extract and form attributes
+    payload, spill_file = _dump_job_result(res, with_spill_file=True)
+    with nornir_data["async_results_lock"]:
+        entry = nornir_data["async_results"].pop(handle, None) or {
+            "identity": res["identity"],
+            "submitted": time.time(),
+        }
+        entry.update(
+            {
+                "status": "completed",
+                "completed": time.time(),
+                "busy": res.get("busy", False),
+                "payload": payload,
+                "size": 0 if spill_file else len(payload),
+                "spill_file": spill_file,
+            }
+        )
+        nornir_data["async_results"][handle] = entry
+    _async_results_purge()
+
+
+def _async_results_purge():
+    """
+    Helper function to remove expired async jobs results from results store and
+    evict oldest completed results if store holds more than
+    ``async_results_max_count`` entries or results in memory size goes above
+    ``async_results_max_mbyte``. Pending entries never removed.
+    """
+    now = time.time()
+    ttl = nornir_data.get("async_results_ttl", 3600)
+    max_count = nornir_data.get("async_results_max_count", 1000)
+    size_limit = nornir_data.get("async_results_max_mbyte", 0) * 1024000
+    evicted = []
+    with nornir_data["async_results_lock"]:
+        store = nornir_data["async_results"]
+        size = sum(e["size"] for e in store.values())
+        completed = [h for h, e in store.items() if e["status"] == "completed"]
+        for handle in completed:
+            if (
+                (ttl and store[handle]["completed"] + ttl <= now)
+                or len(store) > max_count
+                or (size_limit and size > size_limit and store[handle]["size"])
+            ):
+                entry = store.pop(handle)
+                size -= entry["size"]
+                evicted.append(entry)
+                nornir_data["stats"]["async_results_evicted"] += 1
+    # remove evicted results spill files
+    for entry in evicted:
+        if entry["spill_file"]:
+            _discard_job_result(entry["payload"])
+
+
+def _async_results_get(job):
+    """
+    Helper function to deliver async job results to ``nr.nornir job_result``
+    call, completed job results removed from results store once delivered.
+
+    :param job: (dict) ``job_result`` job dictionary
+    """
+    handle = job["kwargs"].get("handle")
+    with nornir_data["async_results_lock"]:
+        entry = nornir_data["async_results"].get(handle)
+        if entry and entry["status"] == "completed":
+            nornir_data["async_results"].pop(handle)
+    if entry is None:
+        _send_result(
+            job,
+            "Nornir-proxy {} job handle '{}' not found, results already retrieved "
+            "or expired".format(nornir_data["stats"]["proxy_minion_id"], handle),
+        )
+    elif entry["status"] == "pending":
+        _send_result(
+            job,
+            {
+                "handle": handle,
+                "status": "pending",
+                "elapsed_seconds": round(time.time() - entry["submitted"], 3),
+            },
+        )
+    else:
+        res = _load_job_result(pickle.loads(entry["payload"]))
+        _send_result(job, res["output"], busy=entry["busy"])
+
+
+@_use_loader_context
+def _fire_async_jobs_events(jobs):
+    """
+    Helper function to fire completion events for async jobs.
+
+    :param jobs: (list) list of jobs dictionaries
+    """
+    for job in jobs:
+        if not job.get("async_handle"):
+            continue
+        __salt__["event.send"](
+            tag="nornir-proxy/{proxy_id}/job/{handle}/completed".format(
+                proxy_id=nornir_data["stats"]["proxy_minion_id"],
+                handle=job["async_handle"],
+            ),
+            data={
+                "handle": job["async_handle"],
+                "jid": job["identity"].get("jid"),
+                "user": job["identity"].get("user"),
+                "function": _get_job_function_name(job["identity"]),
+            },
+        )
+
+
+def _dump_job_result(res, with_spill_file=False):
+    """
+    Helper function to pickle job results. Results bigger than
+    ``results_spill_threshold_mbyte`` saved in spill file, in that
+    case pickled spill file handle returned instead.
+
+    :param res: (dict) job results dictionary
+    :param with_spill_file: (bool) if True, return spill file path as well
+    :return: pickled job results or spill file handle bytes, if ``with_spill_file``
+        is True, returns ``(payload, spill_file)`` tuple with spill file set to
+        None if results not spilled
+    """
+    payload = pickle.dumps(res, protocol=pickle.HIGHEST_PROTOCOL)
+    threshold = nornir_data.get("results_spill_threshold_mbyte", 0)
+    if not threshold or len(payload) <= threshold * 1024000:
+        return (payload, None) if with_spill_file else payload
+    spill_folder = os.path.join(nornir_data["files_base_path"], "results_spill")
+    spill_file = os.path.join(spill_folder, "{}.pickle".format(uuid.uuid4().hex))
+    try:
+        os.makedirs(spill_folder, exist_ok=True)
+        with open(spill_file, "wb") as f:
+            f.write(payload)
+    except:
+        log.error(
+            "Nornir-proxy MAIN PID {} failed to save job results to spill file, "
+            "identity '{}', error: {}".format(
+                os.getpid(), res["identity"], traceback.format_exc()
+            )
+        )
+        return (payload, None) if with_spill_file else payload
+    nornir_data["stats"]["jobs_results_spilled"] += 1
+    payload = pickle.dumps(
+        {
+            "identity": res["identity"],
+            "spill_file": spill_file,
+            "spill_size": len(payload),
+        },
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    return (payload, spill_file) if with_spill_file else payload
+
+
+def _load_job_result(res, remove=True):
+    """
+    Helper function to load job results from spill file if results
+    arrived as a spill file handle.
+
+    :param res: (dict) job results or spill file handle dictionary
+    :param remove: (bool) if True, delete spill file after loading results
+    :return: job results dictionary
+    """
+    if "spill_file" not in res:
+        return res
+    try:
+        with open(res["spill_file"], "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return pickle.loads(mm)
+    except:
+        return {
+            "output": "Nornir-proxy failed to load job results from spill file '{}', error:\n'{}'".format(
+                res["spill_file"], traceback.format_exc()
+            ),
+            "identity": res["identity"],
+        }
+    finally:
+        if remove:
+            try:
+                os.remove(res["spill_file"])
+            except FileNotFoundError:
+                pass
+
+
+def _discard_job_result(payload):
+    """
+    Helper function to remove spill file of job results that failed to be
+    delivered, as no one going to load and remove it afterwards.
+
+    :param payload: (bytes) pickled job results or spill file handle
+    """
+    try:
+        res = pickle.loads(payload)
+        if "spill_file" in res:
+            os.remove(res["spill_file"])
+    except:
+        pass
+
+
+def _spill_files_purge():
+    """
+    Helper function to remove spill files older than ``child_process_max_age``,
+    by that time job submitting process either loaded results and removed
+    spill file or was killed by watchdog, spill files left are leftovers of
+    results that were never collected e.g. results put in results queue.
+    Spill files of ``async`` jobs results kept in results store not removed.
+    """
+    spill_folder = os.path.join(nornir_data["files_base_path"], "results_spill")
+    if not os.path.isdir(spill_folder):
+        return
+    expired = time.time() - nornir_data["child_process_max_age"]
+    with nornir_data["async_results_lock"]:
+        async_spill_files = set(
+            e["spill_file"] for e in nornir_data["async_results"].values()
+        )
+    for spill_file in os.scandir(spill_folder):
+        if spill_file.path in async_spill_files:
+            continue
+        try:
+            if spill_file.stat().st_mtime < expired:
+                os.remove(spill_file.path)
+                nornir_data["stats"]["jobs_results_spill_files_purged"] += 1
+        except FileNotFoundError:
+            continue
+
+
+def _start_dispatcher():
+    """
+    Helper function to start jobs dispatcher thread for current jobs queue.
+    """
+    nornir_data["dispatcher_thread"] = threading.Thread(
+        target=_dispatcher,
+        name="{}_dispatcher".format(nornir_data["stats"]["proxy_minion_id"]),
+        args=(nornir_data["jobs_queue"],),
+        daemon=True,
+    )
+    nornir_data["dispatcher_thread"].start()
+
+
+def _stop_workers():
+    """
+    Helper function to stop Nornir worker threads and processes, close
+    connections to devices and delete Nornir objects.
+    """
+    stopped = []
+    with nornir_data["jobs_condition"]:
+        while nornir_data["nrs"]:
+            nr = nornir_data["nrs"].pop()
+            nr["worker_stop"].set()
+            nr["nr"].close_connections(on_good=True, on_failed=True)
+            stopped.append(nr)
+        # wake up idle workers for them to exit
+        nornir_data["jobs_condition"].notify_all()
+    for nr in stopped:
+        _stop_worker_process(nr)
+
+
+def _autoscale_workers(loader):
+    """
+    Helper function called by watchdog to adjust number of Nornir workers
+    within ``nornir_workers_min`` and ``nornir_workers_max`` range.
+
+    Adds one worker if jobs queue depth reached ``nornir_workers_scale_queue_depth``
+    or oldest pending job waited longer than ``nornir_workers_scale_queue_wait``
+    seconds. Removes worker with the highest ID if it stayed idle for longer than
+    ``nornir_workers_scale_cooldown`` seconds, closing its hosts' connections.
+
+    :param loader: (obj or None) SaltStack loader context object
+    """
+    if nornir_data["nornir_workers_min"] == nornir_data["nornir_workers_max"]:
+        return
+    now = time.time()
+    with nornir_data["jobs_condition"]:
+        pending = list(nornir_data["jobs_pending"])
+        for wkr in nornir_data["nrs"]:
+            pending.extend(wkr["worker_jobs_pending"])
+        workers_count = len(nornir_data["nrs"])
+    try:
+        queue_depth = len(pending) + nornir_data["jobs_queue"].qsize()
+    except NotImplementedError:
+        queue_depth = len(pending)
+    queue_wait = max(
+        [now - job.get("queued_timestamp", now) for _, _, job in pending] or [0]
+    )
+    # add worker
+    if workers_count < nornir_data["nornir_workers_max"] and (
+        queue_depth >= nornir_data["nornir_workers_scale_queue_depth"]
+        or queue_wait >= nornir_data["nornir_workers_scale_queue_wait"]
+    ):
+        wkr = _create_nornir_worker(worker_id=workers_count + 1)
+        wkr["worker_thread"] = threading.Thread(target=_worker, args=(wkr, loader))
+        with nornir_data["jobs_condition"]:
+            nornir_data["nrs"].append(wkr)
+        wkr["worker_thread"].start()
+        _record_scaling_action(
+            "scale_up",
+            "queue depth {}, queue wait {}s".format(queue_depth, round(queue_wait, 3)),
+        )
+    # remove idle worker
+    elif workers_count > nornir_data["nornir_workers_min"] and queue_depth == 0:
+        with nornir_data["jobs_condition"]:
+            wkr = nornir_data["nrs"][-1]
+            idle_time = now - wkr["worker_last_active"]
+            if (
+                wkr["jobs_running"] == 0
+                and not wkr["worker_jobs_pending"]
+                and idle_time > nornir_data["nornir_workers_scale_cooldown"]
+            ):
+                nornir_data["nrs"].remove(wkr)
+                wkr["worker_stop"].set()
+                nornir_data["jobs_condition"].notify_all()
+            else:
+                wkr = None
+        if wkr:
+            # wait for keepalive checks to release hosts and close connections
+            hosts_names = set(wkr["nr"].inventory.hosts.keys())
+            _lock_hosts(wkr, hosts_names)
+            try:
+                wkr["nr"].close_connections(on_good=True, on_failed=True)
+            finally:
+                _unlock_hosts(wkr, hosts_names)
+            _record_scaling_action(
+                "scale_down",
+                "worker {} idle for {}s".format(wkr["worker_id"], round(idle_time, 3)),
+            )
+
+
+def _record_scaling_action(action, reason):
+    """
+    Helper function to log Nornir workers scaling action and save it in stats.
+
+    :param action: (str) ``scale_up`` or ``scale_down``
+    :param reason: (str) scaling action reason
+    """
+    nornir_data["stats"]["nornir_workers_{}s".format(action)] += 1
+    nornir_data["stats"]["nornir_workers_last_scaling"] = {
+        "action": action,
+        "reason": reason,
+        "workers": len(nornir_data["nrs"]),
+        "timestamp": time.ctime(),
+    }
+    log.info(
+        "Nornir-proxy MAIN PID {} watchdog, nornir workers {} to {}, {}".format(
+            os.getpid(), action, len(nornir_data["nrs"]), reason
+        )
+    )
+
+
+def _get_job_hosts(job, nr=None):
+    """
+    Helper function to get a set of job's target hosts names using job's
+    Fx filters.
+
+    :param job: (dict) job dictionary
+    :param nr: (obj) Nornir object to filter hosts, first worker's Nornir used if None
+    :return: set of hosts names, empty set if failed to filter hosts
+    """
+    try:
+        nr = nr or nornir_data["nrs"][0]["nr"]
+        hosts = FFun(nr, kwargs=dict(job["kwargs"]))
+        return set(hosts.inventory.hosts.keys())
+    except:
+        log.debug(
+            "Nornir-proxy MAIN PID {} dispatcher, failed to filter job hosts: {}".format(
+                os.getpid(), traceback.format_exc()
+            )
+        )
+        return set()
+
+
+def _select_affinity_worker(job_hosts):
+    """
+    Helper function to select worker that has connections to most of the job's
+    target hosts, if several such workers, least loaded one selected, must be
+    called while holding ``jobs_condition`` lock.
+
+    :param job_hosts: (set) job's target hosts names
+    :return: tuple of (worker dictionary, count of hosts with connections)
+    """
+    candidates = []
+    for wkr in nornir_data["nrs"]:
+        if wkr["worker_stop"].is_set():
+            continue
+        inventory_hosts = wkr["nr"].inventory.hosts
+        # worker processes report hosts they have connections to
+        if wkr.get("worker_process"):
+            warm = sum(
+                1 for host_name in job_hosts if host_name in wkr["worker_connections"]
+            )
+        else:
+            warm = sum(
+                1
+                for host_name in job_hosts
+                if host_name in inventory_hosts
+                and inventory_hosts[host_name].connections
+            )
+        load = len(wkr["worker_jobs_pending"]) + int(wkr["is_busy"].is_set())
+        candidates.append((warm, -load, -wkr["worker_id"], wkr))
+    if not candidates:
+        return None, 0
+    warm, _, _, wkr = max(candidates, key=lambda i: i[:3])
+    return wkr, warm
+
+
+def _update_affinity_stats(wkr_data, job_hosts, warm):
+    """
+    Helper function to update connection affinity scheduling stats.
+
+    :param wkr_data: (dict) selected worker dictionary
+    :param job_hosts: (set) job's target hosts names
+    :param warm: (int) count of target hosts selected worker has connections to
+    """
+    stats = nornir_data["stats"]
+    stats["jobs_affinity_scheduled"] += 1
+    stats["hosts_affinity_targeted"] += len(job_hosts)
+    stats["hosts_affinity_warm"] += warm
+    if warm:
+        stats["jobs_affinity_hits"] += 1
+        wkr_data["worker_affinity_hits"] += 1
+
+
+def _lock_hosts(wkr_data, hosts_names):
+    """
+    Helper function to lock worker's hosts for exclusive use, waits until
+    none of the hosts are in use and locks all of them at once.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param hosts_names: (set) hosts names to lock
+    """
+    with wkr_data["hosts_condition"]:
+        while not wkr_data["hosts_in_use"].isdisjoint(hosts_names):
+            wkr_data["hosts_condition"].wait()
+        wkr_data["hosts_in_use"].update(hosts_names)
+
+
+def _lock_free_hosts(wkr_data, hosts_names):
+    """
+    Helper function to lock worker's hosts that are not in use without waiting.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param hosts_names: (list) hosts names to lock
+    :return: list of locked hosts names
+    """
+    with wkr_data["hosts_condition"]:
+        locked = [h for h in hosts_names if h not in wkr_data["hosts_in_use"]]
+        wkr_data["hosts_in_use"].update(locked)
+    return locked
+
+
+def _unlock_hosts(wkr_data, hosts_names):
+    """
+    Helper function to unlock worker's hosts locked by ``_lock_hosts`` or
+    ``_lock_free_hosts`` functions.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param hosts_names: (set or list) hosts names to unlock
+    """
+    with wkr_data["hosts_condition"]:
+        wkr_data["hosts_in_use"].difference_update(hosts_names)
+        wkr_data["hosts_condition"].notify_all()
+
+
+def _dispatcher(jobs_queue):
+    """
+    Target function for dispatcher thread to move jobs submitted by execution
+    module processes from multiprocessing jobs queue to in-process pending
+    jobs queues and notify idle worker threads about them.
+
+    Jobs with ``worker`` key set added to that worker's pending jobs queue.
+    If ``jobs_scheduling`` is ``affinity``, other jobs added to pending jobs
+    queue of the worker selected by ``_select_affinity_worker``, otherwise
+    added to shared pending jobs queue to pick up by first idle worker.
+
+    Read-only jobs identical to a job already queued or running attached to
+    that job instead if ``jobs_coalescing`` enabled or job's ``coalesce``
+    argument is True.
+
+    ``jobs``, ``cancel`` and ``job_result`` jobs served by dispatcher straight
+    away, without waiting for Nornir workers to pick them up.
+
+    :param jobs_queue: (obj) multiprocessing jobs queue to dispatch jobs from,
+        dispatcher thread stops on receiving ``None``
+    """
+    while True:
+        try:
+            job = jobs_queue.get()
+        except (OSError, EOFError, ValueError):
+            log.error(
+                "Nornir-proxy MAIN PID {} dispatcher, jobs queue closed, stopping".format(
+                    os.getpid()
+                )
+            )
+            break
+        if job is None:
+            break
+        if job["task_fun"] in ["jobs", "cancel"]:
+            with nornir_data["jobs_condition"]:
+                if job["task_fun"] == "jobs":
+                    _send_result(job, _list_jobs())
+                else:
+                    _send_result(job, _cancel_jobs(job["kwargs"].get("jid")))
+            continue
+        elif job["task_fun"] == "job_result":
+            _async_results_get(job)
+            continue
+        elif job.get("async_handle"):
+            _async_results_register(job)
+            nornir_data["stats"]["async_jobs_submitted"] += 1
+        worker_id = job.get("worker")
+        affinity = not worker_id and nornir_data["jobs_scheduling"] == "affinity"
+        coalesce = job["kwargs"].pop("coalesce", nornir_data["jobs_coalescing"])
+        coalesce = coalesce and _is_job_read_only(job)
+        job_hosts = _get_job_hosts(job) if (affinity or coalesce) else set()
+        coalesce_key = _get_job_coalesce_key(job, job_hosts) if coalesce else None
+        with nornir_data["jobs_condition"]:
+            leader_job = nornir_data["jobs_inflight"].get(coalesce_key)
+            if leader_job is not None:
+                leader_job.setdefault("coalesced_jobs", []).append(job)
+                nornir_data["stats"]["jobs_coalesced"] += 1
+                continue
+            busy_message = _check_job_admission(job)
+            if busy_message:
+                _send_result(job, busy_message, busy=True)
+                continue
+            if worker_id:
+                for nr in nornir_data["nrs"]:
+                    if nr["worker_id"] == worker_id:
+                        _push_job(nr["worker_jobs_pending"], job)
+                        break
+                else:
+                    _send_result(
+                        job,
+                        "Error: Non existing worker '{}'; worker IDs 1 - {}".format(
+                            worker_id, len(nornir_data["nrs"])
+                        ),
+                    )
+                    continue
+            elif affinity and nornir_data["nrs"]:
+                wkr, warm = _select_affinity_worker(job_hosts)
+                job["affinity"] = True
+                _push_job(wkr["worker_jobs_pending"], job)
+                _update_affinity_stats(wkr, job_hosts, warm)
+            else:
+                _push_job(nornir_data["jobs_pending"], job)
+            if coalesce_key:
+                job["coalesce_key"] = coalesce_key
+                nornir_data["jobs_inflight"][coalesce_key] = job
+            nornir_data["jobs_condition"].notify_all()
+
+
+def _is_job_read_only(job):
+    """
+    Helper function to check if job does not change devices' state, only such
+    jobs can be coalesced with identical in-flight jobs.
+
+    :param job: (dict) job dictionary
+    :return: True if job is read-only, False otherwise
+    """
+    function_name = _get_job_function_name(job["identity"])
+    call = str(job["kwargs"].get("call", "")).lower()
+    if job["kwargs"].get("stream"):
+        return False
+    elif function_name in ["nr.cli", "nr.test", "nr.tping"]:
+        return True
+    elif function_name == "nr.nc":
+        return call in [
+            "get",
+            "get_config",
+            "get_schema",
+            "server_capabilities",
+            "connected",
+            "dir",
+            "help",
+        ]
+    elif function_name == "nr.gnmi":
+        return call in ["get", "capabilities", "dir", "help"]
+    elif function_name == "nr.snmp":
+        return call in [
+            "get",
+            "getnext",
+            "bulkget",
+            "multiget",
+            "walk",
+            "bulkwalk",
+            "multiwalk",
+            "table",
+            "dir",
+            "help",
+        ]
+    elif function_name == "nr.http":
+        return str(job["kwargs"].get("method", "")).lower() in ["get", "head"]
+    return False
+
+
+def _get_job_coalesce_key(job, job_hosts):
+    """
+    Helper function to form key to find identical in-flight jobs using job's
+    task plugin, worker, filtered hosts and arguments other than Fx filters.
+
+    :param job: (dict) job dictionary
+    :param job_hosts: (set) job's target hosts names
+    :return: key string or None if job has no hosts to run for
+    """
+    if not job_hosts:
+        return None
+    kwargs = {
+        k: v
+        for k, v in job["kwargs"].items()
+        if not str(k).startswith("__") and k not in FX_FILTERS
+    }
+    return hashlib.sha256(
+        repr(
+            (
+                job["task_fun"],
+                job.get("worker"),
+                sorted(job_hosts),
+                sorted(kwargs.items(), key=lambda i: str(i[0])),
+            )
+        ).encode()
+    ).hexdigest()
+
+
+def _get_job_summary(job, state, now):
+    """
+    Helper function to form job summary dictionary for ``nr.nornir jobs`` call.
+
+    :param job: (dict) job dictionary
+    :param state: (str) job state - ``queued``, ``coalesced`` or ``running``
+    :param now: (float) current timestamp to calculate elapsed time
+    :return: dictionary with job details
+    """
+    identity = job["identity"]
+    return {
+        "jid": identity.get("jid"),
+        "uuid4": identity.get("uuid4"),
+        "user": identity.get("user"),
+        "function": _get_job_function_name(identity) or job["task_fun"],
+        "task_fun": job["task_fun"],
+        "state": state,
+        "worker": job.get("running_worker", job.get("worker")),
+        "priority": job.get("priority", 5),
+        "hosts_count": (
+            job["hosts_count"] if "hosts_count" in job else len(_get_job_hosts(job))
+        ),
+        "elapsed_seconds": round(now - job.get("queued_timestamp", now), 3),
+        "running_seconds": (
+            round(now - job["started_timestamp"], 3)
+            if "started_timestamp" in job
+            else 0
+        ),
+        "cancelled": (
+            job["cancel_event"].is_set() or job.get("cancel_detached", False)
+            if "cancel_event" in job
+            else False
+        ),
+    }
+
+
+def _list_jobs():
+    """
+    Helper function to list queued and running jobs, must be called while
+    holding ``jobs_condition`` lock.
+
+    :return: list of jobs summary dictionaries
+    """
+    now = time.time()
+    ret = []
+    for job in nornir_data["running_jobs"].values():
+        ret.append(_get_job_summary(job, "running", now))
+    pending = list(nornir_data["jobs_pending"])
+    for wkr in nornir_data["nrs"]:
+        pending.extend(wkr["worker_jobs_pending"])
+    for _, _, job in sorted(pending, key=lambda i: i[:2]):
+        ret.append(_get_job_summary(job, "queued", now))
+    for leader_job in nornir_data["jobs_inflight"].values():
+        for job in leader_job.get("coalesced_jobs", []):
+            ret.append(_get_job_summary(job, "coalesced", now))
+    return ret
+
+
+def _cancel_jobs(jid):
+    """
+    Helper function to cancel jobs submitted by Salt job with given ID, must be
+    called while holding ``jobs_condition`` lock.
+
+    Queued jobs removed from pending jobs queues and receive cancellation
+    message as results. Running jobs signalled to stop, hosts that did not
+    start running the task yet skipped with failed result, hosts that already
+    running the task allowed to complete.
+
+    Jobs that other identical jobs coalesced with only stopped once all of
+    them cancelled. Until then, cancelled queued job replaced in pending jobs
+    queue by first of its coalesced jobs, while cancelled running job detached
+    from its results and continues running for the rest of coalesced jobs.
+
+    :param jid: (str) Salt job ID
+    :return: dictionary with counts of cancelled jobs
+    """
+    if not jid:
+        return "Nornir-proxy 'cancel' requires 'jid' argument"
+    jid = str(jid)
+    message = "Nornir-proxy {} job '{}' cancelled".format(
+        nornir_data["stats"]["proxy_minion_id"], jid
+    )
+    cancelled = {"jid": jid, "queued": 0, "coalesced": 0, "running": 0}
+    # detach coalesced jobs from their leader jobs
+    for leader_job in nornir_data["jobs_inflight"].values():
+        coalesced_jobs = leader_job.get("coalesced_jobs", [])
+        for job in list(coalesced_jobs):
+            if str(job["identity"].get("jid")) == jid:
+                coalesced_jobs.remove(job)
+                cancelled["coalesced"] += 1
+                _send_result(job, message)
+    # remove queued jobs from pending jobs queues
+    for pending in [nornir_data["jobs_pending"]] + [
+        wkr["worker_jobs_pending"] for wkr in nornir_data["nrs"]
+    ]:
+        keep, changed = [], False
+        for priority, sequence, job in pending:
+            if str(job["identity"].get("jid")) != jid:
+                keep.append((priority, sequence, job))
+                continue
+            changed = True
+            cancelled["queued"] += 1
+            # promote first coalesced job to take cancelled job's place
+            coalesced_jobs = job.pop("coalesced_jobs", [])
+            coalesce_key = job.pop("coalesce_key", None)
+            if coalesced_jobs:
+                promoted_job = coalesced_jobs.pop(0)
+                promoted_job["coalesced_jobs"] = coalesced_jobs
+                promoted_job["coalesce_key"] = coalesce_key
+                if job.get("affinity"):
+                    promoted_job["affinity"] = True
+                nornir_data["jobs_inflight"][coalesce_key] = promoted_job
+                keep.append((priority, sequence, promoted_job))
+            elif coalesce_key:
+                nornir_data["jobs_inflight"].pop(coalesce_key, None)
+            _send_result(job, message)
+        if not changed:
+            continue
+        pending[:] = keep
+        heapq.heapify(pending)
+    # signal running jobs to stop or detach them if coalesced jobs attached
+    for job in nornir_data["running_jobs"].values():
+        if job["cancel_event"].is_set():
+            continue
+        if str(job["identity"].get("jid")) == jid and not job.get("cancel_detached"):
+            cancelled["running"] += 1
+            if job.get("coalesced_jobs"):
+                _send_result(
+                    {
+                        k: v
+                        for k, v in job.items()
+                        if k not in ["coalesce_key", "coalesced_jobs"]
+                    },
+                    message,
+                )
+                job["cancel_detached"] = True
+                continue
+        elif not job.get("cancel_detached") or job.get("coalesced_jobs"):
+            continue
+        # no jobs left waiting for this job results
+        job["cancel_event"].set()
+    nornir_data["stats"]["jobs_cancelled"] += sum(
+        [cancelled["queued"], cancelled["coalesced"], cancelled["running"]]
+    )
+    return cancelled
+
+
+def _make_cancellable_task(task_fun, cancel_event):
+    """
+    Function to wrap task plugin in a task that skips hosts once job cancelled.
+
+    :param task_fun: (obj) task plugin function
+    :param cancel_event: (obj) ``threading.Event`` set when job cancelled
+    :return: task function
+    """
+
+    def cancellable_task(task, **kwargs):
+        if cancel_event.is_set():
+            return Result(
+                host=task.host,
+                result="Nornir-proxy job cancelled, task not started",
+                exception="Job cancelled",
+                failed=True,
+            )
+        return task_fun(task, **kwargs)
+
+    return cancellable_task
+
+
+def _estimate_queue_wait():
+    """
+    Helper function to estimate how long new job would wait in the queue.
+
+    New job does not wait if there are more free job slots across all Nornir
+    workers than pending jobs. Otherwise, job slots become free once running
+    jobs complete, running jobs expected to take average duration of recent
+    jobs, and each pending job ahead occupies earliest free slot for average
+    job duration.
+
+    :return: tuple of pending jobs count and estimated wait time in seconds
+    """
+    now = time.time()
+    average = nornir_data["jobs_duration_average"]
+    queue_depth = len(nornir_data["jobs_pending"]) + sum(
+        len(wkr["worker_jobs_pending"]) for wkr in nornir_data["nrs"]
+    )
+    job_slots = max(len(nornir_data["nrs"]) * nornir_data["worker_jobs_concurrency"], 1)
+    # seconds before each job slot frees up, free slots available right away
+    slots_free_in = sorted(
+        max(average - (now - job["started_timestamp"]), 0)
+        for job in nornir_data["running_jobs"].values()
+    )[:job_slots]
+    free_slots = job_slots - len(slots_free_in)
+    if queue_depth < free_slots:
+        return queue_depth, 0
+    slots_free_in = [0] * free_slots + slots_free_in
+    estimated_wait = (
+        slots_free_in[queue_depth % job_slots] + (queue_depth // job_slots) * average
+    )
+    return queue_depth, round(estimated_wait, 3)
+
+
+def _check_job_admission(job):
+    """
+    Helper function to decide if job can be admitted to pending jobs queue, must
+    be called while holding ``jobs_condition`` lock.
+
+    Job rejected if number of pending jobs reached ``jobs_queue_max_depth`` or
+    estimated wait time exceeds ``jobs_queue_max_wait`` seconds. Utility jobs
+    such as ``refresh``, ``inventory`` or ``clear_hcache`` never rejected.
+
+    :param job: (dict) job dictionary
+    :return: None if job admitted, error message string otherwise
+    """
+    max_depth = nornir_data.get("jobs_queue_max_depth", 0)
+    max_wait = nornir_data.get("jobs_queue_max_wait", 0)
+    if not (max_depth or max_wait) or job["task_fun"] in [
+        "test",
+        "refresh",
+        "shutdown",
+        "inventory",
+        "clear_dcache",
+        "clear_task_cache",
+        "nornir_salt.plugins.tasks.salt_clear_hcache",
+    ]:
+        return None
+    queue_depth, estimated_wait = _estimate_queue_wait()
+    if (max_depth and queue_depth >= max_depth) or (
+        max_wait and estimated_wait > max_wait
+    ):
+        nornir_data["stats"]["jobs_rejected"] += 1
+        return (
+            "Nornir-proxy {} busy, retry after {}s; jobs queue depth {}, "
+            "estimated wait {}s, jobs_queue_max_depth {}, jobs_queue_max_wait {}s".format(
+                nornir_data["stats"]["proxy_minion_id"],
+                max(int(estimated_wait + 0.999), 1),
+                queue_depth,
+                estimated_wait,
+                max_depth,
+                max_wait,
+            )
+        )
+    return None
+
+
+def _push_job(pending, job):
+    """
+    Helper function to add job to pending jobs priority queue, jobs with
+    lower ``priority`` value go first, jobs of the same priority go in the
+    order they were added.
+
+    :param pending: (list) pending jobs heap
+    :param job: (dict) job dictionary
+    """
+    heapq.heappush(
+        pending,
+        (job.get("priority", 5), next(nornir_data["jobs_sequence"]), job),
+    )
+
+
+def _update_queue_wait_stats(job, worker_id):
+    """
+    Helper function to update queue wait time stats for job's priority.
+
+    :param job: (dict) job dictionary
+    :param worker_id: (int) ID of Nornir worker that picked up the job
+    """
+    if "queued_timestamp" not in job:
+        return
+    wait_time = time.time() - job["queued_timestamp"]
+    _observe_latency("queue_wait", job["identity"], worker_id, wait_time)
+    wait_stats = nornir_data["stats"]["jobs_queue_wait"].setdefault(
+        str(job.get("priority", 5)),
+        {"jobs": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+    )
+    wait_stats["jobs"] += 1
+    wait_stats["total_seconds"] += wait_time
+    wait_stats["max_seconds"] = max(wait_stats["max_seconds"], wait_time)
+
+
+def _observe_latency(phase, identity, worker_id, seconds):
+    """
+    Helper function to record job phase duration in latency histogram
+    for execution module function and Nornir worker that ran the job.
+
+    :param phase: (str) job phase name e.g. ``queue_wait`` or ``execution``
+    :param identity: (dict) job identity dictionary
+    :param worker_id: (int) Nornir worker ID
+    :param seconds: (float) phase duration in seconds
+    """
+    key = (phase, _get_job_function_name(identity), str(worker_id))
+    with nornir_data["histograms_lock"]:
+        histogram = nornir_data["histograms"].setdefault(
+            key,
+            {"buckets": [0] * (len(HISTOGRAM_BUCKETS) + 1), "sum": 0.0, "count": 0},
+        )
+        histogram["buckets"][bisect.bisect_left(HISTOGRAM_BUCKETS, seconds)] += 1
+        histogram["sum"] += seconds
+        histogram["count"] += 1
+
+
+def _format_histograms():
+    """
+    Helper function to format jobs phases latency histograms using
+    Prometheus text exposition format.
+
+    :return: string with histograms metrics
+    """
+    name = "salt_nornir_job_phase_duration_seconds"
+    lines = [
+        "# HELP {} Nornir proxy jobs phases duration in seconds".format(name),
+        "# TYPE {} histogram".format(name),
+    ]
+    with nornir_data["histograms_lock"]:
+        histograms = copy.deepcopy(nornir_data["histograms"])
+    for (phase, function_name, worker_id), histogram in sorted(histograms.items()):
+        labels = 'proxy_id="{}",phase="{}",function="{}",worker="{}"'.format(
+            nornir_data["stats"]["proxy_minion_id"], phase, function_name, worker_id
+        )
+        cumulative = 0
+        for upper_bound, count in zip(
+            HISTOGRAM_BUCKETS + ["+Inf"], histogram["buckets"]
+        ):
+            cumulative += count
+            lines.append(
+                '{}_bucket{{{},le="{}"}} {}'.format(
+                    name, labels, upper_bound, cumulative
+                )
+            )
+        lines.append("{}_sum{{{}}} {}".format(name, labels, round(histogram["sum"], 6)))
+        lines.append("{}_count{{{}}} {}".format(name, labels, histogram["count"]))
+    return "\n".join(lines) + "\n"
+
+
+def _get_next_job(wkr_data):
+    """
+    Helper function to get next job for worker to run, must be called while
+    holding ``jobs_condition`` lock.
+
+    Job with highest priority picked from worker specific and shared pending
+    jobs, worker specific jobs take precedence for the same priority, shared
+    jobs given to idle worker only if all higher order workers are busy.
+
+    If worker has no jobs to run, it takes over ``affinity`` job of other busy
+    worker that waited for longer than ``jobs_affinity_max_wait``.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :return: job dictionary or None if no jobs to run
+    """
+    if wkr_data["jobs_running"] >= nornir_data["worker_jobs_concurrency"]:
+        return None
+    pending = wkr_data["worker_jobs_pending"]
+    if nornir_data["jobs_pending"] and all(
+        wkr["is_busy"].is_set() or wkr["worker_stop"].is_set()
+        for wkr in nornir_data["nrs"]
+        if wkr["worker_id"] < wkr_data["worker_id"]
+    ):
+        if not pending or nornir_data["jobs_pending"][0][0] < pending[0][0]:
+            pending = nornir_data["jobs_pending"]
+    if not pending:
+        pending = _get_affinity_jobs_to_take_over(wkr_data)
+        if pending:
+            nornir_data["stats"]["jobs_affinity_taken_over"] += 1
+    if pending:
+        job = heapq.heappop(pending)[2]
+        _update_queue_wait_stats(job, wkr_data["worker_id"])
+        return job
+    return None
+
+
+def _get_affinity_jobs_to_take_over(wkr_data):
+    """
+    Helper function to find other busy worker's pending jobs queue with
+    ``affinity`` job that waited for longer than ``jobs_affinity_max_wait``,
+    must be called while holding ``jobs_condition`` lock.
+
+    :param wkr_data: (dict) Nornir worker dictionary of idle worker
+    :return: pending jobs queue with oldest such job at its head or None
+    """
+    candidates = []
+    now = time.time()
+    for wkr in nornir_data["nrs"]:
+        if wkr is wkr_data or not wkr["worker_jobs_pending"]:
+            continue
+        if not (wkr["is_busy"].is_set() or wkr["worker_stop"].is_set()):
+            continue
+        job = wkr["worker_jobs_pending"][0][2]
+        waited = now - job.get("queued_timestamp", now)
+        if job.get("affinity") and waited >= nornir_data["jobs_affinity_max_wait"]:
+            candidates.append((waited, wkr["worker_jobs_pending"]))
+    if candidates:
+        return max(candidates, key=lambda i: i[0])[1]
+    return None
+
+
+def _release_worker_slot(wkr_data):
+    """
+    Helper function to signal that worker finished running a job and
+    can accept next one.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    """
+    with nornir_data["jobs_condition"]:
+        wkr_data["jobs_running"] -= 1
+        wkr_data["worker_last_active"] = time.time()
+        wkr_data["is_busy"].clear()  # no longer busy
+        nornir_data["jobs_condition"].notify_all()
+
+
+def _execute_worker_job(job, wkr_data, loader, job_hosts):
+    """
+    Function to run job's special task or Nornir task using Nornir worker
+    instance.
+
+    Runs within Nornir worker thread or within Nornir worker process if
+    ``worker_mode`` is ``process``.
+
+    :param job: (dict) job dictionary
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param loader: (obj or None) SaltStack loader context object
+    :param job_hosts: (set) set to add job's hosts to, these hosts locked
+        and must be unlocked by the caller once job completes
+    :return: job results
+    """
+    # check if its a call for a special task
+    if job["task_fun"] == "test":
+        return True
+    elif job["task_fun"] == "clear_dcache":
+        return _clear_dcache(
+            nr=wkr_data["nr"], cache_keys=job["kwargs"].get("cache_keys")
+        )
+    elif job["task_fun"] == "clear_task_cache":
+        _record_worker_process_mutation("clear_task_cache")
+        return _clear_task_cache()
+    elif job["task_fun"] == "inventory":
+        # lock all hosts as inventory might be modified
+        job_hosts.update(wkr_data["nr"].inventory.hosts.keys())
+        _lock_hosts(wkr_data, job_hosts)
+        return InventoryFun(wkr_data["nr"], **job["kwargs"])
+    # execute nornir task
+    task_fun = _get_or_import_task_fun(job["task_fun"], loader=loader)
+    log.info("Nornir-proxy PID {} starting task '{}'".format(os.getpid(), job["name"]))
+    # lock job's hosts and run the task
+    job_hosts.update(_get_job_hosts(job, wkr_data["nr"]))
+    job["hosts_count"] = len(job_hosts)
+    _lock_hosts(wkr_data, job_hosts)
+    return run(
+        task=task_fun,
+        loader=loader,
+        identity=job["identity"],
+        name=job["name"],
+        nr=wkr_data["nr"],
+        wkr_data=wkr_data,
+        reply_conn=job.get("reply_conn"),
+        cancel_event=job["cancel_event"],
+        **job["kwargs"],
+    )
+
+
+def _close_job_connections(wkr_data, job_hosts):
+    """
+    Helper function to close job hosts' connections to devices if
+    ``proxy_always_alive`` is False.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param job_hosts: (set) names of job's hosts
+    """
+    if job_hosts and (
+        nornir_data["proxy_always_alive"] is False
+        or nornir_data["connections_idle_timeout"] == 0
+    ):
+        try:
+            FFun(wkr_data["nr"], FL=list(job_hosts)).close_connections(
+                on_good=True, on_failed=True
+            )
+        except:
+            log.error(
+                "Nornir-proxy PID {} worker, Nornir close_connections error: {}".format(
+                    os.getpid(), traceback.format_exc()
+                )
+            )
+
+
+def _run_worker_job(job, wkr_data, loader):
+    """
+    Function to run job using Nornir worker instance and deliver job results.
+
+    Runs within worker thread or, if ``worker_jobs_concurrency`` above 1,
+    within dedicated job thread. Job's target hosts locked for the duration
+    of the job, jobs with overlapping hosts wait for each other.
+
+    If ``worker_mode`` is ``process``, job sent to Nornir worker process
+    to run and this function waits for its results.
+
+    :param job: (dict) job dictionary
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param loader: (obj or None) SaltStack loader context object
+    """
+    ppid = nornir_data["stats"]["main_process_pid"]
+    output, job_hosts = None, set()
+    job_start = time.time()
+    # register job as running for nr.nornir jobs and cancel calls
+    with nornir_data["jobs_condition"]:
+        job["started_timestamp"] = job_start
+        job["running_worker"] = wkr_data["worker_id"]
+        job["cancel_event"] = threading.Event()
+        nornir_data["running_jobs"][id(job)] = job
+    worker_process = wkr_data.get("worker_process")
+    try:
+        if worker_process and job["task_fun"] != "test":
+            # lock job's hosts and run the job within Nornir worker process
+            if job["task_fun"] == "inventory":
+                job_hosts.update(wkr_data["nr"].inventory.hosts.keys())
+            elif job["task_fun"] not in ["clear_dcache", "clear_task_cache"]:
+                job_hosts.update(_get_job_hosts(job, wkr_data["nr"]))
+                job["hosts_count"] = len(job_hosts)
+            _lock_hosts(wkr_data, job_hosts)
+            output = _run_job_in_worker_process(job, wkr_data, worker_process)
+            _mirror_worker_process_job(job, wkr_data, job_hosts)
+        else:
+            output = _execute_worker_job(job, wkr_data, loader, job_hosts)
+        wkr_data["worker_jobs_completed"] += 1
+    except:
+        tb = traceback.format_exc()
+        output = "Nornir-proxy MAIN PID {} job failed: {}, error:\n'{}'".format(
+            ppid, job, tb
+        )
+        log.error(output)
+        wkr_data["worker_jobs_failed"] += 1
+    # update exponential moving average of jobs duration
+    with nornir_data["jobs_condition"]:
+        nornir_data["running_jobs"].pop(id(job), None)
+        nornir_data["jobs_duration_average"] += 0.2 * (
+            time.time() - job_start - nornir_data["jobs_duration_average"]
+        )
+    # deliver job results to the process that submitted the job
+    delivery_start = time.time()
+    delivered = _send_result(job, output)
+    _observe_latency(
+        "delivery", job["identity"], wkr_data["worker_id"], time.time() - delivery_start
+    )
+    if any(j.get("async_handle") for j in delivered):
+        try:
+            _fire_async_jobs_events(delivered, loader=loader)
+        except:
+            log.error(
+                "Nornir-proxy MAIN PID {} failed to fire async job completion event: {}".format(
+                    ppid, traceback.format_exc()
+                )
+            )
+    del output
+    # close job hosts' connections to devices if proxy_always_alive is False,
+    # worker processes close their connections themselves
+    if not worker_process:
+        _close_job_connections(wkr_data, job_hosts)
+    _unlock_hosts(wkr_data, job_hosts)
+    _release_worker_slot(wkr_data)
+
+
+def _worker(wkr_data, loader):
+    """
+    Target function for worker thread to run jobs dispatched from
+    jobs_queue submitted by execution module processes
+
+    Worker thread sleeps on ``jobs_condition`` until dispatcher notifies
+    it about new jobs. If ``worker_jobs_concurrency`` is above 1, each
+    Nornir task job runs in its own thread, allowing worker to run several
+    jobs at the same time.
+
+    If ``worker_mode`` is ``process``, worker thread starts Nornir worker
+    process and sends jobs to it to run, worker process restarted before
+    running next job if it exited, restarted worker process creates its
+    inventory anew and worker's main process copy of inventory re-created
+    to match it.
+
+    :param wkr_data: (dict) dictionary that contain nornir instance and other parameters
+    :param loader: (obj or None) SaltStack loader context object
+    """
+    jobs_condition = nornir_data["jobs_condition"]
+    if nornir_data["worker_mode"] == "process":
+        _start_worker_process(wkr_data)
+    while nornir_data["initialized"] and not wkr_data["worker_stop"].is_set():
+        with jobs_condition:
+            job = _get_next_job(wkr_data)
+            while job is None:
+                # wake up periodically to take over waiting affinity jobs
+                if nornir_data["jobs_scheduling"] == "affinity":
+                    jobs_condition.wait(1)
+                else:
+                    jobs_condition.wait()
+                if wkr_data["worker_stop"].is_set():
+                    break
+                job = _get_next_job(wkr_data)
+            else:
+                # got the job, I am busy now if no more job slots left
+                wkr_data["jobs_running"] += 1
+                wkr_data["worker_last_active"] = time.time()
+                if wkr_data["jobs_running"] >= nornir_data["worker_jobs_concurrency"]:
+                    wkr_data["is_busy"].set()
+                # let lower order idle workers pick up remaining shared jobs
+                if nornir_data["jobs_pending"]:
+                    jobs_condition.notify_all()
+        if job is None:
+            break
+        wkr_data["worker_jobs_started"] += 1
+        if (
+            wkr_data.get("worker_process")
+            and not wkr_data["worker_process"]["process"].is_alive()
+        ):
+            wkr_data["nr"] = _create_nornir_worker(wkr_data["worker_id"])["nr"]
+            wkr_data["worker_connections"] = {}
+            _start_worker_process(wkr_data)
+        if job["task_fun"] in ["refresh", "shutdown"]:
+            wkr_data["worker_jobs_completed"] += 1
+            _send_result(job, True)
+            _release_worker_slot(wkr_data)
+            try:
+                if job["task_fun"] == "refresh":
+                    # loader used by decorator, loader_ used by _refresh_nornir itself
+                    _refresh_nornir(loader=loader, loader_=loader, **job["kwargs"])
+                else:
+                    shutdown()
+            except:
+                log.error(
+                    "Nornir-proxy MAIN PID {} worker thread, '{}' job failed: {}".format(
+                        os.getpid(), job["task_fun"], traceback.format_exc()
+                    )
+                )
+            # stop this worker thread as another one will be started, unless
+            # inventory refreshed incrementally and workers kept running
+            if job["task_fun"] == "shutdown" or not job["kwargs"].get("incremental"):
+                break
+            continue
+        if nornir_data["worker_jobs_concurrency"] > 1 and job["task_fun"] not in [
+            "test",
+            "clear_dcache",
+            "clear_task_cache",
+            "inventory",
+        ]:
+            threading.Thread(
+                target=_run_worker_job, args=(job, wkr_data, loader), daemon=True
+            ).start()
+        else:
+            _run_worker_job(job, wkr_data, loader)
+    _stop_worker_process(wkr_data)
+
+
+def _start_worker_process_launcher(loader):
+    """
+    Helper function to start Nornir worker processes launcher process.
+
+    Launcher process forked from main process by ``init`` before jobs
+    dispatcher, worker and watchdog threads started, inheriting SaltStack
+    loader context. Launcher process is single threaded and forks Nornir
+    worker processes on main process request, as such worker processes never
+    forked from multithreaded main process and do not inherit locks held by
+    main process threads. Launcher process kept running across Nornir refresh.
+
+    :param loader: (obj or None) SaltStack loader context object
+    """
+    parent_conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.get_context("fork").Process(
+        target=_worker_process_launcher,
+        args=(child_conn, parent_conn, loader, os.getpid()),
+        name="nornir-worker-launcher",
+    )
+    process.start()
+    child_conn.close()
+    nornir_data["worker_process_launcher"] = {
+        "process": process,
+        "conn": parent_conn,
+        "lock": threading.Lock(),
+    }
+    atexit.register(_stop_worker_process_launcher)
+    log.info(
+        "Nornir-proxy MAIN PID {} started nornir-worker-launcher process PID {}".format(
+            os.getpid(), process.pid
+        )
+    )
+
+
+def _stop_worker_process_launcher():
+    """
+    Helper function to stop Nornir worker processes launcher process on
+    proxy minion process exit, launcher process stops worker processes
+    left before exiting.
+    """
+    launcher = nornir_data["worker_process_launcher"]
+    nornir_data["worker_process_launcher"] = None
+    if launcher is None:
+        return
+    try:
+        with launcher["lock"]:
+            launcher["conn"].send(None)
+    except:
+        pass
+    launcher["process"].join(timeout=10)
+    if launcher["process"].is_alive():
+        launcher["process"].kill()
+        launcher["process"].join()
+    launcher["conn"].close()
+
+
+def _worker_process_launcher_pid():
+    """
+    Helper function to return Nornir worker processes launcher process PID.
+
+    :return: PID integer or None if launcher process not started
+    """
+    launcher = nornir_data["worker_process_launcher"]
+    return launcher["process"].pid if launcher else None
+
+
+def _worker_process_launcher(conn, main_conn, loader, parent_pid):
+    """
+    Target function for Nornir worker processes launcher process.
+
+    Waits for main process requests to start Nornir worker process, forks
+    worker process and sends back its PID and main process end of the pipe
+    to worker process. Reaps exited worker processes every second and exits
+    once main process is gone.
+
+    :param conn: (obj) launcher process end of the pipe to main process
+    :param main_conn: (obj) main process end of the pipe inherited by launcher
+    :param loader: (obj or None) SaltStack loader context object
+    :param parent_pid: (int) main process PID
+    """
+    main_conn.close()
+    while True:
+        try:
+            if not conn.poll(1):
+                multiprocessing.active_children()
+                if os.getppid() != parent_pid:
+                    break
+                continue
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+        worker_id, settings = message
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.get_context("fork").Process(
+            target=_worker_process,
+            args=(worker_id, settings, child_conn, loader, [conn, parent_conn]),
+            name="nornir-worker-{}".format(worker_id),
+        )
+        process.start()
+        child_conn.close()
+        try:
+            conn.send(process.pid)
+            multiprocessing.reduction.send_handle(
+                conn, parent_conn.fileno(), parent_pid
+            )
+        except (EOFError, OSError):
+            break
+        finally:
+            parent_conn.close()
+    for process in multiprocessing.active_children():
+        process.terminate()
+        process.join()
+
+
+def _start_worker_process(wkr_data):
+    """
+    Helper function to start Nornir worker process if ``worker_mode`` is
+    ``process``.
+
+    Worker process forked by worker processes launcher process and creates
+    its own Nornir instance using Nornir configuration and settings main
+    process sends to it, jobs sent to worker process and results received
+    back over a pipe, results handled by receiver thread. If launcher process
+    is not running, Nornir worker runs jobs within main process threads.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    """
+    # clean up previous worker process if any
+    _stop_worker_process(wkr_data)
+    launcher = nornir_data["worker_process_launcher"]
+    if launcher is None or not launcher["process"].is_alive():
+        log.error(
+            "Nornir-proxy MAIN PID {} worker processes launcher not running, "
+            "nornir-worker-{} runs its jobs in threads".format(
+                os.getpid(), wkr_data["worker_id"]
+            )
+        )
+        return
+    settings = {k: nornir_data[k] for k in worker_process_settings if k in nornir_data}
+    try:
+        with launcher["lock"]:
+            launcher["conn"].send((wkr_data["worker_id"], settings))
+            pid = launcher["conn"].recv()
+            parent_conn = multiprocessing.connection.Connection(
+                multiprocessing.reduction.recv_handle(launcher["conn"])
+            )
+        process = _WorkerProcessHandle(pid)
+    except:
+        log.error(
+            "Nornir-proxy MAIN PID {} failed to start nornir-worker-{} process, "
+            "running its jobs in threads, error: {}".format(
+                os.getpid(), wkr_data["worker_id"], traceback.format_exc()
+            )
+        )
+        return
+    worker_process = {
+        "process": process,
+        "conn": parent_conn,
+        "send_lock": threading.Lock(),
+        "replies": {},
+    }
+    worker_process["receiver"] = threading.Thread(
+        target=_worker_process_receiver, args=(worker_process,), daemon=True
+    )
+    worker_process["receiver"].start()
+    wkr_data["worker_process"] = worker_process
+    nornir_data["stats"]["nornir_workers_processes_started"] += 1
+    log.info(
+        "Nornir-proxy MAIN PID {} started nornir-worker-{} process PID {}".format(
+            os.getpid(), wkr_data["worker_id"], process.pid
+        )
+    )
+
+
+def _stop_worker_process(wkr_data):
+    """
+    Helper function to stop Nornir worker process, worker process closes
+    its connections to devices before exiting.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    """
+    worker_process = wkr_data.pop("worker_process", None)
+    if worker_process is None:
+        return
+    try:
+        with worker_process["send_lock"]:
+            worker_process["conn"].send(None)
+    except:
+        pass
+    worker_process["process"].join(timeout=10)
+    if worker_process["process"].is_alive():
+        worker_process["process"].kill()
+        worker_process["process"].join()
+    worker_process["conn"].close()
+
+
+class _WorkerProcessHandle:
+    """
+    Nornir worker process handle used by main process instead of
+    ``multiprocessing.Process`` object, as worker process is a child of
+    worker processes launcher process and not of main process.
+
+    :param pid: (int) worker process PID
+    """
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.process = psutil.Process(pid)
+
+    def is_alive(self):
+        try:
+            return (
+                self.process.is_running()
+                and self.process.status() != psutil.STATUS_ZOMBIE
+            )
+        except psutil.NoSuchProcess:
+            return False
+
+    def join(self, timeout=None):
+        expires = time.time() + timeout if timeout is not None else float("inf")
+        while self.is_alive() and time.time() < expires:
+            time.sleep(0.1)
+
+    def kill(self):
+        try:
+            self.process.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+
+def _worker_process_receiver(worker_process):
+    """
+    Thread worker to receive messages from Nornir worker process and pass
+    them on to threads waiting for jobs results.
+
+    :param worker_process: (dict) worker process dictionary
+    """
+    while True:
+        try:
+            action, job_key, data = worker_process["conn"].recv()
+        except (EOFError, OSError):
+            break
+        replies = worker_process["replies"].get(job_key)
+        if replies is not None:
+            replies.put((action, data))
+    # worker process is gone, fail jobs waiting for results
+    for replies in list(worker_process["replies"].values()):
+        replies.put(
+            (
+                "failed",
+                (
+                    "Nornir-proxy worker process PID {} exited".format(
+                        worker_process["process"].pid
+                    ),
+                    None,
+                ),
+            )
+        )
+
+
+def _run_job_in_worker_process(job, wkr_data, worker_process):
+    """
+    Function to send job to Nornir worker process and wait for job results,
+    relaying streamed results to job submitter and job cancellation to
+    worker process.
+
+    :param job: (dict) job dictionary
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param worker_process: (dict) worker process dictionary
+    :return: job results
+    """
+    job_key = id(job)
+    replies = queue.Queue()
+    worker_process["replies"][job_key] = replies
+    try:
+        with worker_process["send_lock"]:
+            worker_process["conn"].send(
+                (
+                    "run",
+                    job_key,
+                    {
+                        "task_fun": job["task_fun"],
+                        "kwargs": job["kwargs"],
+                        "identity": job["identity"],
+                        "name": job["name"],
+                        "stream": job.get("reply_conn") is not None,
+                    },
+                )
+            )
+        cancel_sent = False
+        while True:
+            try:
+                action, data = replies.get(timeout=1)
+            except queue.Empty:
+                if not worker_process["receiver"].is_alive() and replies.empty():
+                    raise RuntimeError(
+                        "Nornir-proxy worker process PID {} exited".format(
+                            worker_process["process"].pid
+                        )
+                    )
+                if job["cancel_event"].is_set() and not cancel_sent:
+                    with worker_process["send_lock"]:
+                        worker_process["conn"].send(("cancel", job_key, None))
+                    cancel_sent = True
+                continue
+            # relay streamed results chunk to job submitter
+            if action == "partial":
+                try:
+                    job["reply_conn"].send_bytes(data)
+                except:
+                    _discard_job_result(data)
+                    log.error(
+                        "Nornir-proxy MAIN PID {} failed to relay streamed results, identity '{}': {}".format(
+                            os.getpid(), job["identity"], traceback.format_exc()
+                        )
+                    )
+                continue
+            output, wkr_stats = data
+            if wkr_stats:
+                _update_worker_process_stats(wkr_data, wkr_stats)
+            if action == "failed":
+                raise RuntimeError(output)
+            return output
+    finally:
+        worker_process["replies"].pop(job_key, None)
+
+
+def _update_worker_process_stats(wkr_data, wkr_stats):
+    """
+    Helper function to update main process stats with stats relayed by
+    Nornir worker process.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param wkr_stats: (dict) dictionary with ``stats`` counters increments,
+        ``worker`` stats values and ``mutations`` list of shared data changes
+    """
+    for stat, increment in wkr_stats["stats"].items():
+        nornir_data["stats"][stat] += increment
+    wkr_data.update(wkr_stats["worker"])
+    if wkr_stats.get("mutations"):
+        _mirror_worker_process_mutations(wkr_data, wkr_stats["mutations"])
+
+
+def _record_worker_process_mutation(*mutation):
+    """
+    Helper function to record shared data change made within Nornir worker
+    process for main process to apply it to its own and other Nornir worker
+    processes' data. Does nothing if called outside of Nornir worker process.
+
+    :param mutation: ``(kind, *args)`` tuple, where kind is one of ``hcache``,
+        ``dcache`` or ``clear_task_cache``
+    """
+    if nornir_data.get("worker_process_mutations") is None:
+        return
+    with nornir_data["worker_process_stats_lock"]:
+        nornir_data["worker_process_mutations"].append(mutation)
+
+
+def _apply_worker_process_mutations(wkr_data, mutations):
+    """
+    Helper function to apply shared data changes recorded by Nornir worker
+    process, runs within main process and within other worker processes.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param mutations: (list) list of ``(kind, *args)`` tuples
+    """
+    for kind, *args in mutations:
+        try:
+            if kind == "hcache":
+                hosts_names, results, cache_key, ttl = args
+                if hosts_names:
+                    _cache_task_results_to_host_data(
+                        FFun(wkr_data["nr"], FL=hosts_names), results, cache_key, ttl
+                    )
+            elif kind == "dcache":
+                _cache_all_task_results_to_defaults_data(*args)
+            elif kind == "clear_task_cache":
+                _clear_task_cache()
+        except:
+            log.error(
+                "Nornir-proxy PID {} failed to apply worker process '{}' data "
+                "change: {}".format(os.getpid(), kind, traceback.format_exc())
+            )
+
+
+def _mirror_worker_process_mutations(wkr_data, mutations):
+    """
+    Helper function to apply shared data changes recorded by Nornir worker
+    process to main process data and send them to other Nornir worker
+    processes to apply.
+
+    :param wkr_data: (dict) Nornir worker dictionary of worker that made changes
+    :param mutations: (list) list of ``(kind, *args)`` tuples
+    """
+    _apply_worker_process_mutations(wkr_data, mutations)
+    for wkr in list(nornir_data["nrs"]):
+        worker_process = wkr.get("worker_process")
+        if wkr is wkr_data or not worker_process:
+            continue
+        try:
+            with worker_process["send_lock"]:
+                worker_process["conn"].send(("mirror", None, mutations))
+        except:
+            log.error(
+                "Nornir-proxy MAIN PID {} failed to send data changes to "
+                "nornir-worker-{} process: {}".format(
+                    os.getpid(), wkr["worker_id"], traceback.format_exc()
+                )
+            )
+
+
+def _mirror_worker_process_job(job, wkr_data, job_hosts):
+    """
+    Helper function to apply inventory changes made by job within Nornir
+    worker process to main process copy of Nornir worker's inventory, for
+    worker process restarted later on to start with up to date inventory.
+
+    :param job: (dict) job dictionary
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param job_hosts: (set) names of job's hosts
+    """
+    try:
+        if job["task_fun"] == "inventory":
+            if job["kwargs"].get("call", "read_inventory") not in [
+                "read_host",
+                "read",
+                "read_inventory",
+                "read_host_data",
+                "list_hosts",
+                "list_hosts_platforms",
+            ]:
+                InventoryFun(wkr_data["nr"], **copy.deepcopy(job["kwargs"]))
+        elif job["task_fun"] == "clear_dcache":
+            _clear_dcache(nr=wkr_data["nr"], cache_keys=job["kwargs"].get("cache_keys"))
+        elif job["task_fun"] == "nornir_salt.plugins.tasks.salt_clear_hcache":
+            cache_keys = job["kwargs"].get("cache_keys")
+            for host_name in job_hosts:
+                host = wkr_data["nr"].inventory.hosts.get(host_name)
+                if host is None:
+                    continue
+                hcache_keys = host.data.get("_hcache_keys_", [])
+                for key in list(hcache_keys if cache_keys is None else cache_keys):
+                    if key in host.data and key in hcache_keys:
+                        host.data.pop(key)
+                        hcache_keys.remove(key)
+    except:
+        log.error(
+            "Nornir-proxy MAIN PID {} failed to apply '{}' job changes to main process "
+            "inventory: {}".format(os.getpid(), job["task_fun"], traceback.format_exc())
+        )
+
+
+def _collect_worker_process_stats(wkr_data):
+    """
+    Helper function to collect Nornir worker process stats to relay them
+    to main process.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :return: dictionary with ``stats`` counters increments since previous
+        call, ``worker`` stats values and ``mutations`` list of shared data
+        changes recorded since previous call
+    """
+    with nornir_data["worker_process_stats_lock"]:
+        relayed = nornir_data["worker_process_stats_relayed"]
+        increments = {}
+        for stat in worker_process_counters:
+            increments[stat] = nornir_data["stats"][stat] - relayed[stat]
+            relayed[stat] = nornir_data["stats"][stat]
+        mutations = nornir_data["worker_process_mutations"]
+        nornir_data["worker_process_mutations"] = []
+    return {
+        "stats": increments,
+        "mutations": mutations,
+        "worker": {
+            "worker_tasks_completed": wkr_data["worker_tasks_completed"],
+            "worker_tasks_failed": wkr_data["worker_tasks_failed"],
+            "worker_hosts_tasks_failed": wkr_data["worker_hosts_tasks_failed"],
+            "worker_connections": copy.deepcopy(wkr_data["worker_connections"]),
+        },
+    }
+
+
+class _WorkerProcessReplyConn:
+    """
+    Job's reply connection stand-in used within Nornir worker process to
+    relay streamed results chunks to main process, main process sends
+    them on to job submitter.
+
+    :param conn: (obj) worker process end of the pipe to main process
+    :param send_lock: (obj) lock to serialize sending over the pipe
+    :param job_key: (int) job identifier used by main process
+    """
+
+    def __init__(self, conn, send_lock, job_key):
+        self.conn = conn
+        self.send_lock = send_lock
+        self.job_key = job_key
+
+    def send_bytes(self, data):
+        with self.send_lock:
+            self.conn.send(("partial", self.job_key, data))
+
+    def send(self, obj):
+        self.send_bytes(_dump_job_result(obj))
+
+    def close(self):
+        pass
+
+
+def _worker_process_init(worker_id, settings):
+    """
+    Helper function to initialize Nornir worker process, applying main
+    process settings and creating this worker's Nornir instance.
+
+    Worker process inherits launcher process state as of ``init`` call
+    that forked it, when no jobs, threads or worker processes were running.
+
+    :param worker_id: (int) Nornir worker ID
+    :param settings: (dict) main process ``worker_process_settings`` values
+    :return: Nornir worker dictionary
+    """
+    nornir_data.update(settings)
+    nornir_data["nrs"] = []
+    wkr_data = _create_nornir_worker(worker_id)
+    nornir_data["nrs"] = [wkr_data]
+    nornir_data["worker_process_stats_lock"] = threading.Lock()
+    nornir_data["worker_process_stats_relayed"] = {
+        stat: nornir_data["stats"][stat] for stat in worker_process_counters
+    }
+    nornir_data["worker_process_mutations"] = []
+    return wkr_data
+
+
+def _worker_process_watchdog(wkr_data, parent_pid):
+    """
+    Thread worker to maintain Nornir worker process hosts' connections and
+    results cache, exits worker process if main process is gone.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param parent_pid: (int) main process PID
+    """
+    while True:
+        time.sleep(nornir_data["watchdog_interval"])
+        if os.getppid() != parent_pid:
+            os._exit(0)
+        try:
+            _close_idle_connections(wkr_data)
+            _results_cache_purge(remove_unused=True)
+            if nornir_data["proxy_always_alive"]:
+                _keepalive_connections()
+        except:
+            log.error(
+                "Nornir-proxy worker process PID {} watchdog error: {}".format(
+                    os.getpid(), traceback.format_exc()
+                )
+            )
+
+
+def _run_worker_process_job(job, job_key, wkr_data, loader, conn, send_lock):
+    """
+    Function to run job within Nornir worker process and send job results
+    back to main process.
+
+    :param job: (dict) job dictionary
+    :param job_key: (int) job identifier used by main process
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param loader: (obj or None) SaltStack loader context object
+    :param conn: (obj) worker process end of the pipe to main process
+    :param send_lock: (obj) lock to serialize sending over the pipe
+    """
+    job_hosts, action = set(), "done"
+    if job.pop("stream"):
+        job["reply_conn"] = _WorkerProcessReplyConn(conn, send_lock, job_key)
+    try:
+        output = _execute_worker_job(job, wkr_data, loader, job_hosts)
+    except:
+        action = "failed"
+        output = (
+            "Nornir-proxy worker process PID {} job failed: {}, error:\n'{}'".format(
+                os.getpid(), job["name"], traceback.format_exc()
+            )
+        )
+        log.error(output)
+    _close_job_connections(wkr_data, job_hosts)
+    _unlock_hosts(wkr_data, job_hosts)
+    wkr_data["worker_jobs_running"].pop(job_key, None)
+    try:
+        with send_lock:
+            conn.send(
+                (action, job_key, (output, _collect_worker_process_stats(wkr_data)))
+            )
+    except:
+        tb = traceback.format_exc()
+        log.error(
+            "Nornir-proxy worker process PID {} failed to send job results: {}".format(
+                os.getpid(), tb
+            )
+        )
+        with send_lock:
+            conn.send(("failed", job_key, (tb, None)))
+
+
+def _worker_process(worker_id, settings, conn, loader, inherited_conns):
+    """
+    Target function for Nornir worker process to run jobs sent to it by
+    main process worker thread.
+
+    Each job runs in its own thread, main process worker thread controls
+    how many jobs worker process runs at the same time.
+
+    :param worker_id: (int) Nornir worker ID
+    :param settings: (dict) main process ``worker_process_settings`` values
+    :param conn: (obj) worker process end of the pipe to main process
+    :param loader: (obj or None) SaltStack loader context object
+    :param inherited_conns: (list) launcher process pipes ends to close
+    """
+    for inherited_conn in inherited_conns:
+        inherited_conn.close()
+    wkr_data = _worker_process_init(worker_id, settings)
+    send_lock = threading.Lock()
+    wkr_data["worker_jobs_running"] = {}
+    threading.Thread(
+        target=_worker_process_watchdog,
+        args=(wkr_data, os.getppid()),
+        daemon=True,
+    ).start()
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+        action, job_key, job = message
+        if action == "run":
+            job["cancel_event"] = threading.Event()
+            wkr_data["worker_jobs_running"][job_key] = job
+            threading.Thread(
+                target=_run_worker_process_job,
+                args=(job, job_key, wkr_data, loader, conn, send_lock),
+                daemon=True,
+            ).start()
+        elif action == "cancel" and job_key in wkr_data["worker_jobs_running"]:
+            wkr_data["worker_jobs_running"][job_key]["cancel_event"].set()
+        # apply shared data changes made by other worker processes
+        elif action == "mirror":
+            _apply_worker_process_mutations(wkr_data, job)
+    wkr_data["nr"].close_connections(on_good=True, on_failed=True)
+
+
+@_use_loader_context
+def _fire_events(result):
+    """
+    Helper function to iterate over results and fire event for
+    tasks that either has failed=True or success=False.
+
+    :param result: (obj) Nornir AggregatedResult object
+    """
+    results_list = ResultSerializer(result, to_dict=False, add_details=True)
+    for res in results_list:
+        if res.get("failed") is True or res.get("success") is False:
+            __salt__["event.send"](
+                tag="nornir-proxy/{proxy_id}/{host}/task/failed/{name}".format(
+                    proxy_id=nornir_data["stats"]["proxy_minion_id"],
+                    host=res["host"],
+                    name=res["name"],
+                ),
+                data=res,
+            )
+
+
+def _load_job_data(job_data, saltenv="base"):
+    """
+    Helper function to process and load job data.
+
+    :param job_data: (str, list or dict) data to process
+    :param saltenv: (str) salt environment
+    :param return: string, dict or list containing loaded job data
+    """
+    ret = job_data
+    # handle job_data="salt://path/to/file.xyz"
+    if isinstance(job_data, str):
+        if _is_url(job_data):
+            return __salt__["slsutil.renderer"](path=job_data, saltenv=saltenv)
+        else:
+            # return __salt__["slsutil.renderer"](string=job_data, saltenv=saltenv)
+            return job_data
+    # handle job_data='["salt://path/to/file.xyz"]'
+    elif isinstance(job_data, list):
+        ret = [
+            _load_job_data(i, saltenv) if isinstance(i, str) else i for i in job_data
+        ]
+    # handle job_data='{"foo": "salt://path/to/file.xyz"}'
+    elif isinstance(job_data, dict):
+        ret = {
+            k: _load_job_data(v, saltenv) if isinstance(v, str) else v
+            for k, v in job_data.items()
+        }
+    log.debug(
+        "Nornir-proxy MAIN PID {} worker thread, loaded job data '{}'".format(
+            os.getpid(), type(job_data)
+        )
+    )
+    return ret
+
+
+def _make_jinja_env(opts, saltenv, with_loader=True):
+    """
+    Helper function to create Jinja2 environment using same settings, extensions,
+    filters, tests and globals as Salt ``render_jinja_tmpl`` function does.
+
+    :param opts: (dict) salt options dictionary
+    :param saltenv: (str) salt environment
+    :param with_loader: (bool) if False, environment created without Salt templates
+        loader, templates that include, import or extend other templates not supported
+    :return: tuple of Jinja2 environment object and environment settings key
+    """
+    loader = None
+    if with_loader:
+        loader = salt.utils.jinja.SaltCacheLoader(opts, saltenv, pillar_rend=False)
+    env_args = {"extensions": [], "loader": loader}
+    for extension in ["with_", "do", "loopcontrols"]:
+        if hasattr(jinja2.ext, extension):
+            env_args["extensions"].append("jinja2.ext.{}".format(extension))
+    env_args["extensions"].append(salt.utils.jinja.SerializerExtension)
+    if opts.get("jinja_trim_blocks", False):
+        env_args["trim_blocks"] = True
+    if opts.get("jinja_lstrip_blocks", False):
+        env_args["lstrip_blocks"] = True
+    opt_jinja_env = opts.get("jinja_env", {})
+    opt_jinja_env = opt_jinja_env if isinstance(opt_jinja_env, dict) else {}
+    for k, v in opt_jinja_env.items():
+        if hasattr(jinja2.defaults, k.upper()):
+            env_args[k] = v
+    if opts.get("allow_undefined", False):
+        jinja_env = jinja2.sandbox.SandboxedEnvironment(**env_args)
+    else:
+        jinja_env = jinja2.sandbox.SandboxedEnvironment(
+            undefined=jinja2.StrictUndefined, **env_args
+        )
+    indent_filter = jinja_env.filters.get("indent")
+    jinja_env.tests.update(JinjaTest.salt_jinja_tests)
+    jinja_env.filters.update(JinjaFilter.salt_jinja_filters)
+    if tuple(int(i) for i in jinja2.__version__.split(".")[:2]) >= (2, 11):
+        jinja_env.filters["indent"] = indent_filter
+    jinja_env.globals.update(JinjaGlobal.salt_jinja_globals)
+    jinja_env.globals["odict"] = collections.OrderedDict
+    jinja_env.globals["show_full_context"] = salt.utils.jinja.show_full_context
+    jinja_env.tests["list"] = salt.utils.data.is_list
+    # templates compiled code only depends on environment syntax settings
+    env_key = repr(sorted((k, repr(v)) for k, v in env_args.items() if k != "loader"))
+    return jinja_env, env_key
+
+
+def _render_jinja_template(jinja_env, env_key, source, context):
+    """
+    Helper function to render Jinja2 template using compiled templates cache.
+
+    Compiled template code stored in least recently used cache keyed by
+    environment settings and template content hash, cache size limited
+    by ``render_templates_cache_size`` proxy setting.
+
+    :param jinja_env: (obj) Jinja2 environment created by ``_make_jinja_env``
+    :param env_key: (str) Jinja2 environment settings key
+    :param source: (str) template content
+    :param context: (dict) template rendering context
+    :return: rendered string
+    """
+    cache = nornir_data["render_templates_cache"]
+    cache_key = (env_key, hashlib.sha256(source.encode("utf-8")).hexdigest())
+    with nornir_data["render_templates_cache_lock"]:
+        code = cache.get(cache_key)
+        if code is not None:
+            cache.move_to_end(cache_key)
+            nornir_data["stats"]["render_templates_cache_hits"] += 1
+    if code is None:
+        code = jinja_env.compile(source)
+        with nornir_data["render_templates_cache_lock"]:
+            cache[cache_key] = code
+            nornir_data["stats"]["render_templates_cache_misses"] += 1
+            while len(cache) > nornir_data["render_templates_cache_size"]:
+                cache.popitem(last=False)
+    template = jinja_env.template_class.from_code(
+        jinja_env, code, jinja_env.make_globals(context)
+    )
+    ret = template.render(**context)
+    # Jinja2 removes final newline, add it back same way as Salt does
+    if source.endswith(os.linesep):
+        ret += os.linesep
+    elif source.endswith("\n"):
+        ret += "\n"
+    return ret
+
+
+def _render_pool_init(render_templates_cache_size):
+    """
+    Helper function to initialize rendering pool process.
+
+    :param render_templates_cache_size: (int) compiled templates cache size
+    """
+    nornir_data["render_templates_cache_size"] = render_templates_cache_size
+
+
+def _render_pool_get(render_workers):
+    """
+    Helper function to return persistent pool of rendering processes.
+
+    Processes started using ``forkserver`` method where supported instead
+    of forking multithreaded proxy process, pool re-created if job asks
+    for more ``render_workers`` than current pool has.
+
+    :param render_workers: (int) number of rendering processes
+    :return: ``multiprocessing.Pool`` object
+    """
+    with nornir_data["render_pool_lock"]:
+        pool = nornir_data["render_pool"]
+        if pool is not None and nornir_data["render_pool_size"] < render_workers:
+            # let old pool finish its tasks and exit
+            pool.close()
+            threading.Thread(target=pool.join, daemon=True).start()
+            pool = None
+        if pool is None:
+            start_method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+            pool = multiprocessing.get_context(start_method).Pool(
+                processes=render_workers,
+                initializer=_render_pool_init,
+                initargs=(nornir_data.get("render_templates_cache_size", 0),),
+            )
+            nornir_data["render_pool"] = pool
+            nornir_data["render_pool_size"] = render_workers
+        return pool
+
+
+def _render_pool_terminate(pool=None):
+    """
+    Helper function to terminate rendering pool processes.
+
+    :param pool: (obj) pool to terminate, terminates current pool if None
+    """
+    with nornir_data["render_pool_lock"]:
+        if pool is None or nornir_data["render_pool"] is pool:
+            pool, nornir_data["render_pool"] = nornir_data["render_pool"], None
+    if pool is not None:
+        pool.terminate()
+
+
+def _render_pool_pids():
+    """
+    Helper function to return rendering pool processes PIDs.
+
+    :return: set of PIDs
+    """
+    pool = nornir_data["render_pool"]
+    return {p.pid for p in getattr(pool, "_pool", [])} if pool is not None else set()
+
+
+def _is_render_pool_template(jinja_env, source):
+    """
+    Helper function to check if template can be rendered by rendering pool
+    process - template does not use Salt execution modules or options and
+    does not include, import or extend other templates.
+
+    :param jinja_env: (obj) Jinja2 environment
+    :param source: (str) template content
+    :return: True if template can be rendered in rendering pool
+    """
+    try:
+        ast = jinja_env.parse(source)
+    except jinja2.exceptions.TemplateError:
+        return False
+    return not (
+        list(jinja2.meta.find_referenced_templates(ast))
+        or jinja2.meta.find_undeclared_variables(ast) & {"salt", "opts"}
+    )
+
+
+def _render_pool_render(env_opts, saltenv, context, hosts, templates):
+    """
+    Function to render templates within rendering pool process.
+
+    :param env_opts: (dict) Salt options to create Jinja2 environment with
+    :param saltenv: (str) salt environment
+    :param context: (dict) rendering context shared by all hosts
+    :param hosts: (dict) Nornir Host objects keyed by host name
+    :param templates: (dict) ``(template, downloaded)`` tuples keyed by
+        ``(host_name, key, index)`` tuples
+    :return: tuple of rendered templates dictionary and templates cache stats,
+        templates that failed to render not included
+    """
+    stats = nornir_data["stats"]
+    cache_stats = {
+        "render_templates_cache_hits": stats["render_templates_cache_hits"],
+        "render_templates_cache_misses": stats["render_templates_cache_misses"],
+    }
+    jinja_env, env_key = _make_jinja_env(env_opts, saltenv, with_loader=False)
+    for host in hosts.values():
+        host.data["job_data"] = context.get("job_data")
+    ret = {}
+    for pool_key, (template, downloaded) in templates.items():
+        context["host"] = hosts[pool_key[0]]
+        try:
+            ret[pool_key] = (
+                _render_jinja_template(jinja_env, env_key, template, context),
+                downloaded,
+            )
+        except:
+            # job's worker thread renders it again to report the error
+            continue
+    return ret, {k: stats[k] - v for k, v in cache_stats.items()}
+
+
+def _render_in_pool(render_workers, env_opts, saltenv, context, hosts, templates):
+    """
+    Helper function to render templates using rendering pool processes.
+
+    Templates grouped in chunks by host, each chunk sent to rendering pool
+    together with its hosts' copies and shared rendering context. Rendering
+    pool processes terminated if they fail to render all templates within
+    ``job_wait_timeout``, results rendered so far returned.
+
+    :param render_workers: (int) number of rendering processes
+    :param env_opts: (dict) Salt options to create Jinja2 environment with
+    :param saltenv: (str) salt environment
+    :param context: (dict) rendering context shared by all hosts
+    :param hosts: (dict) Nornir Host objects keyed by host name
+    :param templates: (dict) ``(template, downloaded)`` tuples keyed by
+        ``(host_name, key, index)`` tuples
+    :return: dictionary of rendered templates
+    """
+    # Salt loads this module under its own name that rendering pool processes
+    # cannot import, submit function of module imported from salt_nornir package
+    render_fun = importlib.import_module(
+        "salt_nornir.proxy.nornir_proxy_module"
+    )._render_pool_render
+    hosts_names = list(hosts.keys())
+    chunk_size = max(1, len(hosts_names) // (render_workers * 4))
+    chunks = [
+        set(hosts_names[i : i + chunk_size])
+        for i in range(0, len(hosts_names), chunk_size)
+    ]
+    pool = _render_pool_get(render_workers)
+    deadline = time.time() + nornir_data["job_wait_timeout"]
+    ret = {}
+    try:
+        async_results = [
+            pool.apply_async(
+                render_fun,
+                (
+                    env_opts,
+                    saltenv,
+                    context,
+                    {h: hosts[h] for h in chunk},
+                    {k: v for k, v in templates.items() if k[0] in chunk},
+                ),
+            )
+            for chunk in chunks
+        ]
+        for async_result in async_results:
+            rendered, cache_stats = async_result.get(
+                timeout=max(deadline - time.time(), 0)
+            )
+            ret.update(rendered)
+            with nornir_data["render_templates_cache_lock"]:
+                for k, v in cache_stats.items():
+                    nornir_data["stats"][k] += v
+    except multiprocessing.TimeoutError:
+        log.error(
+            "Nornir-proxy PID {} rendering pool failed to render templates within "
+            "{}s, terminating rendering pool".format(
+                os.getpid(), nornir_data["job_wait_timeout"]
+            )
+        )
+        _render_pool_terminate(pool)
+    except:
+        log.exception("Nornir-proxy rendering pool failed, rendering in worker thread")
+    return ret
+
+
+@_use_loader_context
+def _download_and_render_files(hosts, render, kwargs, ignore_keys, render_workers=0):
+    """
+    Helper function to iterate over hosts and render content for each of them.
+
+    Rendering results saved in host's ``__task__`` attribute as a dictionary
+    keyed by the items from ``render`` list.
+
+    :param hosts: (obj) Nornir object with hosts inventory
+    :param render: (list or str) list of keys or comma separated string
+        of key names from kwargs to run rendering for
+    :param kwargs: (dict) dictionary with data to render
+    :param ignore_keys: (list or str) key names to ignore rendering for
+    :param render_workers: (int) number of processes to render hosts content in,
+        hosts rendered in worker thread if ``render_workers`` is less than 2
+    :return: dictionary of failed hosts
+    """
+    # extract and form attributes
     context = kwargs.pop("context", {})
     saltenv = kwargs.pop("saltenv", "base")
     defaults = kwargs.pop("defaults", {})
@@ -1192,32 +4096,79 @@ def _download_and_render_files(hosts, render, kwargs, ignore_keys):
     context["job_data"] = _load_job_data(job_data, saltenv)
     context["opts"] = __opts__
 
-    def __render(data):
-        # do initial data rendering for cli content
-        ret = __salt__["file.apply_template_on_contents"](
+    # use compiled templates cache to render Jinja2 templates
+    jinja_env = None
+    if (
+        HAS_SALT_JINJA
+        and template_engine == "jinja"
+        and nornir_data.get("render_templates_cache_size", 0) > 0
+    ):
+        try:
+            opts = __opts__.value() if hasattr(__opts__, "value") else __opts__
+            jinja_env, env_key = _make_jinja_env(opts, saltenv)
+            # form rendering context same way as file.apply_template_on_contents does
+            jinja_context = {
+                "saltenv": saltenv,
+                "grains": opts.get("grains", {}),
+                "pillar": opts.get("pillar", {}),
+                "salt": salt.utils.templates.AliasedLoader(__salt__),
+                "opts": opts,
+            }
+            jinja_context.update(
+                salt.utils.dictupdate.merge(
+                    defaults, {k: v for k, v in context.items() if k != "opts"}
+                )
+            )
+            jinja_context["opts"] = opts
+        except:
+            log.exception(
+                "Nornir-proxy failed to create Jinja2 environment, using Salt to render templates"
+            )
+            jinja_env = None
+
+    def __apply_template(data):
+        if jinja_env is not None:
+            try:
+                return _render_jinja_template(jinja_env, env_key, data, jinja_context)
+            except jinja2.exceptions.TemplateError:
+                # re-render using Salt to produce same result or error
+                log.debug(
+                    "Nornir-proxy PID {} failed to render template using compiled "
+                    "templates cache, re-rendering using Salt: {}".format(
+                        os.getpid(), traceback.format_exc()
+                    )
+                )
+        return __salt__["file.apply_template_on_contents"](
             contents=data,
             template=template_engine,
             context=context,
             defaults=defaults,
             saltenv=saltenv,
         )
+
+    def __render(data, pool_key):
+        # use content rendered by rendering pool processes if any
+        if pool_key in pool_rendered:
+            ret, downloaded = pool_rendered[pool_key]
+        else:
+            # do initial data rendering for cli content
+            ret, downloaded = __apply_template(data), False
         # check if per-host data was provided, e.g. filename=salt://path/to/{{ host.name }}_cfg.txt
-        if _is_url(ret):
+        if not downloaded and _is_url(ret):
             content = _file_download(ret, saltenv)
             # render final file
-            ret = __salt__["file.apply_template_on_contents"](
-                contents=content,
-                template=template_engine,
-                context=context,
-                defaults=defaults,
-                saltenv=saltenv,
-            )
+            ret = __apply_template(content)
         return ret
 
-    for host_name, host_object in hosts.inventory.hosts.items():
+    def __set_host(host_name):
+        host_object = hosts.inventory.hosts[host_name]
         context.update({"host": host_object})
-        host_object.data["__task__"] = {}
-        host_object.data["job_data"] = context["job_data"]
+        if jinja_env is not None:
+            jinja_context["host"] = host_object
+
+    def __render_host(host_name):
+        __set_host(host_name)
+        rendered_data, error = {}, None
         for key in render:
             if not kwargs.get(key) or key in ignore_keys:
                 continue
@@ -1225,13 +4176,16 @@ def _download_and_render_files(hosts, render, kwargs, ignore_keys):
                 value = kwargs[key]
                 # if string given use it as is
                 if isinstance(value, str):
-                    rendered = __render(value)
+                    rendered = __render(value, (host_name, key, None))
                 # check if list of strings given
                 elif isinstance(value, (list, tuple)):
-                    rendered = [__render(item) for item in value]
+                    rendered = [
+                        __render(item, (host_name, key, index))
+                        for index, item in enumerate(value)
+                    ]
                 # check if given dictionary keyed by host names
                 elif isinstance(value, dict):
-                    rendered = __render(value[host_name])
+                    rendered = __render(value[host_name], (host_name, key, None))
                 else:
                     raise TypeError(
                         "Unsupported type for render key '{}': '{}', supported str, list, tuple, dict".format(
@@ -1239,21 +4193,106 @@ def _download_and_render_files(hosts, render, kwargs, ignore_keys):
                         )
                     )
             except:
-                tb = traceback.format_exc()
-                hosts_failed_prep[host_name] = tb
+                error = traceback.format_exc()
                 continue
 
-            log.debug(
-                "Nornir-proxy MAIN PID {} worker thread, rendered '{}' '{}' data for '{}' host".format(
-                    os.getpid(), key, type(value), host_name
-                )
-            )
-            host_object.data["__task__"][key] = rendered
+            log.debug(
+                "Nornir-proxy PID {} rendered '{}' '{}' data for '{}' host".format(
+                    os.getpid(), key, type(value), host_name
+                )
+            )
+            rendered_data[key] = rendered
+        return rendered_data, error
+
+    def __render_hosts_in_pool():
+        # download per-host files in this thread and send templates that
+        # only need Jinja2 to render to rendering pool processes
+        templates, is_pool_template, pool_hosts = {}, {}, {}
+        for host_name in hosts_names:
+            __set_host(host_name)
+            for key in render:
+                value = kwargs.get(key)
+                if not value or key in ignore_keys:
+                    continue
+                elif isinstance(value, str):
+                    items = [((host_name, key, None), value)]
+                elif isinstance(value, (list, tuple)):
+                    items = [((host_name, key, i), v) for i, v in enumerate(value)]
+                elif isinstance(value, dict) and isinstance(value.get(host_name), str):
+                    items = [((host_name, key, None), value[host_name])]
+                else:
+                    continue
+                for pool_key, data in items:
+                    downloaded = False
+                    try:
+                        if _is_url(data):
+                            url = __apply_template(data)
+                            if not _is_url(url):
+                                continue
+                            data, downloaded = _file_download(url, saltenv), True
+                    except:
+                        # render in this thread to report the error
+                        continue
+                    if data not in is_pool_template:
+                        is_pool_template[data] = _is_render_pool_template(
+                            jinja_env, data
+                        )
+                    if is_pool_template[data]:
+                        templates[pool_key] = (data, downloaded)
+                        pool_hosts.setdefault(host_name, None)
+        if not templates:
+            return {}
+        # send hosts copies without connections and job data
+        for host_name in pool_hosts:
+            host_object = hosts.inventory.hosts[host_name]
+            pool_hosts[host_name] = _clone_inventory_element(
+                host_object, Host, {}, host_object.defaults
+            )
+            pool_hosts[host_name].data.pop("__task__", None)
+            pool_hosts[host_name].data.pop("job_data", None)
+        return _render_in_pool(
+            render_workers,
+            {
+                k: opts.get(k)
+                for k in [
+                    "jinja_trim_blocks",
+                    "jinja_lstrip_blocks",
+                    "jinja_env",
+                    "allow_undefined",
+                ]
+            },
+            saltenv,
+            {
+                k: v
+                for k, v in jinja_context.items()
+                if k not in ["salt", "opts", "host"]
+            },
+            pool_hosts,
+            templates,
+        )
+
+    hosts_names = list(hosts.inventory.hosts.keys())
+    for host_name in hosts_names:
+        hosts.inventory.hosts[host_name].data["__task__"] = {}
+        hosts.inventory.hosts[host_name].data["job_data"] = context["job_data"]
+    # render templates in a pool of processes, templates that pool failed to
+    # render or that use Salt modules rendered in this thread
+    pool_rendered = {}
+    if render_workers > 1 and jinja_env is not None and len(hosts_names) > 1:
+        pool_rendered = __render_hosts_in_pool()
+    for host_name in hosts_names:
+        rendered_data, error = __render_host(host_name)
+        hosts.inventory.hosts[host_name].data["__task__"].update(rendered_data)
+        if error:
+            hosts_failed_prep[host_name] = error
 
     # clean up kwargs from render keys to force tasks to use hosts's __task__ attribute
     for key in render:
         _ = kwargs.pop(key) if key in kwargs else None
 
+    if jinja_env is not None and hasattr(jinja_env.loader, "destroy"):
+        jinja_env.loader.destroy()
+
     return hosts_failed_prep
 
 
@@ -1285,6 +4324,73 @@ def _download_files(download, kwargs):
         )
 
 
+class _StreamResultsProcessor:
+    """
+    Nornir processor to send host results to job submitter as soon as host
+    completes its task instead of accumulating results for all hosts.
+
+    Once sent, host results replaced with placeholder that only retains
+    task failed status, as a result worker only holds in-flight hosts
+    results in memory.
+
+    Only successful host results streamed, failed host results might be
+    a failed attempt that runner, e.g. RetryRunner, is about to retry,
+    failed hosts final results returned together with the last chunk of
+    job results.
+
+    :param job: (dict) job dictionary with ``identity`` and ``reply_conn`` keys
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param to_dict: (bool) ResultSerializer ``to_dict`` argument
+    :param add_details: (bool) ResultSerializer ``add_details`` argument
+    :param event_failed: (bool) if True, fire events for failed tasks
+    """
+
+    def __init__(self, job, wkr_data, to_dict, add_details, event_failed):
+        self.job = job
+        self.wkr_data = wkr_data
+        self.to_dict = to_dict
+        self.add_details = add_details
+        self.event_failed = event_failed
+        self.send_lock = threading.Lock()
+
+    def task_started(self, task):
+        pass
+
+    def task_completed(self, task, result):
+        pass
+
+    def task_instance_started(self, task, host):
+        pass
+
+    def task_instance_completed(self, task, host, result):
+        # runner might retry failed task, keep results until runner completes
+        if result.failed:
+            return
+        host_result = AggregatedResult(task.name)
+        host_result[host.name] = result
+        # fire events for failed tasks if requested to do so
+        if self.event_failed:
+            _fire_events(host_result)
+        # calculate task stats and send results
+        _update_host_tasks_stats(self.wkr_data, result)
+        output = ResultSerializer(
+            host_result, to_dict=self.to_dict, add_details=self.add_details
+        )
+        with self.send_lock:
+            _send_result(self.job, output, partial=True)
+        # replace host results with placeholder to free memory
+        placeholder = Result(host=host, name="_streamed", failed=result.failed)
+        placeholder.skip_results = True
+        placeholder.streamed = True
+        result[:] = [placeholder]
+
+    def subtask_instance_started(self, task, host):
+        pass
+
+    def subtask_instance_completed(self, task, host, result):
+        pass
+
+
 def _add_processors(kwargs, loader, identity, nr, worker_id):
     """
     Helper function to extract processors arguments and add processors
@@ -1414,14 +4520,297 @@ def _add_processors(kwargs, loader, identity, nr, worker_id):
     return nr.with_processors(processors)
 
 
-def _cache_task_results_to_host_data(hosts, results, cache_key):
+def _results_cache_store(store_key, value, ttl=None):
+    """
+    Function to save value in shared results cache store that backs ``hcache``
+    and ``dcache`` data, evicting least recently saved entries if store size
+    goes above ``results_cache_max_mbyte``.
+
+    :param store_key: (tuple) ``(cache type, host name, cache key)`` tuple
+    :param value: (any) value to save
+    :param ttl: (int) seconds to keep value for, uses ``results_cache_ttl`` if None
+    """
+    ttl = nornir_data["results_cache_ttl"] if ttl is None else ttl
+    size_limit = nornir_data["results_cache_max_mbyte"] * 1024000
+    try:
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except:
+        size = sys.getsizeof(value)
+    entry = {
+        "value": value,
+        "size": size,
+        "expires": time.time() + ttl if ttl else None,
+    }
+    evicted = []
+    with nornir_data["results_cache_lock"]:
+        cache = nornir_data["results_cache"]
+        old_entry = cache.pop(store_key, None)
+        if old_entry:
+            nornir_data["results_cache_size"] -= old_entry["size"]
+        cache[store_key] = entry
+        nornir_data["results_cache_size"] += size
+        if entry["expires"]:
+            nornir_data["results_cache_next_expiry"] = min(
+                nornir_data["results_cache_next_expiry"], entry["expires"]
+            )
+        # evict least recently saved entries keeping at least the new one
+        while (
+            size_limit
+            and nornir_data["results_cache_size"] > size_limit
+            and len(cache) > 1
+        ):
+            evicted_key, evicted_entry = cache.popitem(last=False)
+            nornir_data["results_cache_size"] -= evicted_entry["size"]
+            nornir_data["stats"]["results_cache_evicted"] += 1
+            evicted.append((evicted_key, evicted_entry))
+    for evicted_key, evicted_entry in evicted:
+        _results_cache_unlink(evicted_key, evicted_entry)
+
+
+def _results_cache_unlink(store_key, entry):
+    """
+    Function to remove results cache entry value from Nornir workers' hosts
+    or defaults data.
+
+    :param store_key: (tuple) ``(cache type, host name, cache key)`` tuple
+    :param entry: (dict) results cache entry
+    """
+    cache_type, host_name, cache_key = store_key
+    # commands cache results not referenced by inventory data
+    if cache_type == "ccache":
+        return
+    for nr in nornir_data["nrs"]:
+        if cache_type == "hcache":
+            data = getattr(nr["nr"].inventory.hosts.get(host_name), "data", {})
+        else:
+            data = nr["nr"].inventory.defaults.data
+        if data.get(cache_key) is entry["value"]:
+            data.pop(cache_key, None)
+            if cache_key in data.get("_{}_keys_".format(cache_type), []):
+                data["_{}_keys_".format(cache_type)].remove(cache_key)
+
+
+def _results_cache_purge(remove_unused=False):
+    """
+    Function to remove expired entries from results cache store.
+
+    :param remove_unused: (bool) if True, also removes entries no Nornir worker
+        refers to anymore e.g. after ``clear_hcache`` call or inventory refresh
+    """
+    now = time.time()
+    if not remove_unused and now < nornir_data["results_cache_next_expiry"]:
+        return
+    removed = []
+    with nornir_data["results_cache_lock"]:
+        cache = nornir_data["results_cache"]
+        for store_key, entry in list(cache.items()):
+            if entry["expires"] and entry["expires"] <= now:
+                nornir_data["stats"]["results_cache_expired"] += 1
+            elif not (remove_unused and not _results_cache_in_use(store_key, entry)):
+                continue
+            cache.pop(store_key)
+            nornir_data["results_cache_size"] -= entry["size"]
+            removed.append((store_key, entry))
+        nornir_data["results_cache_next_expiry"] = min(
+            [i["expires"] for i in cache.values() if i["expires"]] or [float("inf")]
+        )
+    for store_key, entry in removed:
+        _results_cache_unlink(store_key, entry)
+
+
+def _results_cache_in_use(store_key, entry):
+    """
+    Function to check if any of Nornir workers refers to results cache entry value.
+
+    :param store_key: (tuple) ``(cache type, host name, cache key)`` tuple
+    :param entry: (dict) results cache entry
+    """
+    cache_type, host_name, cache_key = store_key
+    # commands cache results kept until expired or evicted
+    if cache_type == "ccache":
+        return True
+    for nr in nornir_data["nrs"]:
+        if cache_type == "hcache":
+            data = getattr(nr["nr"].inventory.hosts.get(host_name), "data", {})
+        else:
+            data = nr["nr"].inventory.defaults.data
+        if data.get(cache_key) is entry["value"]:
+            return True
+    return False
+
+
+def _results_cache_get(store_key):
+    """
+    Function to get not expired entry from shared results cache store.
+
+    :param store_key: (tuple) ``(cache type, host name, cache key)`` tuple
+    :return: results cache entry dictionary or None if no such entry or it expired
+    """
+    with nornir_data["results_cache_lock"]:
+        entry = nornir_data["results_cache"].get(store_key)
+    if entry is None or (entry["expires"] and entry["expires"] <= time.time()):
+        return None
+    return entry
+
+
+def _get_command_cache_ttl(command, cache_ttl=None):
+    """
+    Function to get number of seconds to cache command results for using
+    ``commands_cache_ttl`` glob patterns.
+
+    :param command: (str) command or RPC call name
+    :param cache_ttl: (int) per-job TTL for all commands, overrides ``commands_cache_ttl``
+    :return: TTL integer, 0 if command results should not be cached
+    """
+    if cache_ttl:
+        return int(cache_ttl)
+    for pattern, ttl in nornir_data["commands_cache_ttl"].items():
+        if fnmatch.fnmatchcase(command, pattern):
+            return int(ttl)
+    return 0
+
+
+def _make_cached_task(task_fun, kwargs, cache_ttl=None):
+    """
+    Function to wrap task plugin in a task that serves hosts' commands or RPC
+    call results from shared results cache and only runs task plugin for
+    commands that are missing from the cache, saving their results in cache.
+
+    Supports ``*_send_commands`` task plugins that run each command as a separate
+    sub-task and RPC plugins that take ``call`` argument e.g. ``ncclient_call``.
+    Hosts' commands formed same way as ``*_send_commands`` task plugins do, using
+    commands rendered for each host if any, commands results returned in the
+    same order as commands.
+
+    :param task_fun: (obj) task plugin function
+    :param kwargs: (dict) task plugin arguments
+    :param cache_ttl: (int) per-job TTL for all commands, overrides ``commands_cache_ttl``
+    :return: task function
+    """
+    task_name = getattr(task_fun, "__name__", str(task_fun))
+    send_commands = task_name.endswith("_send_commands")
+    if not send_commands and "call" not in kwargs:
+        raise CommandExecutionError(
+            "Nornir-proxy 'cache' argument not supported by '{}' task plugin".format(
+                task_name
+            )
+        )
+
+    def cached_task(task, **kwargs):
+        task_data = task.host.data.get("__task__", {})
+        # repeated commands results can not be matched to cache entries
+        if send_commands and kwargs.get("repeat", 1) > 1:
+            return task_fun(task, **kwargs)
+        commands_keys = ["commands", "filename"] if send_commands else []
+        fingerprint = hashlib.sha256(
+            repr(
+                (
+                    sorted(
+                        (k, v)
+                        for k, v in kwargs.items()
+                        if k not in ["commands", "call"]
+                    ),
+                    sorted(
+                        (k, v) for k, v in task_data.items() if k not in commands_keys
+                    ),
+                )
+            ).encode()
+        ).hexdigest()
+        if send_commands:
+            commands = {
+                c.strip().splitlines()[0]: c
+                for c in cli_form_commands(
+                    task,
+                    commands=copy.copy(kwargs.get("commands")),
+                    split_lines=kwargs.get("split_lines", True),
+                    new_line_char=kwargs.get("new_line_char", "_br_"),
+                )
+            }
+        else:
+            commands = {kwargs["call"]: kwargs["call"]}
+        # collect cached results
+        cached, missing = {}, []
+        for name, command in commands.items():
+            if not _get_command_cache_ttl(command, cache_ttl):
+                missing.append(command)
+                continue
+            store_key = ("ccache", task.host.name, (task_name, command, fingerprint))
+            entry = _results_cache_get(store_key)
+            if entry is None:
+                missing.append(command)
+                nornir_data["stats"]["commands_cache_misses"] += 1
+            else:
+                cached[name] = entry["value"]
+                nornir_data["stats"]["commands_cache_hits"] += 1
+        # RPC call results served from cache
+        if not send_commands and cached:
+            task.name = kwargs["call"]
+            return Result(host=task.host, result=copy.deepcopy(cached[task.name]))
+        # run task plugin for commands missing from cache and cache their results
+        results_count = len(task.results)
+        if missing:
+            if send_commands:
+                # hide host's rendered commands for task plugin to only run missing ones
+                host_task_data = task.host.data.get("__task__")
+                if host_task_data is not None:
+                    task.host.data["__task__"] = {
+                        k: v
+                        for k, v in host_task_data.items()
+                        if k not in commands_keys
+                    }
+                try:
+                    ret = task_fun(
+                        task, **{**kwargs, "commands": missing, "split_lines": False}
+                    )
+                finally:
+                    if host_task_data is not None:
+                        task.host.data["__task__"] = host_task_data
+                new_results = task.results[results_count:]
+            else:
+                ret = task_fun(task, **kwargs)
+                new_results = [ret] if isinstance(ret, Result) else []
+            for result in new_results:
+                name = kwargs["call"] if not send_commands else result.name
+                ttl = _get_command_cache_ttl(commands.get(name, ""), cache_ttl)
+                if name in commands and ttl and not (result.failed or result.exception):
+                    store_key = (
+                        "ccache",
+                        task.host.name,
+                        (task_name, commands[name], fingerprint),
+                    )
+                    _results_cache_store(store_key, copy.deepcopy(result.result), ttl)
+            if not send_commands:
+                return ret
+        # add cached commands results keeping commands order
+        new_results = {r.name: r for r in task.results[results_count:]}
+        ordered = []
+        for name in commands:
+            if name in new_results:
+                ordered.append(new_results.pop(name))
+            elif name in cached:
+                ordered.append(
+                    Result(
+                        host=task.host, result=copy.deepcopy(cached[name]), name=name
+                    )
+                )
+        task.results[results_count:] = ordered + list(new_results.values())
+        return Result(host=task.host, skip_results=True)
+
+    return cached_task
+
+
+def _cache_task_results_to_host_data(hosts, results, cache_key, ttl=None):
     """
     Function to save task results to host data under cache key.
 
+    Results saved once in shared results cache store and all Nornir workers'
+    hosts data refer to the same cached value.
+
     :param hosts: (obj) Nornir object
     :param results: (dict, str, list) Results to save
     :param cache_key: (str or bool) key to save results under, if True
         ``cache_key`` set equal to ``hcache``
+    :param ttl: (int) seconds to keep cached results for
     """
     cache_key = cache_key if isinstance(cache_key, str) else "hcache"
     log.debug(
@@ -1430,38 +4819,42 @@ def _cache_task_results_to_host_data(hosts, results, cache_key):
         )
     )
 
-    # form a list of hosts to add hcache to
-    hosts_to_cache = list(hosts.inventory.hosts.keys())
-
-    # iteare over Nornir instances and cache results to hosts
-    for nr in nornir_data["nrs"]:
-        # iterate over hosts and save results to data cache
-        for host_name, host_object in nr["nr"].inventory.hosts.items():
-            if host_name not in hosts_to_cache:
-                continue
+    # convert list results to dictionary keyed by host name
+    if isinstance(results, list):
+        results_by_host = {}
+        for i in results:
+            results_by_host.setdefault(i["host"], {})[i["name"]] = i["result"]
+        results = results_by_host
+    elif not isinstance(results, (dict, str)):
+        log.error(
+            "salt-nornir:hcache unsupported results type '{}'".format(type(results))
+        )
+        return
+
+    # iterate over job hosts and cache results to all workers' hosts
+    for host_name in hosts.inventory.hosts.keys():
+        workers_hosts = [
+            nr["nr"].inventory.hosts[host_name]
+            for nr in nornir_data["nrs"]
+            if host_name in nr["nr"].inventory.hosts
+        ]
+        if not workers_hosts:
+            continue
+        # save string results as is
+        if isinstance(results, str):
+            value = results
+        # update existing cached dictionary with host results
+        else:
+            value = workers_hosts[0].data.get(cache_key)
+            value = dict(value) if isinstance(value, dict) else {}
+            value.update(results.get(host_name, {}))
+        _results_cache_store(("hcache", host_name, cache_key), value, ttl)
+        for host_object in workers_hosts:
             # add metadata on cache keys so that can clean them up
             host_object.data.setdefault("_hcache_keys_", [])
             if cache_key not in host_object.data["_hcache_keys_"]:
                 host_object.data["_hcache_keys_"].append(cache_key)
-            # cache results
-            host_object.data.setdefault(cache_key, {})
-            # dictionary results should be keyed by host name
-            if isinstance(results, dict):
-                host_object.data[cache_key].update(results.get(host_name, {}))
-            # save string results as is
-            elif isinstance(results, str):
-                host_object.data[cache_key] = results
-            # convert list results back to dictionary keyd by task name
-            elif isinstance(results, list):
-                host_object.data[cache_key].update(
-                    {i["name"]: i["result"] for i in results if i["host"] == host_name}
-                )
-            else:
-                log.error(
-                    "salt-nornir:hcache unsupported results type '{}'".format(
-                        type(results)
-                    )
-                )
+            host_object.data[cache_key] = value
 
     log.debug(
         "salt-nornir:hcache saved results in hosts data under '{}' key".format(
@@ -1470,13 +4863,17 @@ def _cache_task_results_to_host_data(hosts, results, cache_key):
     )
 
 
-def _cache_all_task_results_to_defaults_data(results, cache_key):
+def _cache_all_task_results_to_defaults_data(results, cache_key, ttl=None):
     """
     Function to save full task results to default data under cache key.
 
+    Results saved once in shared results cache store and all Nornir workers'
+    defaults data refer to the same cached value.
+
     :param results: (any) Results to save
     :param cache_key: (str or bool) key to save results under, if True
         ``cache_key`` set equal to ``dcache``
+    :param ttl: (int) seconds to keep cached results for
     """
     cache_key = cache_key if isinstance(cache_key, str) else "dcache"
     log.debug(
@@ -1484,6 +4881,7 @@ def _cache_all_task_results_to_defaults_data(results, cache_key):
             cache_key
         )
     )
+    _results_cache_store(("dcache", None, cache_key), results, ttl)
 
     # add metadata about cache keys so that can clean them up later on
     for nr in nornir_data["nrs"]:
@@ -1519,9 +4917,15 @@ def _clear_dcache(nr, cache_keys=None):
         if key in nr.inventory.defaults.data and key in nr.inventory.defaults.data.get(
             "_dcache_keys_", []
         ):
-            nr.inventory.defaults.data.pop(key)
+            value = nr.inventory.defaults.data.pop(key)
             nr.inventory.defaults.data["_dcache_keys_"].remove(key)
             result[key] = True
+            # remove cached results from shared results cache store
+            with nornir_data["results_cache_lock"]:
+                entry = nornir_data["results_cache"].get(("dcache", None, key))
+                if entry and entry["value"] is value:
+                    nornir_data["results_cache"].pop(("dcache", None, key))
+                    nornir_data["results_cache_size"] -= entry["size"]
         else:
             result[key] = False
 
@@ -1529,7 +4933,7 @@ def _clear_dcache(nr, cache_keys=None):
 
 
 @_use_loader_context
-def _refresh_nornir(loader_, workers_only=False, **kwargs):
+def _refresh_nornir(loader_, workers_only=False, incremental=False, **kwargs):
     """
     Function to re-initialize Nornir proxy with latest pillar data.
 
@@ -1541,11 +4945,29 @@ def _refresh_nornir(loader_, workers_only=False, **kwargs):
     killing child processes, resulting in inventory refresh without interrupting jobs
     execution process.
 
+    If ``incremental`` is True, compares latest pillar hosts with hosts Nornir workers
+    were initiated with and only adds, removes or updates changed hosts in place, keeping
+    workers running and hosts' connections open unless host's connection parameters
+    changed. Falls back to ``workers_only`` refresh if proxy settings, groups or defaults
+    changed, if inventory not sourced from pillar or if ``worker_mode`` is ``process``.
+
     It takes about a minute to finish refresh process.
 
     :param loader_: (obj) ``__salt__.loader`` object instance for ``init``
     :param workers_only: (bool) if True, only refreshes Nornir workers
+    :param incremental: (bool) if True, only refreshes changed hosts
     """
+    pillar = None
+    if incremental:
+        pillar = __salt__["pillar.items"]()
+        if _refresh_inventory_incrementally(pillar):
+            __salt__["saltutil.refresh_pillar"]()
+            return True
+        log.info(
+            "Nornir-proxy MAIN PID {}, incremental refresh not possible, doing "
+            "inventory only refresh".format(os.getpid())
+        )
+        workers_only = True
     # extract worker stats to preserve them
     wkr_stats = [
         {  # make a copy of the stats
@@ -1557,6 +4979,7 @@ def _refresh_nornir(loader_, workers_only=False, **kwargs):
                 "worker_tasks_completed",
                 "worker_tasks_failed",
                 "worker_hosts_tasks_failed",
+                "worker_affinity_hits",
             ]
         }
         for wkr in nornir_data["nrs"]
@@ -1570,11 +4993,7 @@ def _refresh_nornir(loader_, workers_only=False, **kwargs):
         )
         # trigger worker and watchdogs threads to stop
         nornir_data["initialized"] = False
-        # close connections to devices and delete old Nornir Objects
-        while nornir_data["nrs"]:
-            nr = nornir_data["nrs"].pop()
-            nr["nr"].close_connections(on_good=True, on_failed=True)
-            del nr
+        _stop_workers()
         # signal to init() method that needs to keep queues intact
         init_queues = False
     elif shutdown():
@@ -1584,7 +5003,7 @@ def _refresh_nornir(loader_, workers_only=False, **kwargs):
         return False
 
     # get latest pillar data from master
-    __opts__["pillar"] = __salt__["pillar.items"]()
+    __opts__["pillar"] = pillar or __salt__["pillar.items"]()
     __opts__["proxy"] = __opts__["pillar"]["proxy"]
     log.debug(
         "Nornir-proxy MAIN PID {}, refreshing, new proxy data: {}".format(
@@ -1605,6 +5024,96 @@ def _refresh_nornir(loader_, workers_only=False, **kwargs):
     return True
 
 
+def _refresh_inventory_incrementally(pillar):
+    """
+    Helper function to apply pillar hosts changes to Nornir workers'
+    inventory in place.
+
+    :param pillar: (dict) latest pillar data
+    :return: True if inventory refreshed, False if full refresh required
+    """
+    old_inventory = nornir_data.get("inventory_pillar")
+    if (
+        old_inventory is None
+        or not nornir_data["nrs"]
+        or nornir_data["worker_mode"] == "process"
+        or pillar.get("proxy") != __opts__["proxy"]
+        or pillar.get("groups", {}) != old_inventory["groups"]
+        or pillar.get("defaults", {}) != old_inventory["defaults"]
+    ):
+        return False
+    new_hosts = pillar.get("hosts", {})
+    removed = [h for h in old_inventory["hosts"] if h not in new_hosts]
+    updated = copy.deepcopy(
+        {h: d for h, d in new_hosts.items() if old_inventory["hosts"].get(h) != d}
+    )
+    if removed or updated:
+        loaded = DictInventory(
+            hosts=updated,
+            groups=old_inventory["groups"],
+            defaults=old_inventory["defaults"],
+        ).load()
+        for wkr_data in nornir_data["nrs"]:
+            _update_worker_hosts(wkr_data, loaded.hosts, removed)
+    nornir_data["inventory_pillar"]["hosts"] = copy.deepcopy(new_hosts)
+    nornir_data["stats"]["hosts_count"] = len(
+        nornir_data["nrs"][0]["nr"].inventory.hosts.keys()
+    )
+    __opts__["pillar"] = pillar
+    log.info(
+        "Nornir-proxy MAIN PID {}, incremental refresh done, updated hosts: {}, "
+        "removed hosts: {}".format(os.getpid(), list(updated), removed)
+    )
+    return True
+
+
+def _update_worker_hosts(wkr_data, new_hosts, removed):
+    """
+    Helper function to add, update or remove hosts in Nornir worker's inventory.
+
+    Updated hosts keep their connections unless connection parameters changed.
+    Hosts locked for the duration of update, waiting for jobs using them to
+    complete.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param new_hosts: (dict) Nornir Host objects keyed by host name to add or update
+    :param removed: (list) names of hosts to remove
+    """
+    inventory = wkr_data["nr"].inventory
+    hosts_to_lock = set(removed) | {h for h in new_hosts if h in inventory.hosts}
+    _lock_hosts(wkr_data, hosts_to_lock)
+    try:
+        # modify a copy to not change hosts dictionary jobs iterate over
+        hosts = Hosts(inventory.hosts)
+        for host_name in removed:
+            host = hosts.pop(host_name, None)
+            if host is not None:
+                host.close_connections()
+            wkr_data["worker_connections"].pop(host_name, None)
+        for host_name, host in new_hosts.items():
+            new_host = _clone_inventory_element(
+                host, Host, inventory.groups, inventory.defaults
+            )
+            old_host = hosts.get(host_name)
+            if old_host is not None:
+                for conn_name in list(old_host.connections.keys()):
+                    if (
+                        old_host.get_connection_parameters(conn_name).dict()
+                        == new_host.get_connection_parameters(conn_name).dict()
+                    ):
+                        new_host.connections[conn_name] = old_host.connections.pop(
+                            conn_name
+                        )
+                    else:
+                        old_host.close_connection(conn_name)
+                if not new_host.connections:
+                    wkr_data["worker_connections"].pop(host_name, None)
+            hosts[host_name] = new_host
+        inventory.hosts = hosts
+    finally:
+        _unlock_hosts(wkr_data, hosts_to_lock)
+
+
 def _rm_tasks_data_from_hosts(hosts):
     """
     Helper function to remove __task__ and job_data data from hosts
@@ -1650,26 +5159,40 @@ def _add_hosts_failed_prep_to_result(agg_result, hosts_failed_prep):
         )
 
 
-def _update_nornir_worker_stats(wkr_data, nr_results):
+def _update_nornir_worker_stats(wkr_data, nr_results, nr):
     """
     Helper function to calculate tasks stats.
 
     :param wkr_data: (dict) Nornir worker dictionary
     :param nr_results: (obj) Nornir AggregatedResult object
+    :param nr: (obj) Nornir object job ran with
     """
-    wkr_data["worker_hosts_tasks_failed"] += len(wkr_data["nr"].data.failed_hosts)
+    wkr_data["worker_hosts_tasks_failed"] += len(nr.data.failed_hosts)
     for hostname, results in nr_results.items():
-        for i in results:
-            if i.exception or i.failed:
-                wkr_data["worker_tasks_failed"] += 1
-            elif (
-                isinstance(i.result, str)
-                and "Traceback (most recent call last)" in i.result
-            ):
-                wkr_data["worker_tasks_failed"] += 1
-            # dont count tasks with skip_results flag
-            elif not (hasattr(i, "skip_results") and i.skip_results is True):
-                wkr_data["worker_tasks_completed"] += 1
+        _update_host_tasks_stats(wkr_data, results)
+
+
+def _update_host_tasks_stats(wkr_data, results):
+    """
+    Helper function to calculate single host tasks stats.
+
+    :param wkr_data: (dict) Nornir worker dictionary
+    :param results: (obj) Nornir MultiResult object
+    """
+    for i in results:
+        # dont count placeholders of already streamed results
+        if getattr(i, "streamed", False) is True:
+            continue
+        elif i.exception or i.failed:
+            wkr_data["worker_tasks_failed"] += 1
+        elif (
+            isinstance(i.result, str)
+            and "Traceback (most recent call last)" in i.result
+        ):
+            wkr_data["worker_tasks_failed"] += 1
+        # dont count tasks with skip_results flag
+        elif not (hasattr(i, "skip_results") and i.skip_results is True):
+            wkr_data["worker_tasks_completed"] += 1
 
 
 # -----------------------------------------------------------------------------
@@ -1702,7 +5225,17 @@ def list_hosts(**kwargs):
     return InventoryFun(filtered_hosts, call="list_hosts", **kwargs)
 
 
-def run(task, loader, identity, name, nr, wkr_data, **kwargs):
+def run(
+    task,
+    loader,
+    identity,
+    name,
+    nr,
+    wkr_data,
+    reply_conn=None,
+    cancel_event=None,
+    **kwargs,
+):
     """
     Function for worker Thread to run Nornir tasks.
 
@@ -1712,7 +5245,12 @@ def run(task, loader, identity, name, nr, wkr_data, **kwargs):
     :param kwargs: (dict) passed to ``task.run`` after extracting CLI arguments
     :param name: (str) Nornir task name to run
     :param nr: (obj) Worker instance Nornir object
+    :param reply_conn: (obj) job's reply connection to stream hosts results over
+    :param cancel_event: (obj) ``threading.Event`` set when job cancelled, hosts
+        that did not start running the task yet skipped
     """
+    run_start = timer = time.time()
+    timing = {}
     # extract attributes
     add_details = kwargs.pop("add_details", False)  # ResultSerializer
     to_dict = kwargs.pop("to_dict", True)  # ResultSerializer
@@ -1729,7 +5267,31 @@ def run(task, loader, identity, name, nr, wkr_data, **kwargs):
     event_failed = kwargs.pop("event_failed", False)  # events
     hcache = kwargs.pop("hcache", False)  # cache task results
     dcache = kwargs.pop("dcache", False)  # cache task results
-    hosts_failed_prep = {}
+    cache_ttl = kwargs.pop("cache_ttl", None)  # cached task results TTL
+    cache = kwargs.pop("cache", False)  # serve commands results from cache
+    render_workers = int(
+        kwargs.pop("render_workers", nornir_data.get("render_workers", 0)) or 0
+    )  # rendering processes
+    stream = kwargs.pop("stream", False) and reply_conn is not None  # stream results
+    add_timing = kwargs.pop("timing", False)  # phases timing
+    host_batch_size = int(kwargs.pop("host_batch_size", 0) or 0)  # hosts batches
+
+    # remove expired hcache and dcache results
+    _results_cache_purge()
+
+    # commands results only cached for functions that do not change devices
+    if cache and not _is_job_read_only({"identity": identity, "kwargs": kwargs}):
+        raise CommandExecutionError(
+            "Nornir-proxy 'cache' argument only supported by read-only functions "
+            "e.g. nr.cli or nr.nc get_config"
+        )
+
+    # streamed results never accumulated, hence can't be post-processed
+    if stream and any([table, dump, hcache, dcache]):
+        raise CommandExecutionError(
+            "Nornir-proxy 'stream' argument not supported together with "
+            "'table', 'dump', 'hcache' or 'dcache' arguments"
+        )
 
     # add tf_index_lock to control tf index access
     if "tf_index_lock" in kwargs:
@@ -1739,25 +5301,46 @@ def run(task, loader, identity, name, nr, wkr_data, **kwargs):
     if nr.config.runner.plugin != "RetryRunner":
         _ = kwargs.pop("connection_name", None)
 
-    # set dry_run argument
-    nr.data.dry_run = kwargs.get("dry_run", False)
-
-    # reset failed hosts if any
-    nr.data.reset_failed_hosts()
+    # use dedicated global state with dry_run argument and failed hosts for
+    # this job to not interfere with other jobs running on the same worker
+    nr = nr.__class__(
+        **{**nr.__dict__, "data": GlobalState(dry_run=kwargs.get("dry_run", False))}
+    )
 
     # download files
     if download:
+        timer = time.time()
         _download_files(download, kwargs, loader=loader)
+        timer = _record_phase_timing(timing, "download_files", timer)
 
     # add processors
     nr_with_processors = _add_processors(
         kwargs, loader=loader, identity=identity, nr=nr, worker_id=wkr_data["worker_id"]
     )
 
+    # send hosts results as soon as they complete, this processor must be the
+    # last one to receive fully processed results
+    if stream:
+        nr_with_processors = nr_with_processors.with_processors(
+            list(nr_with_processors.processors)
+            + [
+                _StreamResultsProcessor(
+                    job={"identity": identity, "reply_conn": reply_conn},
+                    wkr_data=wkr_data,
+                    to_dict=to_dict,
+                    add_details=add_details,
+                    event_failed=event_failed,
+                )
+            ]
+        )
+
+    timer = _record_phase_timing(timing, "add_processors", timer)
+
     # Filter hosts to run tasks for
     hosts, has_filter = FFun(
         nr_with_processors, kwargs=kwargs, check_if_has_filter=True
     )
+    timer = _record_phase_timing(timing, "filter_hosts", timer)
 
     # check if nornir_filter_required is True but no filter
     if nornir_data["nornir_filter_required"] is True and has_filter is False:
@@ -1765,55 +5348,133 @@ def run(task, loader, identity, name, nr, wkr_data, **kwargs):
             "Nornir-proxy 'nornir_filter_required' setting is True but no filter provided"
         )
 
-    # download and render files
-    if render:
-        hosts_failed_prep = _download_and_render_files(
-            hosts, render, kwargs, ignore_keys=download, loader=loader
-        )
-
-    # update hosts connections ages
-    _update_worker_connections(hosts, wkr_data)
-
-    # exclude hosts that failed prep steps
-    hosts = FFun(hosts, FL=list(hosts_failed_prep.keys()), FN=True)
-
-    # run tasks
-    result = hosts.run(
-        task, name=name, **{k: v for k, v in kwargs.items() if not k.startswith("_")}
-    )
-
-    # add back hosts that failed prep but with error message
-    _add_hosts_failed_prep_to_result(result, hosts_failed_prep)
+    # serve commands results from cache if requested to do so
+    if cache:
+        task = _make_cached_task(task, kwargs, None if cache is True else cache)
 
-    # post clean-up - remove tasks rendered data from hosts inventory
-    if render:
-        _rm_tasks_data_from_hosts(hosts)
+    # skip remaining hosts if job cancelled
+    if cancel_event is not None:
+        task = _make_cancellable_task(task, cancel_event)
 
-    # fire events for failed tasks if requested to do so
-    if event_failed:
-        _fire_events(result, loader=loader)
+    # split hosts in batches to limit amount of results held in memory
+    hosts_names = list(hosts.inventory.hosts.keys())
+    if host_batch_size and len(hosts_names) > host_batch_size:
+        batches = [
+            hosts_names[i : i + host_batch_size]
+            for i in range(0, len(hosts_names), host_batch_size)
+        ]
+    else:
+        batches = [None]
+
+    ret, hosts_failed_prep_all = None, []
+    for batch in batches:
+        batch_hosts = hosts if batch is None else FFun(hosts, FL=batch)
+        # rendering removes render keys from kwargs, use a copy for each batch
+        batch_kwargs = kwargs if batch is None else dict(kwargs)
+        hosts_failed_prep = {}
+
+        # download and render files
+        if render:
+            timer = time.time()
+            hosts_failed_prep = _download_and_render_files(
+                batch_hosts,
+                render,
+                batch_kwargs,
+                ignore_keys=download,
+                render_workers=render_workers,
+                loader=loader,
+            )
+            timer = _record_phase_timing(timing, "download_and_render_files", timer)
+
+        # update hosts connections ages
+        _update_worker_connections(batch_hosts, wkr_data)
+
+        # exclude hosts that failed prep steps
+        batch_hosts = FFun(batch_hosts, FL=list(hosts_failed_prep.keys()), FN=True)
+        hosts_failed_prep_all.extend(hosts_failed_prep.keys())
+
+        # run tasks
+        timer = time.time()
+        if batch is None or batch is batches[0]:
+            _observe_latency("prep", identity, wkr_data["worker_id"], timer - run_start)
+        result = batch_hosts.run(
+            task,
+            name=name,
+            **{k: v for k, v in batch_kwargs.items() if not k.startswith("_")},
+        )
+        timer = _record_phase_timing(timing, "run_tasks", timer)
+
+        # add back hosts that failed prep but with error message
+        _add_hosts_failed_prep_to_result(result, hosts_failed_prep)
+
+        # post clean-up - remove tasks rendered data from hosts inventory
+        if render:
+            _rm_tasks_data_from_hosts(batch_hosts)
+
+        # fire events for failed tasks if requested to do so, streamed
+        # hosts' placeholders skipped as their events fired already
+        if event_failed:
+            _fire_events(result, loader=loader)
+
+        # calculate task stats
+        _update_nornir_worker_stats(wkr_data, result, nr)
+
+        # form return results, batches results tabulated once all batches completed
+        timer = time.time()
+        if table and batch is None:
+            ret = TabulateFormatter(
+                result,
+                tabulate=table,
+                headers=headers,
+                headers_exclude=headers_exclude,
+                sortby=sortby,
+                reverse=reverse,
+            )
+        elif table:
+            ret = (ret or []) + ResultSerializer(
+                result, add_details=True, to_dict=False
+            )
+        elif batch is None:
+            ret = ResultSerializer(result, to_dict=to_dict, add_details=add_details)
+        else:
+            ret = _merge_streamed_output(
+                ret if ret is not None else ({} if to_dict else []),
+                ResultSerializer(result, to_dict=to_dict, add_details=add_details),
+            )
+        timer = _record_phase_timing(timing, "form_results", timer)
+        del result
 
-    # calculate task stats
-    _update_nornir_worker_stats(wkr_data, result)
+    # exclude hosts that failed prep steps from results caching
+    if hosts_failed_prep_all:
+        hosts = FFun(hosts, FL=hosts_failed_prep_all, FN=True)
 
-    # form return results
-    if table:
+    if table and batches[0] is not None:
+        timer = time.time()
         ret = TabulateFormatter(
-            result,
+            ret,
             tabulate=table,
             headers=headers,
             headers_exclude=headers_exclude,
             sortby=sortby,
             reverse=reverse,
         )
-    else:
-        ret = ResultSerializer(result, to_dict=to_dict, add_details=add_details)
+        timer = _record_phase_timing(timing, "form_results", timer)
+    _observe_latency("execution", identity, wkr_data["worker_id"], timing["run_tasks"])
+    _observe_latency(
+        "serialization", identity, wkr_data["worker_id"], timing["form_results"]
+    )
 
     # check if need to cache task results to inventory data
     if hcache:
-        _cache_task_results_to_host_data(hosts, ret, hcache)
+        _cache_task_results_to_host_data(hosts, ret, hcache, cache_ttl)
+        _record_worker_process_mutation(
+            "hcache", list(hosts.inventory.hosts), ret, hcache, cache_ttl
+        )
     if dcache:
-        _cache_all_task_results_to_defaults_data(ret, dcache)
+        _cache_all_task_results_to_defaults_data(ret, dcache, cache_ttl)
+        _record_worker_process_mutation("dcache", ret, dcache, cache_ttl)
+    if hcache or dcache:
+        timer = _record_phase_timing(timing, "cache_results", timer)
 
     # save all results to file
     if dump:
@@ -1825,11 +5486,123 @@ def run(task, loader, identity, name, nr, wkr_data, **kwargs):
             max_files=nornir_data["files_max_count"],
             proxy_id=nornir_data["stats"]["proxy_minion_id"],
         )
+        timer = _record_phase_timing(timing, "dump_results", timer)
+
+    # add phases timing to results
+    if add_timing:
+        timing["total"] = round(time.time() - run_start, 6)
+        ret = {"results": ret, "_timing": timing}
 
     return ret
 
 
-def execute_job(task_fun, kwargs, identity):
+def _record_phase_timing(timing, phase, timer):
+    """
+    Helper function to record how long job phase took.
+
+    :param timing: (dict) dictionary to record phase duration in, durations of
+        the same phase repeated several times e.g. for each hosts batch added up
+    :param phase: (str) phase name
+    :param timer: (float) phase start time
+    :return: current time to use as next phase start time
+    """
+    now = time.time()
+    timing[phase] = round(timing.get(phase, 0) + now - timer, 6)
+    return now
+
+
+def _merge_streamed_output(streamed, output):
+    """
+    Helper function to merge chunk of streamed job results with results
+    collected so far.
+
+    :param streamed: (dict, list or None) job results collected so far
+    :param output: (any) chunk of job results
+    :return: merged job results
+    """
+    # final results with phases timing, merge streamed results into them
+    if isinstance(output, dict) and set(output) == {"results", "_timing"}:
+        return {
+            "results": _merge_streamed_output(streamed, output["results"]),
+            "_timing": output["_timing"],
+        }
+    elif isinstance(streamed, dict) and isinstance(output, dict):
+        for host_name, host_results in output.items():
+            streamed.setdefault(host_name, {}).update(host_results)
+        return streamed
+    elif isinstance(streamed, list) and isinstance(output, list):
+        streamed.extend(output)
+        return streamed
+    # output is not a results chunk e.g. error string
+    return output
+
+
+def _wait_job_result(reply_conn, identity):
+    """
+    Helper function to wait for job results to arrive over reply connection.
+
+    Streamed job results arrive in chunks, chunks merged together until
+    final results message received.
+
+    :param reply_conn: (obj) receiving end of job's reply connection
+    :param identity: (dict) job identity dictionary
+    :return: job results dictionary with ``output`` and ``identity`` keys
+    """
+    streamed = None
+    start_time = time.time()
+    try:
+        while reply_conn.poll(
+            max(nornir_data["job_wait_timeout"] - (time.time() - start_time), 0)
+        ):
+            res = _load_job_result(reply_conn.recv())
+            if res.get("busy"):
+                raise CommandExecutionError(res["output"])
+            if streamed is not None:
+                res["output"] = _merge_streamed_output(streamed, res["output"])
+            if not res.get("partial"):
+                return res
+            streamed = res["output"]
+    except (EOFError, OSError):
+        raise CommandExecutionError(
+            f"Nornir-proxy failed job '{identity}', reply connection closed "
+            f"while main process refreshing, traceback:\n{traceback.format_exc()}"
+        )
+    raise TimeoutError(
+        "Nornir-proxy MAIN PID {}, identity '{}', {}s job_wait_timeout expired.".format(
+            os.getpid(), identity, nornir_data["job_wait_timeout"]
+        )
+    )
+
+
+def _get_job_function_name(identity):
+    """
+    Helper function to get name of execution module function that
+    submitted the job.
+
+    :param identity: (dict) job identity dictionary
+    :return: function name string e.g. ``nr.cli``
+    """
+    function_name = identity.get("function") or ""
+    if function_name.startswith("exec."):
+        function_name = function_name[len("exec.") :]
+    return function_name
+
+
+def _get_job_priority(identity):
+    """
+    Helper function to get default job priority for execution module function
+    using ``jobs_priority`` proxy setting.
+
+    :param identity: (dict) job identity dictionary
+    :return: integer priority value
+    """
+    return nornir_data["jobs_priority"].get(
+        _get_job_function_name(identity),
+        nornir_data["jobs_priority"].get("default", 5),
+    )
+
+
+def execute_job(task_fun, kwargs, identity, priority=None):
     """
     Function to submit job request to Nornir Proxy minion jobs queue,
     wait for job to be completed and return results.
@@ -1837,112 +5610,149 @@ def execute_job(task_fun, kwargs, identity):
     :param task_fun: (str) name of nornir task function/plugin to import and run
     :param kwargs: (dict) any arguments to submit to Nornir task ``**kwargs``
     :param identity: (dict) dictionary of uuid4, jid, function_name keys
+    :param priority: (int) job priority, jobs with lower value run first, if not
+        given sourced from ``priority`` kwargs argument or from ``jobs_priority``
+        proxy setting for execution module function that submitted the job
+
+    ``identity`` parameter used to identify job results and must be unique
+    for each submitted job.
+
+    Each job carries sending end of a dedicated one-way pipe, worker thread
+    sends job results straight into that pipe, as a result waiting for
+    job results does not depend on the number of other jobs in flight.
+
+    Jobs placed in the jobs queue, dispatcher thread in the main process
+    moves them to in-process pending jobs queues and wakes up idle worker
+    threads to run them straight away.
 
-    ``identity`` parameter used to identify job results in results queue and
-    must be unique for each submitted job.
+    If ``async`` argument is True, job handle returned straight away without
+    waiting for job to complete, job results kept in the main process results
+    store until retrieved using ``job_result`` job with ``handle`` argument.
     """
+    priority = kwargs.pop("priority", priority)
+    if priority is None:
+        priority = _get_job_priority(identity)
+    run_async = kwargs.pop("async", False)
+    queued_timestamp = time.time()
+    if run_async and kwargs.get("worker") == "all":
+        raise CommandExecutionError(
+            "Nornir-proxy 'async' argument not supported together with worker='all'"
+        )
     # broadcast job to all nornir workers
     if kwargs.get("worker") == "all":
         _ = kwargs.pop("worker")
-        identities = []
-        results = []
+        reply_conns = {}
         # add jobs to the queue for each worker
         for nr in nornir_data["nrs"]:
             # make sure each worker receives its own copy of identity and kwargs
             job_identity = copy.deepcopy(identity)
             job_kwargs = copy.deepcopy(kwargs)
             job_identity["worker"] = nr["worker_id"]
-            identities.append(job_identity)
-            nr["worker_jobs_queue"].put(
+            reply_recv, reply_send = multiprocessing.Pipe(duplex=False)
+            reply_conns[reply_recv] = (job_identity, reply_send)
+            nornir_data["jobs_queue"].put(
                 {
                     "task_fun": task_fun,
                     "kwargs": job_kwargs,
                     "identity": job_identity,
                     "name": task_fun,
+                    "reply_conn": reply_send,
+                    "worker": nr["worker_id"],
+                    "priority": int(priority),
+                    "queued_timestamp": queued_timestamp,
                 }
             )
         # wait for jobs to complete and return results
-        start_time = time.time()
-        while (time.time() - start_time) < nornir_data["job_wait_timeout"]:
-            time.sleep(0.1)
-            try:
-                res = nornir_data["res_queue"].get(block=True, timeout=0.1)
-                if res["identity"] in identities:
-                    results.append(res)
-                else:
-                    nornir_data["res_queue"].put(res)
-            except queue.Empty:
-                continue
-            except OSError:
-                raise CommandExecutionError(
-                    f"Nornir-proxy failed all-workers-job '{identity}', jobs queues closed "
-                    f"while main process refreshing, traceback:\n{traceback.format_exc()}"
-                )
-            # check if collected results from all workers
-            if len(results) == nornir_data["nornir_workers"]:
-                break
-        else:
-            raise TimeoutError(
-                "Nornir-proxy MAIN PID {}, identities '{}', {}s job_wait_timeout expired.".format(
-                    os.getpid(), identities, nornir_data["job_wait_timeout"]
+        results = []
+        streamed = {}
+        try:
+            pending = list(reply_conns.keys())
+            start_time = time.time()
+            while pending:
+                time_left = nornir_data["job_wait_timeout"] - (time.time() - start_time)
+                ready = multiprocessing.connection.wait(
+                    pending, timeout=max(time_left, 0)
                 )
-            )
+                if not ready:
+                    raise TimeoutError(
+                        "Nornir-proxy MAIN PID {}, identities '{}', {}s job_wait_timeout expired.".format(
+                            os.getpid(),
+                            [i[0] for i in reply_conns.values()],
+                            nornir_data["job_wait_timeout"],
+                        )
+                    )
+                for reply_recv in ready:
+                    try:
+                        res = _load_job_result(reply_recv.recv())
+                    except (EOFError, OSError):
+                        raise CommandExecutionError(
+                            f"Nornir-proxy failed all-workers-job '{identity}', reply connection closed "
+                            f"while main process refreshing, traceback:\n{traceback.format_exc()}"
+                        )
+                    if res.get("busy"):
+                        raise CommandExecutionError(res["output"])
+                    if reply_recv in streamed:
+                        res["output"] = _merge_streamed_output(
+                            streamed[reply_recv], res["output"]
+                        )
+                    if res.get("partial"):
+                        streamed[reply_recv] = res["output"]
+                    else:
+                        pending.remove(reply_recv)
+                        results.append(res)
+        finally:
+            for reply_recv, (job_identity, reply_send) in reply_conns.items():
+                reply_recv.close()
+                reply_send.close()
         return {
             "nornir-worker-{}".format(r["identity"]["worker"]): r["output"]
             for r in results
         }
-    # submit job to certain worker's queue only
-    elif kwargs.get("worker"):
+
+    reply_recv, reply_send = multiprocessing.Pipe(duplex=False)
+    job = {
+        "task_fun": task_fun,
+        "kwargs": kwargs,
+        "identity": identity,
+        "name": task_fun,
+        "reply_conn": reply_send,
+        "worker": None,
+        "priority": int(priority),
+        "queued_timestamp": queued_timestamp,
+    }
+    # submit job to certain worker only
+    if kwargs.get("worker"):
         if kwargs["worker"] not in list(range(1, len(nornir_data["nrs"]) + 1)):
+            reply_recv.close()
+            reply_send.close()
             return "Error: Non existing worker '{}'; worker IDs 1 - {}".format(
                 kwargs["worker"], len(nornir_data["nrs"])
             )
-        nr = nornir_data["nrs"][kwargs.pop("worker") - 1]
-        identity["worker"] = nr["worker_id"]
-        # add job to the worker queue
-        nr["worker_jobs_queue"].put(
-            {
-                "task_fun": task_fun,
-                "kwargs": kwargs,
-                "identity": identity,
-                "name": task_fun,
-            }
-        )
-    # submit job to shared queue for one of the workers to execute
+        job["worker"] = identity["worker"] = kwargs.pop("worker")
+    # submit job for one of the workers to execute
     else:
         _ = kwargs.pop("worker", None)
-        nornir_data["jobs_queue"].put(
-            {
-                "task_fun": task_fun,
-                "kwargs": kwargs,
-                "identity": identity,
-                "name": task_fun,
-            }
-        )
+    # submit job and return its handle to retrieve results later on
+    if run_async:
+        reply_recv.close()
+        reply_send.close()
+        job["reply_conn"] = None
+        job["async_handle"] = identity["uuid4"]
+        nornir_data["jobs_queue"].put(job)
+        return {
+            "handle": job["async_handle"],
+            "status": "pending",
+            "jid": identity.get("jid"),
+        }
+    nornir_data["jobs_queue"].put(job)
 
     # wait for job to complete and return results
-    start_time = time.time()
-    while (time.time() - start_time) < nornir_data["job_wait_timeout"]:
-        time.sleep(0.1)
-        try:
-            res = nornir_data["res_queue"].get(block=True, timeout=0.1)
-            if res["identity"] == identity:
-                break
-            else:
-                nornir_data["res_queue"].put(res)
-        except queue.Empty:
-            continue
-        except OSError:
-            raise CommandExecutionError(
-                f"Nornir-proxy failed job '{identity}', jobs queues closed "
-                f"while main process refreshing, traceback:\n{traceback.format_exc()}"
-            )
-    else:
-        raise TimeoutError(
-            "Nornir-proxy MAIN PID {}, identity '{}', {}s job_wait_timeout expired.".format(
-                os.getpid(), identity, nornir_data["job_wait_timeout"]
-            )
-        )
+    try:
+        res = _wait_job_result(reply_recv, identity)
+    finally:
+        reply_recv.close()
+        reply_send.close()
+
     return res["output"]
 
 
@@ -1966,7 +5776,8 @@ def stats(*args, **kwargs):
     * ``jobs_completed`` - int, overall number of jobs completed
     * ``jobs_failed``  - int, overall number of jobs failed
     * ``jobs_job_queue_size`` - int, size of jobs queue, indicating number of jobs waiting to start
-    * ``jobs_res_queue_size`` - int, size of results queue, indicating number of results waiting to be collected by child process
+    * ``jobs_res_queue_size`` - int, size of results queue, indicating number of results waiting to be collected by child process,
+      only used for jobs submitted without reply connection as other jobs results delivered over dedicated pipe
     * ``tasks_completed`` - overall number of completed Nornir tasks (including subtasks)
     * ``tasks_failed`` - overall number of failed Nornir tasks (including subtasks)
     * ``hosts_count`` - int, number of hosts/devices managed by this proxy minion
@@ -1976,11 +5787,71 @@ def stats(*args, **kwargs):
     * ``watchdog_runs`` - int, overall number of watchdog thread runs
     * ``watchdog_child_processes_killed`` - int, number of stale child processes killed by watchdog
     * ``watchdog_dead_connections_cleaned`` - int, number of stale hosts' connections cleaned by watchdog
+    * ``watchdog_pass_duration`` - float, seconds it took last watchdog run to complete, excluding
+      connections keepalive checks that run in background
+    * ``watchdog_keepalive_pass_duration`` - float, seconds it took last connections keepalive pass to
+      check all hosts including jitter delays
     * ``child_processes_count`` - int, number of child processes currently running
     * ``main_process_fd_count`` - int, number of file descriptors in use by main proxy minion process
     * ``main_process_fd_limit`` - int, fd count limit imposed by Operating System for minion process
+    * ``jobs_queue_wait`` - dictionary keyed by job priority with number of jobs started, average, maximum and
+      total time in seconds jobs spent waiting in queue
+    * ``nornir_workers_init_ram_usage_mbyte`` - int, RAM used by Nornir workers instances on last initialization,
+      compare it with ``nornir_workers_share_inventory`` set to True and False to see inventory sharing effect
+    * ``jobs_affinity_scheduled`` - int, number of jobs scheduled using ``affinity`` jobs scheduling
+    * ``jobs_affinity_hits`` - int, number of jobs sent to worker that had connections to some of job's hosts
+    * ``jobs_affinity_hit_rate`` - float, ratio of ``jobs_affinity_hits`` to ``jobs_affinity_scheduled``
+    * ``hosts_affinity_targeted`` - int, overall number of hosts targeted by jobs scheduled using ``affinity``
+    * ``hosts_affinity_warm`` - int, overall number of targeted hosts selected worker had connections to
+    * ``hosts_affinity_hit_rate`` - float, ratio of ``hosts_affinity_warm`` to ``hosts_affinity_targeted``
+    * ``jobs_affinity_taken_over`` - int, number of ``affinity`` jobs taken over by idle worker after waiting
+      for busy worker they were sent to for longer than ``jobs_affinity_max_wait``
+    * ``jobs_results_spilled`` - int, overall number of job results delivered using spill files as they were
+      bigger than ``results_spill_threshold_mbyte``
+    * ``jobs_results_spill_files_purged`` - int, number of spill files removed by watchdog as their job results
+      were never collected
+    * ``render_templates_cache_hits`` - int, number of times compiled Jinja2 template was found in templates cache
+    * ``render_templates_cache_misses`` - int, number of times Jinja2 template had to be compiled
+    * ``file_download_cache_hits`` - int, number of files content served from download cache within its TTL
+    * ``file_download_cache_misses`` - int, number of files downloaded from master or other URLs
+    * ``file_download_cache_revalidated`` - int, number of cached ``salt://`` files found unchanged on master
+      after cache TTL expired
+    * ``results_cache_entries`` - int, number of ``hcache`` and ``dcache`` entries in shared results cache
+    * ``results_cache_size_mbyte`` - float, size of ``hcache`` and ``dcache`` shared results cache
+    * ``results_cache_evicted`` - int, number of results cache entries evicted due to ``results_cache_max_mbyte``
+    * ``results_cache_expired`` - int, number of results cache entries removed after their TTL expired
+    * ``commands_cache_hits`` - int, number of hosts' commands results served from cache by ``cache`` argument
+    * ``commands_cache_misses`` - int, number of hosts' commands results not found in cache and retrieved from devices
+    * ``commands_cache_hit_rate`` - float, ratio of ``commands_cache_hits`` to total number of cache lookups
+    * ``nornir_workers_scale_ups`` - int, number of Nornir workers added by autoscaling
+    * ``nornir_workers_scale_downs`` - int, number of idle Nornir workers removed by autoscaling
+    * ``nornir_workers_last_scaling`` - dictionary with last autoscaling ``action``, ``reason``, resulting
+      number of ``workers`` and ``timestamp``
+    * ``nornir_workers_processes_started`` - int, number of Nornir worker processes started, including
+      processes restarted after they exited, only used if ``worker_mode`` is ``process``
+    * ``jobs_rejected`` - int, number of jobs rejected due to ``jobs_queue_max_depth`` or ``jobs_queue_max_wait``
+    * ``jobs_queue_estimated_wait`` - float, estimated number of seconds new job would wait in queue
+    * ``jobs_coalesced`` - int, number of read-only jobs that received results of identical in-flight job
+    * ``jobs_cancelled`` - int, number of queued or running jobs cancelled using ``nr.nornir cancel``
+    * ``async_jobs_submitted`` - int, number of jobs submitted with ``async`` argument
+    * ``async_results_stored`` - int, number of ``async`` jobs pending or completed results in results store
+    * ``async_results_size_mbyte`` - float, overall size of ``async`` jobs results kept in memory
+    * ``async_results_evicted`` - int, number of not retrieved ``async`` jobs results evicted from results store
+
+    If ``stat`` is ``histograms``, returns string with ``salt_nornir_job_phase_duration_seconds``
+    histograms in Prometheus text exposition format, histograms labelled by job phase, execution
+    module function name and Nornir worker ID. Supported phases:
+
+    * ``queue_wait`` - time job spent waiting in jobs queue before worker picked it up
+    * ``prep`` - time spent downloading and rendering files, adding processors and filtering hosts
+    * ``execution`` - time spent running task against devices
+    * ``serialization`` - time spent forming job results using ``ResultSerializer`` or ``TabulateFormatter``
+    * ``delivery`` - time spent sending job results to the process that submitted the job
     """
     stat = args[0] if args else kwargs.get("stat", None)
+    # return latency histograms in Prometheus text format
+    if stat == "histograms":
+        return _format_histograms()
     # get File Descriptors limit and usage
     try:
         if HAS_RESOURCE_LIB:
@@ -1989,6 +5860,7 @@ def stats(*args, **kwargs):
     except:
         fd_count = -1
         fd_limit = -1
+    _, estimated_wait = _estimate_queue_wait()
     # update stats
     nornir_data["stats"].update(
         {
@@ -1996,15 +5868,29 @@ def stats(*args, **kwargs):
             "main_process_fd_count": fd_count,
             "main_process_fd_limit": fd_limit,
             "timestamp": time.ctime(),
-            "jobs_job_queue_size": nornir_data["jobs_queue"].qsize(),
+            "jobs_job_queue_size": nornir_data["jobs_queue"].qsize()
+            + len(nornir_data["jobs_pending"]),
             "jobs_res_queue_size": nornir_data["res_queue"].qsize(),
             "child_processes_count": len(multiprocessing.active_children()),
+            "jobs_queue_estimated_wait": estimated_wait,
+            "results_cache_entries": len(nornir_data["results_cache"]),
+            "async_results_stored": len(nornir_data["async_results"]),
+            "async_results_size_mbyte": sum(
+                e["size"] for e in list(nornir_data["async_results"].values())
+            )
+            / 1024000,
+            "results_cache_size_mbyte": nornir_data["results_cache_size"] / 1024000,
             "hosts_connections_active": sum(
                 [
                     len(host.connections)
                     for nr in nornir_data["nrs"]
                     for host in nr["nr"].inventory.hosts.values()
                 ]
+                + [
+                    len(nr["worker_connections"])
+                    for nr in nornir_data["nrs"]
+                    if nr.get("worker_process")
+                ]
             ),
             "hosts_connections_idle_timeout": nornir_data["connections_idle_timeout"],
             "main_process_uptime_seconds": round(
@@ -2023,8 +5909,31 @@ def stats(*args, **kwargs):
             "hosts_tasks_failed": sum(
                 [w["worker_hosts_tasks_failed"] for w in nornir_data["nrs"]]
             ),
+            "jobs_affinity_hit_rate": round(
+                nornir_data["stats"]["jobs_affinity_hits"]
+                / (nornir_data["stats"]["jobs_affinity_scheduled"] or 1),
+                3,
+            ),
+            "hosts_affinity_hit_rate": round(
+                nornir_data["stats"]["hosts_affinity_warm"]
+                / (nornir_data["stats"]["hosts_affinity_targeted"] or 1),
+                3,
+            ),
+            "commands_cache_hit_rate": round(
+                nornir_data["stats"]["commands_cache_hits"]
+                / (
+                    nornir_data["stats"]["commands_cache_hits"]
+                    + nornir_data["stats"]["commands_cache_misses"]
+                    or 1
+                ),
+                3,
+            ),
         }
     )
+    for wait_stats in nornir_data["stats"]["jobs_queue_wait"].values():
+        wait_stats["avg_seconds"] = round(
+            wait_stats["total_seconds"] / (wait_stats["jobs"] or 1), 3
+        )
     # check if need to return single stat
     if isinstance(stat, str):
         try:
@@ -2160,6 +6069,10 @@ def workers_utils(call):
        * ``worker_jobs_queue`` - size of the worker specific jobs queue
        * ``worker_hosts_tasks_failed`` - counter of overall host failed tasks
        * ``worker_jobs_started`` - counter of started jobs
+       * ``worker_affinity_hits`` - counter of jobs sent to this worker by ``affinity``
+         jobs scheduling because of connections it had to job's hosts
+       * ``worker_process_pid`` - PID of Nornir worker process if ``worker_mode`` is ``process``,
+         None otherwise
 
     """
     supported_calls = ["stats"]
@@ -2182,9 +6095,15 @@ def workers_utils(call):
                 "worker_tasks_completed": w["worker_tasks_completed"],
                 "worker_tasks_failed": w["worker_tasks_failed"],
                 "worker_connections": worker_connections,
-                "worker_jobs_queue": w["worker_jobs_queue"].qsize(),
+                "worker_jobs_queue": len(w["worker_jobs_pending"]),
                 "worker_hosts_tasks_failed": w["worker_hosts_tasks_failed"],
                 "worker_jobs_started": w["worker_jobs_started"],
+                "worker_affinity_hits": w["worker_affinity_hits"],
+                "worker_process_pid": (
+                    w["worker_process"]["process"].pid
+                    if w.get("worker_process")
+                    else None
+                ),
             }
         return ret
     else:
@@ -2204,21 +6123,22 @@ def queues_utils(call):
     Supported calls:
 
     * ``results_queue_dump`` - drain items from result queue and return their content,
-        put items copies back into the queue afterwards
+        put items back into the queue afterwards, results saved in spill files loaded
+        without removing spill files
     """
     supported_calls = ["results_queue_dump"]
     if call == "results_queue_dump":
-        ret = []
+        items = []
         # drain items from results queue
         while True:
             try:
-                ret.append(nornir_data["res_queue"].get(block=True, timeout=0.5))
+                items.append(nornir_data["res_queue"].get(block=True, timeout=0.5))
             except queue.Empty:
                 break
-        # put drained items copies back into the queue
-        for i in ret:
-            nornir_data["res_queue"].put(copy.deepcopy(i))
-        return ret
+        # put drained items back into the queue
+        for i in items:
+            nornir_data["res_queue"].put(i)
+        return [_load_job_result(pickle.loads(i), remove=False) for i in items]
     else:
         raise CommandExecutionError(
             "Nornir-proxy queues_utils unsupported call - '{}', supported - '{}'".format(
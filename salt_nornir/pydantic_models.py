@@ -13,6 +13,7 @@ from pydantic import (
     root_validator,
     StrictBool,
     StrictInt,
+    StrictFloat,
     StrictStr,
     conlist,
 )
@@ -44,8 +45,13 @@ class EnumExecTTPStructTypes(str, Enum):
 
 class ModelExecCommonArgs(model_ffun_fx_filters):
     render: Optional[Union[List[StrictStr], StrictStr]] = None
+    render_workers: Optional[StrictInt] = None
+    async_: Optional[StrictBool] = Field(None, alias="async")
+    cache: Optional[Union[StrictBool, StrictInt]] = None
+    coalesce: Optional[StrictBool] = None
     context: Optional[Dict] = None
     dcache: Optional[Union[StrictStr, StrictBool]] = None
+    cache_ttl: Optional[StrictInt] = None
     defaults: Optional[Dict] = None
     diff: Optional[StrictStr] = None
     dp: Optional[Union[StrictStr, List[Union[StrictStr, Dict]]]] = None
@@ -54,6 +60,7 @@ class ModelExecCommonArgs(model_ffun_fx_filters):
     event_failed: Optional[StrictBool] = None
     event_progress: Optional[StrictBool] = None
     hcache: Optional[Union[StrictStr, StrictBool]] = None
+    host_batch_size: Optional[StrictInt] = None
     iplkp: Optional[StrictStr] = None
     jmespath: Optional[StrictStr] = None
     match: Optional[StrictStr] = None
@@ -85,6 +92,9 @@ class ModelExecCommonArgs(model_ffun_fx_filters):
     xml_flake: Optional[StrictStr] = None
     xpath: Optional[StrictStr] = None
     worker: Optional[Union[StrictInt, StrictStr]] = None
+    priority: Optional[StrictInt] = None
+    stream: Optional[StrictBool] = None
+    timing: Optional[StrictBool] = None
     job_data: Optional[Union[StrictStr, List, Dict]] = None
 
 
@@ -431,6 +441,10 @@ class EnumNrFun(str, Enum):
     fun_connect = "connect"
     fun_clear_hcache = "clear_hcache"
     fun_clear_dcache = "clear_dcache"
+    fun_clear_task_cache = "clear_task_cache"
+    fun_jobs = "jobs"
+    fun_cancel = "cancel"
+    fun_job_result = "job_result"
     fun_workers = "workers"
     fun_worker = "worker"
     fun_results_queue_dump = "results_queue_dump"
@@ -442,8 +456,12 @@ class model_exec_nr_nornir_fun(model_ffun_fx_filters):
     args: Optional[List[StrictStr]] = None
     fun: Optional[EnumNrFun] = None
     worker: Optional[Union[StrictInt, StrictStr]] = None
+    priority: Optional[StrictInt] = None
     workers_only: Optional[StrictBool] = None
+    incremental: Optional[StrictBool] = None
     stat: Optional[StrictStr] = None
+    jid: Optional[Union[StrictStr, StrictInt]] = None
+    handle: Optional[StrictStr] = None
 
     class Config:
         extra = "allow"
@@ -767,6 +785,16 @@ class SaltNornirProxyMemAction(str, Enum):
     restart = "restart"
 
 
+class SaltNornirProxyJobsScheduling(str, Enum):
+    first_idle = "first_idle"
+    affinity = "affinity"
+
+
+class SaltNornirProxyWorkerMode(str, Enum):
+    thread = "thread"
+    process = "process"
+
+
 class model_nornir_config_proxy(BaseModel):
     """Model for Salt-Nornir Proxy Minion configuration proxy attributes"""
 
@@ -776,13 +804,40 @@ class model_nornir_config_proxy(BaseModel):
     nornir_filter_required: Optional[StrictBool] = False
     connections_idle_timeout: Optional[StrictInt] = 1
     watchdog_interval: Optional[StrictInt] = 30
+    watchdog_keepalive_workers: Optional[StrictInt] = 10
+    watchdog_keepalive_jitter: Optional[Union[StrictFloat, StrictInt]] = 0.5
     child_process_max_age: Optional[StrictInt] = 660
     job_wait_timeout: Optional[StrictInt] = 600
     memory_threshold_mbyte: Optional[StrictInt] = 300
     memory_threshold_action: Optional[SaltNornirProxyMemAction] = "log"
     files_base_path: Optional[StrictStr] = "/var/salt-nornir/{proxy_id}/files/"
     files_max_count: Optional[StrictInt] = 5
+    results_spill_threshold_mbyte: Optional[StrictInt] = 10
+    render_templates_cache_size: Optional[StrictInt] = 1000
+    render_workers: Optional[StrictInt] = 0
+    file_download_cache_ttl: Optional[StrictInt] = 60
+    file_download_cache_size_mbyte: Optional[StrictInt] = 100
+    results_cache_ttl: Optional[StrictInt] = 0
+    results_cache_max_mbyte: Optional[StrictInt] = 100
+    commands_cache_ttl: Optional[Dict[StrictStr, StrictInt]] = {}
     event_progress_all: Optional[StrictBool] = False
+    jobs_scheduling: Optional[SaltNornirProxyJobsScheduling] = "first_idle"
+    jobs_affinity_max_wait: Optional[StrictInt] = 3
+    worker_jobs_concurrency: Optional[StrictInt] = 1
+    worker_mode: Optional[SaltNornirProxyWorkerMode] = "thread"
+    jobs_queue_max_depth: Optional[StrictInt] = 0
+    jobs_queue_max_wait: Optional[StrictInt] = 0
+    jobs_coalescing: Optional[StrictBool] = False
+    async_results_max_count: Optional[StrictInt] = 1000
+    async_results_max_mbyte: Optional[StrictInt] = 100
+    async_results_ttl: Optional[StrictInt] = 3600
+    nornir_workers_share_inventory: Optional[StrictBool] = False
+    nornir_workers_min: Optional[StrictInt] = None
+    nornir_workers_max: Optional[StrictInt] = None
+    nornir_workers_scale_queue_depth: Optional[StrictInt] = 5
+    nornir_workers_scale_queue_wait: Optional[StrictInt] = 10
+    nornir_workers_scale_cooldown: Optional[StrictInt] = 300
+    jobs_priority: Optional[Dict[StrictStr, StrictInt]] = {}
     nr_cli: Optional[Dict] = {}
     nr_cfg: Optional[Dict] = {}
     nr_nc: Optional[Dict] = {}
@@ -370,6 +370,41 @@ def test_host_results_hcache_clear_all():
 # test_host_results_hcache_clear_all()
 
 
+def test_host_results_hcache_ttl():
+    client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"hcache": "cache_ttl_test", "cache_ttl": 1},
+        tgt_type="glob",
+        timeout=60,
+    )
+    time.sleep(2)
+    # run any other task for proxy minion to remove expired results
+    client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        tgt_type="glob",
+        timeout=60,
+    )
+    inventory = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["inventory"],
+        tgt_type="glob",
+        timeout=60,
+    )
+    stats = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], tgt_type="glob", timeout=60
+    )
+    assert "cache_ttl_test" not in inventory["nrp1"]["hosts"]["ceos1"]["data"]
+    assert "cache_ttl_test" not in inventory["nrp1"]["hosts"]["ceos2"]["data"]
+    assert stats["nrp1"]["results_cache_expired"] >= 2
+
+# test_host_results_hcache_ttl()
+
+
 def test_host_results_hcache_clear_by_key():
     res = client.cmd(
         tgt="nrp1",
@@ -1006,6 +1041,95 @@ def test_connections_idle_timeout(fixture_modify_proxy_pillar):
         
 # test_connections_idle_timeout()
 
+
+@pytest.mark.modify_pillar_target("nrp1")
+@pytest.mark.modify_pillar_pre_add({"worker_jobs_concurrency": 2})
+@pytest.mark.modify_pillar_post_remove(["worker_jobs_concurrency"])
+def test_worker_jobs_concurrency_disjoint_hosts(fixture_modify_proxy_pillar):
+    """
+    Run 10 seconds sleep jobs for ceos1 and ceos2 on the same worker at the
+    same time, both jobs should succeed and run in parallel as their hosts
+    do not overlap, taking less time than running them one after another.
+    """
+    results = {}
+
+    def run_job(host):
+        job_client = salt.client.LocalClient()
+        results[host] = job_client.cmd(
+            tgt="nrp1",
+            fun="nr.task",
+            arg=[],
+            kwarg={
+                "plugin": "nornir_salt.plugins.tasks.sleep",
+                "sleep_for": 10,
+                "FB": host,
+                "worker": 1,
+            },
+            tgt_type="glob",
+            timeout=60,
+        )
+
+    threads = [threading.Thread(target=run_job, args=(h,)) for h in ["ceos1", "ceos2"]]
+    start = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.time() - start
+    pprint.pprint(results)
+    print("elapsed {}s".format(round(elapsed, 1)))
+    for host, res in results.items():
+        assert list(res["nrp1"].keys()) == [host]
+        assert "Traceback" not in str(res["nrp1"][host])
+    assert elapsed < 17, "Jobs did not run in parallel, took {}s".format(elapsed)
+
+# test_worker_jobs_concurrency_disjoint_hosts()
+
+
+@pytest.mark.modify_pillar_target("nrp1")
+@pytest.mark.modify_pillar_pre_add({"results_spill_threshold_mbyte": 1})
+@pytest.mark.modify_pillar_post_remove(["results_spill_threshold_mbyte"])
+def test_large_results_spill_file(fixture_modify_proxy_pillar):
+    """
+    Job results bigger than results_spill_threshold_mbyte should be
+    delivered using spill file without any changes to results content.
+    """
+    stats_before = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={"stat": "jobs_results_spilled"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.task",
+        arg=[],
+        kwarg={
+            "plugin": "nornir_salt.plugins.tasks.nr_test",
+            "ret_data": "x" * 1500000,
+            "FB": "ceos1",
+        },
+        tgt_type="glob",
+        timeout=60,
+    )
+    stats_after = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={"stat": "jobs_results_spilled"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    assert ret["nrp1"]["ceos1"]["nr_test"] == "x" * 1500000
+    assert (
+        stats_after["nrp1"]["jobs_results_spilled"]
+        == stats_before["nrp1"]["jobs_results_spilled"] + 1
+    )
+
+# test_large_results_spill_file()
+
     
 # @pytest.mark.skip(reason="Disabling to check if it will make salt not to stuck")
 def test_connections_via_jumphost(remove_hosts_at_the_end):
@@ -2170,6 +2294,181 @@ def test_nornir_refresh_workers_only():
     assert "show clock" in res_check["nrp1"]["ceos2"], "Nornir not working after refresh"
     
     
+def test_nornir_refresh_incremental_no_changes():
+    # save some data in hcache and verify it cached
+    res = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock", "show hostname"],
+        kwarg={"hcache": True},
+        tgt_type="glob",
+        timeout=60,
+    )
+    # refresh nornir incrementally
+    res = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["refresh"],
+        kwarg={"incremental": True},
+        tgt_type="glob",
+        timeout=60,
+    )
+    # sleep to make sure nornir refreshed
+    time.sleep(5)
+    # verify unchanged hosts kept their cached data
+    inventory = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["inventory"],
+        tgt_type="glob",
+        timeout=60,
+    )
+    assert "hcache" in inventory["nrp1"]["hosts"]["ceos1"]["data"], "Cached data gone after refresh"
+    assert "hcache" in inventory["nrp1"]["hosts"]["ceos2"]["data"], "Cached data gone after refresh"
+    # verify nornir is functional
+    res_check = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock", "show hostname"],
+        tgt_type="glob",
+        timeout=60,
+    )
+    assert "show clock" in res_check["nrp1"]["ceos1"], "Nornir not working after refresh"
+    assert "show clock" in res_check["nrp1"]["ceos2"], "Nornir not working after refresh"
+    # clean up cached data
+    client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["refresh"],
+        kwarg={"workers_only": True},
+        tgt_type="glob",
+        timeout=60,
+    )
+    time.sleep(30)
+
+
+def test_nornir_refresh_incremental_hosts_changes():
+    with open("/etc/salt/pillar/nrp1.sls", "r") as f:
+        pillar_original = f.read()
+    pillar_data = yaml.safe_load(pillar_original)
+    # open netmiko connections to ceos1 and ceos2 on all workers
+    client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["disconnect"],
+        kwarg={"worker": "all"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"plugin": "netmiko", "worker": "all"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    # add ceos3 host, change ceos2 data and ceos1 netmiko connection parameters
+    pillar_data["hosts"]["ceos3"] = {
+        "hostname": "10.0.1.6",
+        "platform": "arista_eos",
+        "groups": ["lab", "eos_params"],
+    }
+    pillar_data["hosts"]["ceos2"]["data"]["location"] = "West City Warehouse"
+    pillar_data["hosts"]["ceos1"]["connection_options"]["netmiko"] = {
+        "extras": {"conn_timeout": 15}
+    }
+    try:
+        with open("/etc/salt/pillar/nrp1.sls", "w") as f:
+            yaml.dump(pillar_data, f, default_flow_style=False)
+        time.sleep(5)
+        client.cmd(
+            tgt="nrp1",
+            fun="nr.nornir",
+            arg=["refresh"],
+            kwarg={"incremental": True},
+            tgt_type="glob",
+            timeout=60,
+        )
+        time.sleep(5)
+        inventory = client.cmd(
+            tgt="nrp1",
+            fun="nr.nornir",
+            arg=["inventory"],
+            tgt_type="glob",
+            timeout=60,
+        )
+        connections = client.cmd(
+            tgt="nrp1",
+            fun="nr.nornir",
+            arg=["connections"],
+            kwarg={"worker": "all"},
+            tgt_type="glob",
+            timeout=60,
+        )
+        pprint.pprint(connections)
+        assert "ceos3" in inventory["nrp1"]["hosts"], "Added host not in inventory"
+        assert (
+            inventory["nrp1"]["hosts"]["ceos2"]["data"]["location"]
+            == "West City Warehouse"
+        ), "Changed host data not updated"
+        for worker_name, res_data in connections["nrp1"].items():
+            # ceos2 connection parameters not changed, connection kept
+            assert [
+                c["connection_name"] for c in res_data["ceos2"]["connections"]
+            ] == ["netmiko"], f"{worker_name} ceos2 connection not kept"
+            # ceos1 netmiko parameters changed, old connection closed
+            assert (
+                res_data["ceos1"]["connections"] == []
+            ), f"{worker_name} ceos1 old connection not closed"
+        # verify ceos1 gets new connection with updated parameters
+        res_check = client.cmd(
+            tgt="nrp1",
+            fun="nr.cli",
+            arg=["show clock"],
+            kwarg={"plugin": "netmiko", "FB": "ceos1", "worker": 1},
+            tgt_type="glob",
+            timeout=60,
+        )
+        assert "show clock" in res_check["nrp1"]["ceos1"], "ceos1 not working after refresh"
+        connections = client.cmd(
+            tgt="nrp1",
+            fun="nr.nornir",
+            arg=["connections"],
+            kwarg={"worker": 1},
+            tgt_type="glob",
+            timeout=60,
+        )
+        assert [
+            c["connection_name"] for c in connections["nrp1"]["ceos1"]["connections"]
+        ] == ["netmiko"], "ceos1 new connection not opened"
+    finally:
+        # restore pillar, removing ceos3 and reverting ceos1 and ceos2 changes
+        with open("/etc/salt/pillar/nrp1.sls", "w") as f:
+            f.write(pillar_original)
+        time.sleep(5)
+        client.cmd(
+            tgt="nrp1",
+            fun="nr.nornir",
+            arg=["refresh"],
+            kwarg={"incremental": True},
+            tgt_type="glob",
+            timeout=60,
+        )
+        time.sleep(5)
+    inventory = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["inventory"],
+        tgt_type="glob",
+        timeout=60,
+    )
+    assert "ceos3" not in inventory["nrp1"]["hosts"], "Removed host still in inventory"
+    assert (
+        inventory["nrp1"]["hosts"]["ceos2"]["data"]["location"] == "East City Warehouse"
+    ), "Reverted host data not updated"
+
+
 def test_ffun_FT_function_by_string():
     res = client.cmd(
         tgt="nrp1",
@@ -2234,4 +2533,350 @@ def test_big_result():
         tgt_type="glob",
         timeout=60,
     )   
-    assert "VALUE_TRIMMED" in res["nrp1"]["ceos1"]["job_data_echo"] 
\ No newline at end of file
+    assert "VALUE_TRIMMED" in res["nrp1"]["ceos1"]["job_data_echo"]
+
+
+def _job_return_latencies(concurrency):
+    """
+    Helper to run 100 ``nr.nornir test`` jobs, ``concurrency`` jobs at a time,
+    and return sorted list of jobs return latencies.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_job(i):
+        job_client = salt.client.LocalClient()
+        start = time.time()
+        ret = job_client.cmd(
+            tgt="nrp1",
+            fun="nr.nornir",
+            arg=["test"],
+            kwarg={},
+            tgt_type="glob",
+            timeout=120,
+        )
+        return time.time() - start, ret
+
+    latencies = []
+    for i in range(max(1, 100 // concurrency)):
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(run_job, range(concurrency)))
+        for latency, ret in results:
+            assert ret["nrp1"] is True, "Unexpected nr.nornir test return: {}".format(ret)
+            latencies.append(latency)
+    return sorted(latencies)
+
+
+@pytest.mark.parametrize("concurrency", [10, 100])
+def test_job_return_latency(concurrency):
+    """
+    Benchmark job return latency - run ``nr.nornir test`` jobs concurrently,
+    print p50/p99 return latency and check that p50 latency stays flat as
+    number of concurrent jobs grows compared to running jobs one by one.
+
+    run this test printing benchmark results:
+
+        pytest -vv test_misc.py::test_job_return_latency -s
+    """
+    baseline = _job_return_latencies(1)
+    latencies = _job_return_latencies(concurrency)
+    baseline_p50 = baseline[len(baseline) // 2]
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        "\nconcurrency 1, p50 {}ms; concurrency {}, jobs {}, p50 {}ms, p99 {}ms".format(
+            round(baseline_p50 * 1000, 1),
+            concurrency,
+            len(latencies),
+            round(p50 * 1000, 1),
+            round(p99 * 1000, 1),
+        )
+    )
+    assert p50 <= baseline_p50 * 3, "p50 latency grows with number of concurrent jobs"
+
+# test_job_return_latency()
+
+
+@pytest.mark.modify_pillar_target("nrp1")
+@pytest.mark.modify_pillar_pre_add({"jobs_queue_max_depth": 1})
+@pytest.mark.modify_pillar_post_remove(["jobs_queue_max_depth"])
+def test_jobs_queue_admission_control(fixture_modify_proxy_pillar):
+    """
+    Submit several slow jobs at the same time with jobs_queue_max_depth
+    set to 1, some of the jobs should be rejected with busy error.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_job(i):
+        job_client = salt.client.LocalClient()
+        return job_client.cmd(
+            tgt="nrp1",
+            fun="nr.task",
+            arg=[],
+            kwarg={
+                "plugin": "nornir_salt.plugins.tasks.sleep",
+                "sleep_for": 5,
+                "FB": "ceos1",
+            },
+            tgt_type="glob",
+            timeout=120,
+        )
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(run_job, range(6)))
+    pprint.pprint(results)
+    rejected = [r for r in results if "busy, retry after" in str(r["nrp1"])]
+    assert rejected, "No jobs rejected"
+    assert len(rejected) < len(results), "All jobs rejected"
+    stats = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={"stat": "jobs_rejected"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    assert stats["nrp1"]["jobs_rejected"] >= len(rejected)
+
+# test_jobs_queue_admission_control()
+
+
+def test_jobs_coalescing_identical_cli_jobs():
+    """
+    Queue two identical nr.cli jobs on worker 1 behind a sleep task, second
+    job should be coalesced with the first one and receive the same results.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_job(fun, kwargs):
+        job_client = salt.client.LocalClient()
+        return job_client.cmd(
+            tgt="nrp1",
+            fun=fun,
+            arg=[],
+            kwarg=kwargs,
+            tgt_type="glob",
+            timeout=120,
+        )
+
+    stats_before = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={"stat": "jobs_coalesced"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        sleep_job = executor.submit(
+            run_job,
+            "nr.task",
+            {"plugin": "nornir_salt.plugins.tasks.sleep", "sleep_for": 5, "FB": "ceos1", "worker": 1},
+        )
+        time.sleep(1)
+        cli_jobs = [
+            executor.submit(
+                run_job,
+                "nr.cli",
+                {"commands": "show hostname", "FB": "ceos*", "worker": 1, "coalesce": True},
+            )
+            for i in range(2)
+        ]
+        results = [j.result() for j in cli_jobs]
+        sleep_job.result()
+    stats_after = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={"stat": "jobs_coalesced"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(results)
+    assert results[0] == results[1]
+    assert "ceos1" in results[0]["nrp1"] and "ceos2" in results[0]["nrp1"]
+    assert stats_after["nrp1"]["jobs_coalesced"] == stats_before["nrp1"]["jobs_coalesced"] + 1
+
+# test_jobs_coalescing_identical_cli_jobs()
+
+
+@pytest.mark.modify_pillar_target("nrp1")
+@pytest.mark.modify_pillar_pre_add({"worker_mode": "process"})
+@pytest.mark.modify_pillar_post_remove(["worker_mode"])
+def test_worker_mode_process(fixture_modify_proxy_pillar):
+    """
+    Run jobs with worker_mode set to process, jobs should run within Nornir
+    worker processes and worker stats should be relayed to main process.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_job(i):
+        job_client = salt.client.LocalClient()
+        return job_client.cmd(
+            tgt="nrp1",
+            fun="nr.cli",
+            arg=["show clock"],
+            kwarg={"FB": "ceos*", "worker": (i % 2) + 1},
+            tgt_type="glob",
+            timeout=120,
+        )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(run_job, range(4)))
+    workers_stats = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["workers", "stats"],
+        kwarg={},
+        tgt_type="glob",
+        timeout=60,
+    )
+    stats = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(results)
+    pprint.pprint(workers_stats)
+    for res in results:
+        assert "show clock" in res["nrp1"]["ceos1"], "No ceos1 results"
+        assert "show clock" in res["nrp1"]["ceos2"], "No ceos2 results"
+    worker_pids = [w["worker_process_pid"] for w in workers_stats["nrp1"].values()]
+    assert all(worker_pids), "Not all workers have worker process"
+    assert len(set(worker_pids)) == len(worker_pids), "Workers share processes"
+    assert stats["nrp1"]["main_process_pid"] not in worker_pids
+    assert stats["nrp1"]["nornir_workers_processes_started"] >= len(worker_pids)
+    assert workers_stats["nrp1"]["nornir-worker-1"]["worker_tasks_completed"] > 0
+    assert workers_stats["nrp1"]["nornir-worker-2"]["worker_tasks_completed"] > 0
+
+# test_worker_mode_process()
+
+
+@pytest.mark.modify_pillar_target("nrp1")
+@pytest.mark.modify_pillar_pre_add({"worker_mode": "process"})
+@pytest.mark.modify_pillar_post_remove(["worker_mode"])
+def test_worker_mode_process_hcache_shared(fixture_modify_proxy_pillar):
+    """
+    Save hcache results using worker 1 process, worker 2 process should see
+    them in its hosts' data until cleared.
+    """
+    client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"hcache": True, "worker": 1},
+        tgt_type="glob",
+        timeout=60,
+    )
+    inventory = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["inventory"],
+        kwarg={"worker": 2},
+        tgt_type="glob",
+        timeout=60,
+    )
+    client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["clear_hcache"],
+        tgt_type="glob",
+        timeout=60,
+    )
+    inventory_cleared = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["inventory"],
+        kwarg={"worker": 2},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(inventory)
+    assert "show clock" in inventory["nrp1"]["hosts"]["ceos1"]["data"]["hcache"]
+    assert "show clock" in inventory["nrp1"]["hosts"]["ceos2"]["data"]["hcache"]
+    assert "hcache" not in inventory_cleared["nrp1"]["hosts"]["ceos1"]["data"]
+    assert "hcache" not in inventory_cleared["nrp1"]["hosts"]["ceos2"]["data"]
+
+# test_worker_mode_process_hcache_shared()
+
+
+@pytest.mark.modify_pillar_target("nrp1")
+@pytest.mark.modify_pillar_pre_add({"worker_mode": "process"})
+@pytest.mark.modify_pillar_post_remove(["worker_mode"])
+def test_worker_mode_process_restart(fixture_modify_proxy_pillar):
+    """
+    Kill worker 1 process and run jobs concurrently, worker 1 process should
+    be restarted and jobs should complete.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_job(i):
+        job_client = salt.client.LocalClient()
+        return job_client.cmd(
+            tgt="nrp1",
+            fun="nr.cli",
+            arg=["show clock"],
+            kwarg={"FB": "ceos*", "worker": (i % 2) + 1},
+            tgt_type="glob",
+            timeout=120,
+        )
+
+    workers_stats = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["workers", "stats"],
+        kwarg={},
+        tgt_type="glob",
+        timeout=60,
+    )
+    stats = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={},
+        tgt_type="glob",
+        timeout=60,
+    )
+    killed_pid = workers_stats["nrp1"]["nornir-worker-1"]["worker_process_pid"]
+    client.cmd(
+        tgt="nrp1",
+        fun="ps.kill_pid",
+        arg=[killed_pid],
+        kwarg={"signal": 9},
+        tgt_type="glob",
+        timeout=60,
+    )
+    time.sleep(2)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(run_job, range(6)))
+    workers_stats_after = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["workers", "stats"],
+        kwarg={},
+        tgt_type="glob",
+        timeout=60,
+    )
+    stats_after = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(results)
+    pprint.pprint(workers_stats_after)
+    for res in results:
+        assert "show clock" in res["nrp1"]["ceos1"], "No ceos1 results"
+        assert "show clock" in res["nrp1"]["ceos2"], "No ceos2 results"
+    new_pid = workers_stats_after["nrp1"]["nornir-worker-1"]["worker_process_pid"]
+    assert new_pid and new_pid != killed_pid, "Worker 1 process not restarted"
+    assert (
+        stats_after["nrp1"]["nornir_workers_processes_started"]
+        > stats["nrp1"]["nornir_workers_processes_started"]
+    )
+
+# test_worker_mode_process_restart()
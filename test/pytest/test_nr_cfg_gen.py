@@ -338,4 +338,102 @@ def test_nr_cfg_gen_job_data_dict_of_paths():
     pprint.pprint(ret)
     assert isinstance(ret['nrp1']['ceos1']['salt_cfg_gen'], str)
     assert "Traceback" not in ret['nrp1']['ceos1']['salt_cfg_gen']
-    assert all(k in ret['nrp1']['ceos1']['salt_cfg_gen'] for k in expected)
\ No newline at end of file
+    assert all(k in ret['nrp1']['ceos1']['salt_cfg_gen'] for k in expected)
+
+
+def test_nr_cfg_gen_compiled_templates_cache():
+    stats_before = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    ret1 = client.cmd(
+        tgt="nrp1",
+        fun="nr.cfg_gen",
+        arg=[],
+        kwarg={
+            "filename": "salt://templates/per_host_cfg_snmp_template/{{ host.name }}.txt"
+        },
+        tgt_type="glob",
+        timeout=60,
+    )
+    ret2 = client.cmd(
+        tgt="nrp1",
+        fun="nr.cfg_gen",
+        arg=[],
+        kwarg={
+            "filename": "salt://templates/per_host_cfg_snmp_template/{{ host.name }}.txt"
+        },
+        tgt_type="glob",
+        timeout=60,
+    )
+    stats_after = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    pprint.pprint(ret1)
+    assert ret1 == ret2, "Templates cache changed rendering results"
+    assert "North" in ret1["nrp1"]["ceos1"]["salt_cfg_gen"]
+    assert "East" in ret1["nrp1"]["ceos2"]["salt_cfg_gen"]
+    assert (
+        stats_after["nrp1"]["render_templates_cache_hits"]
+        > stats_before["nrp1"]["render_templates_cache_hits"]
+    ), "Compiled template was not reused"
+
+
+def test_nr_cfg_gen_render_workers():
+    kwarg = {
+        "filename": "salt://templates/per_host_cfg_snmp_template/{{ host.name }}.txt"
+    }
+    ret_thread = client.cmd(
+        tgt="nrp1",
+        fun="nr.cfg_gen",
+        arg=[],
+        kwarg=kwarg,
+        tgt_type="glob",
+        timeout=60,
+    )
+    ret_processes = client.cmd(
+        tgt="nrp1",
+        fun="nr.cfg_gen",
+        arg=[],
+        kwarg={**kwarg, "render_workers": 2},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret_processes)
+    assert ret_thread == ret_processes, "Rendering processes changed results"
+
+
+def test_nr_cfg_gen_render_workers_failed_host():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cfg_gen",
+        arg=["{{ host.undefined_attribute.foo }}"],
+        kwarg={"render_workers": 2},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    for host, results in ret["nrp1"].items():
+        assert "Traceback" in results["salt_cfg_gen"]
+
+
+def test_nr_cfg_gen_file_download_cache():
+    stats_before = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    for i in range(2):
+        ret = client.cmd(
+            tgt="nrp1",
+            fun="nr.cfg_gen",
+            arg=[],
+            kwarg={"filename": "salt://templates/ntp_config.txt", "FB": "ceos1"},
+            tgt_type="glob",
+            timeout=60,
+        )
+        assert "ntp server" in ret["nrp1"]["ceos1"]["salt_cfg_gen"]
+    stats_after = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    assert (
+        stats_after["nrp1"]["file_download_cache_hits"]
+        > stats_before["nrp1"]["file_download_cache_hits"]
+    ), "File was not served from download cache"
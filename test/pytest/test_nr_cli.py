@@ -98,6 +98,112 @@ def test_nr_cli_details():
         assert isinstance(data["show clock"]["result"], str)
 
 
+def test_nr_cli_stream():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock", "show hostname"],
+        kwarg={"stream": True},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert "nrp1" in ret
+    assert len(ret["nrp1"]) == 2
+    for host_name, data in ret["nrp1"].items():
+        assert "show clock" in data, "No 'show clock' output from '{}'".format(
+            host_name
+        )
+        assert "show hostname" in data, "No 'show hostname' output from '{}'".format(
+            host_name
+        )
+        assert isinstance(data["show clock"], str)
+
+
+def test_nr_cli_stream_to_dict_false():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"stream": True, "to_dict": False},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert "nrp1" in ret
+    assert isinstance(ret["nrp1"], list)
+    assert len(ret["nrp1"]) == 2
+    assert set(i["host"] for i in ret["nrp1"]) == {"ceos1", "ceos2"}
+
+
+def test_nr_cli_stream_with_table():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"stream": True, "table": True},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert "nrp1" in ret
+    assert "not supported" in ret["nrp1"]
+
+
+def test_nr_cli_timing():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"timing": True},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert "nrp1" in ret
+    assert set(ret["nrp1"]) == {"results", "_timing"}
+    for phase in ["add_processors", "filter_hosts", "run_tasks", "form_results", "total"]:
+        assert isinstance(ret["nrp1"]["_timing"][phase], float), "No '{}' timing".format(phase)
+    assert "show clock" in ret["nrp1"]["results"]["ceos1"]
+    assert "show clock" in ret["nrp1"]["results"]["ceos2"]
+
+
+
+def test_nr_cli_timing_to_dict_false():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"timing": True, "to_dict": False},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert set(ret["nrp1"]) == {"results", "_timing"}
+    assert isinstance(ret["nrp1"]["_timing"]["total"], float)
+    assert isinstance(ret["nrp1"]["results"], list)
+    assert len(ret["nrp1"]["results"]) == 2
+    for item in ret["nrp1"]["results"]:
+        assert item["name"] == "show clock"
+        assert item["host"] in ["ceos1", "ceos2"]
+
+
+def test_nr_cli_timing_table():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"timing": True, "table": "brief"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert set(ret["nrp1"]) == {"results", "_timing"}
+    assert isinstance(ret["nrp1"]["_timing"]["total"], float)
+    assert isinstance(ret["nrp1"]["results"], str)
+    assert "ceos1" in ret["nrp1"]["results"]
+    assert "ceos2" in ret["nrp1"]["results"]
+
 def test_nr_cli_plugin_netmiko():
     ret = client.cmd(
         tgt="nrp1",
@@ -1137,4 +1243,135 @@ def test_nr_cli_netmiko_repeat_2_ret_last_20():
         assert "Traceback" not in res, f"{cmd} ceo1 return error"
     for cmd, res in ret["nrp1"]["ceos2"].items():
         assert cmd.split(":")[0].isdigit(), f"{cmd} - ceos2 command does not start with digit"
-        assert "Traceback" not in res, f"{cmd} ceo1 return error"
\ No newline at end of file
+        assert "Traceback" not in res, f"{cmd} ceo1 return error"
+
+def test_nr_cli_cache_commands_results():
+    stats_before = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        tgt_type="glob",
+        timeout=60,
+    )
+    ret_1 = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"FB": "ceos*", "cache": 60},
+        tgt_type="glob",
+        timeout=60,
+    )
+    time.sleep(2)
+    ret_2 = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"FB": "ceos*", "cache": 60},
+        tgt_type="glob",
+        timeout=60,
+    )
+    stats_after = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret_1)
+    pprint.pprint(ret_2)
+    # show clock output only same if served from cache
+    assert ret_1 == ret_2
+    assert "Traceback" not in ret_2["nrp1"]["ceos1"]["show clock"]
+    assert (
+        stats_after["nrp1"]["commands_cache_hits"]
+        == stats_before["nrp1"]["commands_cache_hits"] + 2
+    )
+    assert stats_after["nrp1"]["commands_cache_hit_rate"] > 0
+
+
+def test_nr_cli_cache_rendered_commands_results_order():
+    # cache show clock results only
+    ret_1 = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"FB": "ceos*", "cache": 60},
+        tgt_type="glob",
+        timeout=60,
+    )
+    stats_before = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        tgt_type="glob",
+        timeout=60,
+    )
+    # commands rendered from file, show clock served from cache
+    ret_2 = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=[],
+        kwarg={
+            "FB": "ceos*",
+            "filename": "salt://cli/show_cmd_1.txt",
+            "cache": 60,
+            "to_dict": False,
+        },
+        tgt_type="glob",
+        timeout=60,
+    )
+    stats_after = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret_1)
+    pprint.pprint(ret_2)
+    for host_name in ["ceos1", "ceos2"]:
+        host_results = [i for i in ret_2["nrp1"] if i["host"] == host_name]
+        assert [i["name"] for i in host_results] == [
+            "show ip int brief",
+            "show clock",
+        ], f"{host_name} - unexpected commands results order"
+        assert host_results[1]["result"] == ret_1["nrp1"][host_name]["show clock"]
+    assert (
+        stats_after["nrp1"]["commands_cache_hits"]
+        == stats_before["nrp1"]["commands_cache_hits"] + 2
+    )
+
+
+def test_nr_cli_host_batch_size():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show hostname"],
+        kwarg={"FB": "ceos*"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    ret_batched = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show hostname"],
+        kwarg={"FB": "ceos*", "host_batch_size": 1},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret_batched)
+    assert ret == ret_batched
+
+
+def test_nr_cli_host_batch_size_table():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show hostname"],
+        kwarg={"FB": "ceos*", "host_batch_size": 1, "table": "brief"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert "ceos1" in ret["nrp1"] and "ceos2" in ret["nrp1"]
+    assert "Traceback" not in ret["nrp1"]
@@ -1,6 +1,9 @@
 import logging
 import pprint
 import time
+import pytest
+
+from utils import fixture_modify_proxy_pillar
 
 log = logging.getLogger(__name__)
 
@@ -95,6 +98,512 @@ def test_single_stat_call():
     assert "nrp1" in ret
     assert len(ret["nrp1"].keys()) == 1
 
+
+def test_affinity_stats_call():
+    ret = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    pprint.pprint(ret)
+    for stat in [
+        "jobs_affinity_scheduled",
+        "jobs_affinity_hits",
+        "jobs_affinity_hit_rate",
+        "hosts_affinity_targeted",
+        "hosts_affinity_warm",
+        "hosts_affinity_hit_rate",
+    ]:
+        assert stat in ret["nrp1"], "No '{}' in stats".format(stat)
+
+
+@pytest.mark.modify_pillar_target("nrp1")
+@pytest.mark.modify_pillar_pre_add(
+    {"jobs_scheduling": "affinity", "jobs_affinity_max_wait": 1}
+)
+@pytest.mark.modify_pillar_post_remove(["jobs_scheduling", "jobs_affinity_max_wait"])
+def test_affinity_jobs_scheduling_take_over(fixture_modify_proxy_pillar):
+    """
+    Warm up ceos1 connection on one of the workers, make that worker busy and
+    send another ceos1 job, job should be sent to warm worker and taken over
+    by idle worker without waiting for busy worker to complete its job.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_job(fun, arg, kwarg):
+        job_client = salt.client.LocalClient()
+        return job_client.cmd(
+            tgt="nrp1", fun=fun, arg=arg, kwarg=kwarg, tgt_type="glob", timeout=120
+        )
+
+    # warm up ceos1 connection
+    client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"FB": "ceos1"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    workers = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["workers", "stats"],
+        kwarg={},
+        tgt_type="glob",
+        timeout=60,
+    )
+    warm_worker = [
+        int(name.split("-")[-1])
+        for name, data in workers["nrp1"].items()
+        if "ceos1" in data["worker_connections"]
+    ][0]
+    stats_before = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # make warm worker busy
+        sleep_job = executor.submit(
+            run_job,
+            "nr.task",
+            [],
+            {
+                "plugin": "nornir_salt.plugins.tasks.sleep",
+                "sleep_for": 20,
+                "FB": "ceos2",
+                "worker": warm_worker,
+            },
+        )
+        time.sleep(2)
+        start = time.time()
+        res = run_job("nr.cli", ["show clock"], {"FB": "ceos1"})
+        elapsed = time.time() - start
+        sleep_job.result()
+    stats_after = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    pprint.pprint(res)
+    assert "show clock" in res["nrp1"]["ceos1"], "No ceos1 results"
+    assert elapsed < 15, "Affinity job waited for busy worker"
+    assert (
+        stats_after["nrp1"]["jobs_affinity_scheduled"]
+        > stats_before["nrp1"]["jobs_affinity_scheduled"]
+    )
+    assert (
+        stats_after["nrp1"]["jobs_affinity_taken_over"]
+        == stats_before["nrp1"]["jobs_affinity_taken_over"] + 1
+    )
+
+
+def test_watchdog_pass_duration_stats_call():
+    ret = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    pprint.pprint(ret)
+    for stat in ["watchdog_pass_duration", "watchdog_keepalive_pass_duration"]:
+        assert stat in ret["nrp1"], "No '{}' in stats".format(stat)
+        assert isinstance(ret["nrp1"][stat], (int, float))
+
+
+def test_workers_autoscaling_stats_call():
+    ret = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    pprint.pprint(ret)
+    for stat in [
+        "nornir_workers_scale_ups",
+        "nornir_workers_scale_downs",
+        "nornir_workers_last_scaling",
+    ]:
+        assert stat in ret["nrp1"], "No '{}' in stats".format(stat)
+    assert isinstance(ret["nrp1"]["nornir_workers_last_scaling"], dict)
+
+
+@pytest.mark.modify_pillar_target("nrp1")
+@pytest.mark.modify_pillar_pre_add(
+    {
+        "nornir_workers": 1,
+        "nornir_workers_min": 1,
+        "nornir_workers_max": 3,
+        "nornir_workers_scale_queue_depth": 2,
+        "nornir_workers_scale_queue_wait": 2,
+        "nornir_workers_scale_cooldown": 5,
+        "watchdog_interval": 5,
+    }
+)
+@pytest.mark.modify_pillar_post_remove(
+    [
+        "nornir_workers",
+        "nornir_workers_min",
+        "nornir_workers_max",
+        "nornir_workers_scale_queue_depth",
+        "nornir_workers_scale_queue_wait",
+        "nornir_workers_scale_cooldown",
+        "watchdog_interval",
+    ]
+)
+def test_workers_autoscaling(fixture_modify_proxy_pillar):
+    """
+    Queue several jobs behind single worker, watchdog should add workers
+    to process the queue and remove them once they stay idle.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_job(host):
+        job_client = salt.client.LocalClient()
+        return job_client.cmd(
+            tgt="nrp1",
+            fun="nr.task",
+            arg=[],
+            kwarg={
+                "plugin": "nornir_salt.plugins.tasks.sleep",
+                "sleep_for": 15,
+                "FB": host,
+            },
+            tgt_type="glob",
+            timeout=120,
+        )
+
+    def get_workers():
+        ret = client.cmd(
+            tgt="nrp1",
+            fun="nr.nornir",
+            arg=["workers", "stats"],
+            kwarg={},
+            tgt_type="glob",
+            timeout=60,
+        )
+        return ret["nrp1"]
+
+    assert len(get_workers()) == 1, "Was expecting 1 worker before building a queue"
+    stats_before = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        jobs = [executor.submit(run_job, h) for h in ["ceos1", "ceos2"] * 2]
+        # give watchdog time to notice the queue
+        time.sleep(12)
+        workers_scaled_up = get_workers()
+        results = [j.result() for j in jobs]
+    stats_scaled_up = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    pprint.pprint(workers_scaled_up)
+    pprint.pprint(stats_scaled_up["nrp1"]["nornir_workers_last_scaling"])
+    for res in results:
+        assert "nrp1" in res, "Job returned no results"
+    assert len(workers_scaled_up) > 1, "Workers not added while jobs queued"
+    assert (
+        stats_scaled_up["nrp1"]["nornir_workers_scale_ups"]
+        > stats_before["nrp1"]["nornir_workers_scale_ups"]
+    )
+    # wait for added workers to stay idle longer than cooldown and be removed
+    time.sleep(30)
+    stats_scaled_down = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["stats"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    assert len(get_workers()) == 1, "Idle workers not removed"
+    assert (
+        stats_scaled_down["nrp1"]["nornir_workers_scale_downs"]
+        > stats_scaled_up["nrp1"]["nornir_workers_scale_downs"]
+    )
+
+
+def test_jobs_list_and_cancel_queued_job():
+    # occupy worker 1 and queue another job behind it
+    client.cmd_async(
+        tgt="nrp1",
+        fun="nr.task",
+        arg=[],
+        kwarg={"plugin": "nornir_salt.plugins.tasks.sleep", "sleep_for": 10, "FB": "ceos1", "worker": 1},
+        tgt_type="glob",
+    )
+    time.sleep(2)
+    queued_jid = client.cmd_async(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"FB": "ceos1", "worker": 1},
+        tgt_type="glob",
+    )
+    time.sleep(2)
+    jobs = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["jobs"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    pprint.pprint(jobs)
+    queued = [j for j in jobs["nrp1"] if j["jid"] == queued_jid]
+    assert queued and queued[0]["state"] == "queued"
+    assert queued[0]["hosts_count"] == 1
+    assert any(j["state"] == "running" for j in jobs["nrp1"])
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["cancel"],
+        kwarg={"jid": queued_jid},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert ret["nrp1"]["queued"] == 1
+    jobs = client.cmd(
+        tgt="nrp1", fun="nr.nornir", arg=["jobs"], kwarg={}, tgt_type="glob", timeout=60
+    )
+    assert not any(j["jid"] == queued_jid for j in jobs["nrp1"])
+
+
+def test_jobs_cancel_running_job():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_job():
+        job_client = salt.client.LocalClient()
+        return job_client.cmd(
+            tgt="nrp1",
+            fun="nr.task",
+            arg=[],
+            kwarg={
+                "plugin": "nornir_salt.plugins.tasks.sleep",
+                "sleep_for": 10,
+                "FB": "ceos*",
+                "run_num_workers": 1,
+            },
+            tgt_type="glob",
+            timeout=120,
+        )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        sleep_job = executor.submit(run_job)
+        time.sleep(3)
+        jobs = client.cmd(
+            tgt="nrp1", fun="nr.nornir", arg=["jobs"], kwarg={}, tgt_type="glob", timeout=60
+        )
+        pprint.pprint(jobs)
+        running = [
+            j for j in jobs["nrp1"] if j["state"] == "running" and j["function"] == "nr.task"
+        ]
+        assert running, "No running job found"
+        ret = client.cmd(
+            tgt="nrp1",
+            fun="nr.nornir",
+            arg=["cancel"],
+            kwarg={"jid": running[0]["jid"]},
+            tgt_type="glob",
+            timeout=60,
+        )
+        pprint.pprint(ret)
+        assert ret["nrp1"]["running"] == 1
+        result = sleep_job.result()
+    pprint.pprint(result)
+    # first host allowed to complete, second host skipped
+    assert "cancelled" not in str(result["nrp1"]["ceos1"])
+    assert "cancelled" in str(result["nrp1"]["ceos2"])
+
+
+def test_jobs_cancel_coalesced_leader_job():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_job():
+        job_client = salt.client.LocalClient()
+        return job_client.cmd(
+            tgt="nrp1",
+            fun="nr.cli",
+            arg=["show hostname"],
+            kwarg={"FB": "ceos*", "worker": 1, "coalesce": True},
+            tgt_type="glob",
+            timeout=120,
+        )
+
+    # occupy worker 1 and queue leader job behind it
+    client.cmd_async(
+        tgt="nrp1",
+        fun="nr.task",
+        arg=[],
+        kwarg={"plugin": "nornir_salt.plugins.tasks.sleep", "sleep_for": 10, "FB": "ceos1", "worker": 1},
+        tgt_type="glob",
+    )
+    time.sleep(2)
+    leader_jid = client.cmd_async(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show hostname"],
+        kwarg={"FB": "ceos*", "worker": 1, "coalesce": True},
+        tgt_type="glob",
+    )
+    time.sleep(2)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        coalesced_job = executor.submit(run_job)
+        time.sleep(2)
+        ret = client.cmd(
+            tgt="nrp1",
+            fun="nr.nornir",
+            arg=["cancel"],
+            kwarg={"jid": leader_jid},
+            tgt_type="glob",
+            timeout=60,
+        )
+        pprint.pprint(ret)
+        assert ret["nrp1"]["queued"] == 1
+        result = coalesced_job.result()
+    pprint.pprint(result)
+    # coalesced job still runs and receives results
+    assert "show hostname" in result["nrp1"]["ceos1"]
+    assert "cancelled" not in str(result["nrp1"])
+
+
+def test_async_job_submit_and_job_result():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"FB": "ceos1", "async": True},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert ret["nrp1"]["status"] == "pending"
+    handle = ret["nrp1"]["handle"]
+    for i in range(30):
+        res = client.cmd(
+            tgt="nrp1",
+            fun="nr.nornir",
+            arg=["job_result"],
+            kwarg={"handle": handle},
+            tgt_type="glob",
+            timeout=60,
+        )
+        if not (isinstance(res["nrp1"], dict) and res["nrp1"].get("status") == "pending"):
+            break
+        time.sleep(1)
+    pprint.pprint(res)
+    assert "show clock" in res["nrp1"]["ceos1"]
+    assert "Traceback" not in res["nrp1"]["ceos1"]["show clock"]
+    # results removed from store once retrieved
+    res = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["job_result"],
+        kwarg={"handle": handle},
+        tgt_type="glob",
+        timeout=60,
+    )
+    assert "not found" in res["nrp1"]
+
+
+def test_stats_histograms_call():
+    client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"FB": "ceos1"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats", "histograms"],
+        kwarg={},
+        tgt_type="glob",
+        timeout=60,
+    )
+    print(ret["nrp1"])
+    assert isinstance(ret["nrp1"], str)
+    assert "# TYPE salt_nornir_job_phase_duration_seconds histogram" in ret["nrp1"]
+    for phase in ["queue_wait", "prep", "execution", "serialization", "delivery"]:
+        assert 'phase="{}",function="nr.cli"'.format(phase) in ret["nrp1"]
+    assert 'le="+Inf"' in ret["nrp1"]
+
+
+def test_job_priority_queue_wait_stats():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.cli",
+        arg=["show clock"],
+        kwarg={"FB": "ceos1", "priority": 1},
+        tgt_type="glob",
+        timeout=60,
+    )
+    assert "show clock" in ret["nrp1"]["ceos1"]
+    stats = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={"stat": "jobs_queue_wait"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(stats)
+    assert stats["nrp1"]["jobs_queue_wait"]["1"]["jobs"] > 0
+    assert "avg_seconds" in stats["nrp1"]["jobs_queue_wait"]["1"]
+
+
+def test_nornir_workers_init_ram_usage_stat_call():
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={"stat": "nornir_workers_init_ram_usage_mbyte"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert isinstance(
+        ret["nrp1"]["nornir_workers_init_ram_usage_mbyte"], (int, float)
+    )
+
+
+@pytest.mark.modify_pillar_target("nrp1")
+@pytest.mark.modify_pillar_pre_add({"nornir_workers_share_inventory": True})
+@pytest.mark.modify_pillar_post_remove(["nornir_workers_share_inventory"])
+def test_nornir_workers_share_inventory(fixture_modify_proxy_pillar):
+    """
+    With shared inventory, each worker should have the same inventory data
+    and be able to run jobs using its own connections.
+    """
+    inventory = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["inventory"],
+        kwarg={"call": "read", "FB": "ceos*", "worker": "all"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(inventory)
+    workers_inventory = list(inventory["nrp1"].values())
+    assert len(workers_inventory) > 1, "Expected results from several workers"
+    assert all(i == workers_inventory[0] for i in workers_inventory)
+    for worker in [1, 2]:
+        res = client.cmd(
+            tgt="nrp1",
+            fun="nr.cli",
+            arg=["show clock"],
+            kwarg={"FB": "ceos*", "worker": worker},
+            tgt_type="glob",
+            timeout=60,
+        )
+        assert "show clock" in res["nrp1"]["ceos1"], "No ceos1 results"
+        assert "show clock" in res["nrp1"]["ceos2"], "No ceos2 results"
+    connections = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["connections"],
+        kwarg={"worker": "all"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(connections)
+    for worker_name in ["nornir-worker-1", "nornir-worker-2"]:
+        assert connections["nrp1"][worker_name]["ceos1"]["connections"]
+        assert connections["nrp1"][worker_name]["ceos2"]["connections"]
+    ram_usage = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["stats"],
+        kwarg={"stat": "nornir_workers_init_ram_usage_mbyte"},
+        tgt_type="glob",
+        timeout=60,
+    )
+    assert isinstance(
+        ram_usage["nrp1"]["nornir_workers_init_ram_usage_mbyte"], (int, float)
+    )
+
     
 def test_connections_list_all_workers():
     # close connections
@@ -507,6 +1016,7 @@ def test_nr_nornir_worker_stats_using_args():
         assert "worker_jobs_failed" in wkr
         assert "worker_jobs_queue" in wkr
         assert "worker_jobs_started" in wkr
+        assert "worker_affinity_hits" in wkr
         
 # test_nr_nornir_worker_stats_using_args()
 
@@ -530,6 +1040,7 @@ def test_nr_nornir_worker_stats_using_args_and_kwargs():
         assert "worker_jobs_failed" in wkr
         assert "worker_jobs_queue" in wkr
         assert "worker_jobs_started" in wkr
+        assert "worker_affinity_hits" in wkr
         
 # test_nr_nornir_worker_stats_using_args_and_kwargs()
 
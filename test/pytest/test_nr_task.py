@@ -114,6 +114,30 @@ def test_custom_task_call_fail():
         and "file download failed" in ret["nrp1"]
     )
 
+
+def test_custom_task_clear_task_cache():
+    for i in range(2):
+        ret = client.cmd(
+            tgt="nrp1",
+            fun="nr.task",
+            arg=["salt://tasks/custom_send_commands.py"],
+            kwarg={"commands": ["show clock"]},
+            tgt_type="glob",
+            timeout=60,
+        )
+        for host_name, data in ret["nrp1"].items():
+            assert "show clock" in data
+    ret = client.cmd(
+        tgt="nrp1",
+        fun="nr.nornir",
+        arg=["clear_task_cache"],
+        kwarg={},
+        tgt_type="glob",
+        timeout=60,
+    )
+    pprint.pprint(ret)
+    assert "salt://tasks/custom_send_commands.py" in ret["nrp1"]
+
     
 def test_napalm_get_interfaces_with_jmespath():
     ret = client.cmd(